@@ -0,0 +1,125 @@
+import argparse
+import gc
+import time
+import uuid
+from datetime import timedelta
+
+from nrel.hive.reporting.handler import log_writer
+from nrel.hive.reporting.report_type import ReportType
+from nrel.hive.reporting.reporter import Report
+from nrel.hive.model.sim_time import SimTime
+
+# this example script measures the throughput of serializing simulation reports as json,
+# comparing the string-valued path of Report.as_json against the typed path, using the
+# standard library json module and, if it is installed, orjson. it can be called via
+# `$ python benchmark_report_serialization.py --reports 100000`
+
+parser = argparse.ArgumentParser(description="report serialization benchmark")
+parser.add_argument("--reports", type=int, default=100_000, help="number of reports to serialize")
+parser.add_argument("--repeat", type=int, default=3, help="number of times to repeat each run")
+
+
+def build_reports(n: int):
+    """builds a batch of vehicle move, vehicle charge and pickup reports shaped like
+    those produced by a simulation, with 200 reports filed in each one minute time step.
+
+    :param n: the number of reports
+    :return: the reports
+    """
+    reports = []
+    for i in range(n):
+        t = SimTime.build((i // 200) * 60)
+        if i % 3 == 0:
+            report = Report(
+                ReportType.VEHICLE_MOVE_EVENT,
+                {
+                    "sim_time_start": t,
+                    "sim_time_end": SimTime.build(t + 60),
+                    "vehicle_id": f"v{i % 500}",
+                    "vehicle_state": "DispatchTrip",
+                    "vehicle_memberships": None,
+                    "distance_km": 0.4123 * (i % 7),
+                    "energy": -0.0871 * (i % 7),
+                    "energy_units": "kilowatt_hours",
+                    "geoid": "8f268cdac75a58e",
+                    "lat": 39.754891718073104,
+                    "lon": -104.98785421065914,
+                    "route_wkt": "LINESTRING (-104.98 39.75, -104.97 39.76)",
+                },
+            )
+        elif i % 3 == 1:
+            report = Report(
+                ReportType.VEHICLE_CHARGE_EVENT,
+                {
+                    "session_id": uuid.uuid4(),
+                    "sim_time_start": t,
+                    "sim_time_end": SimTime.build(t + 60),
+                    "vehicle_id": f"v{i % 500}",
+                    "station_id": "s1",
+                    "vehicle_state": "ChargingStation",
+                    "vehicle_memberships": ["fleet_a"],
+                    "energy": 0.6666910941930402,
+                    "energy_units": "kilowatt_hours",
+                    "vehicle_start_soc": 0.04840079899725509,
+                    "vehicle_end_soc": 0.0617346208811159,
+                    "price": 0.20000732825791204,
+                    "charger_id": "DCFC",
+                    "geoid": "8f268cdacadc1a2",
+                    "lat": 39.7595777159084,
+                    "lon": -104.97533068241977,
+                },
+            )
+        else:
+            report = Report(
+                ReportType.PICKUP_REQUEST_EVENT,
+                {
+                    "pickup_time": t,
+                    "request_time": SimTime.build(t - 300),
+                    "wait_time_seconds": timedelta(seconds=300),
+                    "vehicle_id": f"v{i % 500}",
+                    "request_id": f"r{i}",
+                    "fleet_id": "fleet_a",
+                    "vehicle_memberships": ["fleet_a"],
+                    "price": 12.5,
+                    "geoid": "8f268cdac75a58e",
+                    "lat": 39.754891718073104,
+                    "lon": -104.98785421065914,
+                },
+            )
+        reports.append(report)
+    return reports
+
+
+def run(reports, typed: bool, use_orjson: bool, repeat: int) -> float:
+    """serializes the reports as lines of json, returning the best time in seconds"""
+    has_orjson = log_writer.HAS_ORJSON
+    log_writer.HAS_ORJSON = has_orjson and use_orjson
+    try:
+        best = float("inf")
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            entries = [report.as_json(typed) for report in reports]
+            log_writer.serialize(entries, typed)
+            best = min(best, time.perf_counter() - start)
+        return best
+    finally:
+        log_writer.HAS_ORJSON = has_orjson
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    reports = build_reports(args.reports)
+
+    runs = [("strings + json", False, False), ("typed + json", True, False)]
+    if log_writer.HAS_ORJSON:
+        runs.append(("typed + orjson", True, True))
+
+    baseline = None
+    for name, typed, use_orjson in runs:
+        seconds = run(reports, typed, use_orjson, args.repeat)
+        baseline = seconds if baseline is None else baseline
+        print(
+            f"{name:<16} {seconds:8.3f}s {args.reports / seconds:12,.0f} reports/s "
+            f"{baseline / seconds:6.2f}x"
+        )
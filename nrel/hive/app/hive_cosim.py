@@ -62,12 +62,15 @@ def crank(
         # regular step
         rp1 = rp0.u.apply_update(rp0)
         if flush_events:
-            rp1.e.reporter.flush(rp1)
+            rp1.e.reporter.step(rp1)
 
         return rp1
 
     initial = runner_payload
     next_state = ft.reduce(run_step, steps, initial)
+    if flush_events:
+        # write any reports still buffered by a log flush interval
+        next_state.e.reporter.flush(next_state)
     result = CrankResult(next_state, next_state.s.sim_time)
     return result
 
@@ -20,15 +20,46 @@ class GlobalConfig(NamedTuple):
     log_level: str
     log_sim_config: Set[ReportType]
     log_station_capacities: bool
+    log_station_load_interval_steps: int
     log_time_step_stats: bool
     log_fleet_time_step_stats: bool
+    log_flush_interval_steps: int
+    log_max_buffered_reports: int
+    log_writer_mode: str
+    log_writer_queue_size: int
+    log_writer_backpressure: str
+    log_writer_buffer_bytes: int
+    log_json_typed: bool
+    log_compression: str
+    log_compression_level: int
+    log_states_interval_steps: int
+    log_states_sample_ratio: float
+    log_states_changes_only: bool
+    log_format: str
+    log_columnar_flush_steps: int
     lazy_file_reading: bool
     wkt_x_y_ordering: bool
     verbose: bool
 
     @classmethod
     def default_config(cls) -> Dict:
-        return {}
+        return {
+            "log_station_load_interval_steps": 0,
+            "log_flush_interval_steps": 1,
+            "log_max_buffered_reports": 200000,
+            "log_writer_mode": "sync",
+            "log_writer_queue_size": 64,
+            "log_writer_backpressure": "block",
+            "log_writer_buffer_bytes": 1048576,
+            "log_json_typed": False,
+            "log_compression": "none",
+            "log_compression_level": 3,
+            "log_states_interval_steps": 1,
+            "log_states_sample_ratio": 1.0,
+            "log_states_changes_only": False,
+            "log_format": "json",
+            "log_columnar_flush_steps": 60,
+        }
 
     @classmethod
     def required_config(cls) -> Tuple[str, ...]:
@@ -8,6 +8,8 @@ from nrel.hive.config.config_builder import ConfigBuilder
 class Network(NamedTuple):
     network_type: str
     default_speed_kmph: float
+    simplify_graph: bool = False
+    prune_graph: bool = False
 
     @classmethod
     def default_config(cls) -> Dict:
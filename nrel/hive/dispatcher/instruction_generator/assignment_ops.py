@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import functools as ft
+import heapq
 import logging
-from typing import Dict, Tuple, Callable, NamedTuple, Optional, TYPE_CHECKING
+from typing import Dict, Iterable, Tuple, Callable, NamedTuple, Optional, Sequence, TYPE_CHECKING
 
 import h3
 import numpy as np
@@ -20,7 +21,6 @@ from nrel.hive.state.simulation_state.simulation_state import SimulationState
 from nrel.hive.state.vehicle_state.charge_queueing import ChargeQueueing
 from nrel.hive.state.vehicle_state.charging_station import ChargingStation
 from nrel.hive.util.h3_ops import H3Ops
-from nrel.hive.util.tuple_ops import TupleOps
 
 if TYPE_CHECKING:
     from nrel.hive.util.units import Ratio, Seconds
@@ -212,7 +212,11 @@ def nearest_shortest_queue_ranking(
 
 
 def shortest_time_to_charge_distance(
-    vehicle: Vehicle, sim: SimulationState, env: Environment, target_soc: Ratio
+    vehicle: Vehicle,
+    sim: SimulationState,
+    env: Environment,
+    target_soc: Ratio,
+    wait_estimates: Optional[Dict[StationId, Dict[ChargerId, Seconds]]] = None,
 ) -> Callable[[Station], float]:
     """
     ranks this station by an estimate of the time which would pass until this agent reaches a target charge level
@@ -224,11 +228,15 @@ def shortest_time_to_charge_distance(
     :param sim: the simulation state
     :param env: the simulation environment
     :param target_soc: the SoC we are attempting to reach in this charge session
+    :param wait_estimates: station wait estimates for this simulation state and target SoC,
+                           shared across rankings and filled in as stations are ranked
     :return: the distance metric for this vehicle/station pair (lower is better)
     """
 
     def fn(station: Station) -> float:
-        result = shortest_time_to_charge_ranking(sim, env, vehicle, station, target_soc)
+        result = shortest_time_to_charge_ranking(
+            sim, env, vehicle, station, target_soc, wait_estimates
+        )
         dist = 999999999.0 if result is None else result[1]
         return dist
 
@@ -241,6 +249,7 @@ def shortest_time_to_charge_ranking(
     vehicle: Vehicle,
     station: Station,
     target_soc: Ratio,
+    wait_estimates: Optional[Dict[StationId, Dict[ChargerId, Seconds]]] = None,
 ) -> Optional[Tuple[ChargerId, float]]:
     """
     given a station charging alternative, determine the time it would take to charge
@@ -251,6 +260,8 @@ def shortest_time_to_charge_ranking(
     :param vehicle: the vehicle
     :param station: the station to rank
     :param target_soc: target vehicle charging SoC percentage
+    :param wait_estimates: station wait estimates for this simulation state and target SoC,
+                           shared across rankings and filled in as stations are ranked
     :return: a ranking (estimated travel + queue + charge time) for accessing the best-ranked charger
     """
 
@@ -266,115 +277,11 @@ def shortest_time_to_charge_ranking(
         # return a signal that demotes this Station alternative to the bottom of the ranking
         return None
     else:
-
-        def _veh_at_station(v: Vehicle) -> bool:
-            return (
-                isinstance(v.vehicle_state, ChargingStation)
-                and v.vehicle_state.station_id == station.id
-            )
-
-        def _veh_enqueued(v: Vehicle) -> bool:
-            return (
-                isinstance(v.vehicle_state, ChargeQueueing)
-                and v.vehicle_state.station_id == station.id
-            )
-
-        def _time_to_full_by_charger_id(c: ChargerId):
-            def _time_to_full(v: Vehicle) -> Seconds:
-                _mech = env.mechatronics.get(v.mechatronics_id)
-                _charger = env.chargers.get(c)
-                if not _mech or not _charger:
-                    return 0
-                else:
-                    time_est = powercurve_ops.time_to_full(
-                        v,
-                        _mech,
-                        _charger,
-                        target_soc,
-                        sim.sim_timestep_duration_seconds,
-                        min_delta_energy_change=env.config.sim.min_delta_energy_change,
-                    )
-                    return time_est
-
-            return _time_to_full
-
-        def _sort_enqueue_time(v: Vehicle) -> int:
-            if isinstance(v.vehicle_state, ChargeQueueing):
-                enqueue_time = int(v.vehicle_state.enqueue_time)
-            else:
-                log.error(
-                    "calling _sort_enqueue_time on a vehicle state that is not ChargeQueueing"
-                )
-                enqueue_time = 0
-            return enqueue_time
-
-        def _greedy_assignment(
-            _charging: Tuple[Seconds, ...],
-            _enqueued: Tuple[Seconds, ...],
-            _charger_id: ChargerId,
-            time_passed: Seconds = 0,
-        ) -> Seconds:
-            """
-            computes the time estimated that a slot opens up for this vehicle to begin charging
-
-
-            :param _charging: a sorted list of remaining charge time estimates
-            :param _enqueued: a sorted list of charge time estimates for enqueued vehicles
-            :param _charger_id: the id of the charger these vehicles are competing for
-            :param time_passed: the amount of time that has been estimated
-            :return: the time in the future we should expect to begin charging, determined by a greedy assignment
-            """
-            total_chargers = station.get_total_chargers(_charger_id)
-            if total_chargers is None:
-                log.error(f"charger id {_charger_id} not found at station {station.id}")
-                total_chargers = 0
-
-            if len(_charging) == len(_enqueued) == 0:
-                return time_passed
-            elif len(_charging) < total_chargers:
-                return time_passed
-            else:
-                # advance time
-                next_released_charger_time = TupleOps.head(_charging)
-
-                updated_time_passed = time_passed + next_released_charger_time
-
-                # remove charging agents who are done
-                _charging_time_advanced = map(lambda t: t - next_released_charger_time, _charging)
-                _charging_vacated = tuple(filter(lambda t: t > 0, _charging_time_advanced))
-
-                vacancies = total_chargers - len(_charging_vacated)
-                if vacancies <= 0:
-                    # no space for any changes from enqueued -> charging
-                    return _greedy_assignment(
-                        _charging=_charging_vacated,
-                        _enqueued=_enqueued,
-                        _charger_id=_charger_id,
-                        time_passed=updated_time_passed,
-                    )
-                else:
-                    # dequeue longest-waiting agents
-                    _enqueued_to_dequeue = _enqueued[0:vacancies]
-                    _updated_enqueued = _enqueued[vacancies:]
-                    _updated_charging = tuple(sorted(_charging_vacated + _enqueued_to_dequeue))
-
-                    return _greedy_assignment(
-                        _charging=_updated_charging,
-                        _enqueued=_updated_enqueued,
-                        _charger_id=_charger_id,
-                        time_passed=updated_time_passed,
-                    )
-
-        # collect all vehicles that are either charging or enqueued at this station
-        vehicles_at_station = sim.get_vehicles(filter_function=_veh_at_station)
-        vehicles_enqueued = sim.get_vehicles(
-            filter_function=_veh_enqueued,
-            sort=True,
-            sort_key=_sort_enqueue_time,
-        )
+        # the wait for each charger at this station is shared by all vehicles ranking it
+        station_waits = station_wait_estimates(sim, env, station, target_soc, wait_estimates)
 
         estimates: Dict[ChargerId, int] = {}
-        for charger_id in station.state.keys():
+        for charger_id, wait_estimate_for_charger in station_waits.items():
             charger_state = station.state.get(charger_id)
             charger = charger_state.charger if charger_state is not None else None
 
@@ -392,42 +299,6 @@ def shortest_time_to_charge_ranking(
                 min_delta_energy_change=env.config.sim.min_delta_energy_change,
             )
 
-            def _using_charger(charging_vehicle: Vehicle) -> bool:
-                if isinstance(charging_vehicle.vehicle_state, ChargingStation):
-                    if charging_vehicle.vehicle_state.charger_id == charger_id:
-                        return True
-                return False
-
-            def _waiting_for_charger(enqueued_vehicle: Vehicle) -> bool:
-                if isinstance(enqueued_vehicle.vehicle_state, ChargeQueueing):
-                    if enqueued_vehicle.vehicle_state.charger_id == charger_id:
-                        return True
-                return False
-
-            # collect all estimated remaining charge times for charging vehicles and sort them
-            charging = filter(
-                _using_charger,
-                vehicles_at_station,
-            )
-            charging_time_to_full: Tuple[Seconds, ...] = tuple(
-                sorted(map(_time_to_full_by_charger_id(charger_id), charging))
-            )
-
-            # collect estimated remaining charge times for vehicles enqueued for this charger
-            # leave them sorted by enqueue time
-            enqueued = filter(
-                _waiting_for_charger,
-                vehicles_enqueued,
-            )
-            enqueued_time_to_full: Tuple[Seconds, ...] = tuple(
-                map(_time_to_full_by_charger_id(charger_id), enqueued)
-            )
-
-            # compute the estimated wait time to access a charger for the vehicle we are ranking
-            wait_estimate_for_charger = _greedy_assignment(
-                charging_time_to_full, enqueued_time_to_full, charger_id
-            )
-
             # combine wait time with charge time
             overall_time_est = this_vehicle_charge_time + wait_estimate_for_charger
             estimates.update({charger_id: overall_time_est})
@@ -442,3 +313,180 @@ def shortest_time_to_charge_ranking(
         best_overall_time = estimates[best_charger_id]
         dispatch_time_seconds = route_travel_time_seconds(route)
         return best_charger_id, dispatch_time_seconds + best_overall_time
+
+
+def station_wait_estimates(
+    sim: SimulationState,
+    env: Environment,
+    station: Station,
+    target_soc: Ratio,
+    wait_estimates: Optional[Dict[StationId, Dict[ChargerId, Seconds]]] = None,
+) -> Dict[ChargerId, Seconds]:
+    """
+    estimates the time until a charger of each type at this station becomes available, based on
+    the vehicles charging and enqueued there. when wait_estimates is provided, the estimates are
+    computed once per station and shared by every vehicle ranking this station. the caller owns
+    wait_estimates and must only share it while the simulation state and target SoC are unchanged.
+
+    :param sim: simulation state
+    :param env: the simulation environment
+    :param station: the station
+    :param target_soc: target vehicle charging SoC percentage
+    :param wait_estimates: optional station wait estimates computed so far for this simulation
+                           state and target SoC, which is updated with this station
+    :return: the estimated wait for each charger at this station
+    """
+    if wait_estimates is None:
+        return _compute_station_wait_estimates(sim, env, station, target_soc)
+
+    estimates = wait_estimates.get(station.id)
+    if estimates is None:
+        estimates = _compute_station_wait_estimates(sim, env, station, target_soc)
+        wait_estimates[station.id] = estimates
+    return estimates
+
+
+def _compute_station_wait_estimates(
+    sim: SimulationState,
+    env: Environment,
+    station: Station,
+    target_soc: Ratio,
+) -> Dict[ChargerId, Seconds]:
+    """
+    computes the estimated wait for each charger at this station. see station_wait_estimates.
+    """
+
+    def _veh_at_station(v: Vehicle) -> bool:
+        return (
+            isinstance(v.vehicle_state, ChargingStation)
+            and v.vehicle_state.station_id == station.id
+        )
+
+    def _veh_enqueued(v: Vehicle) -> bool:
+        return (
+            isinstance(v.vehicle_state, ChargeQueueing) and v.vehicle_state.station_id == station.id
+        )
+
+    def _time_to_full_by_charger_id(c: ChargerId):
+        def _time_to_full(v: Vehicle) -> Seconds:
+            _mech = env.mechatronics.get(v.mechatronics_id)
+            _charger = env.chargers.get(c)
+            if not _mech or not _charger:
+                return 0
+            else:
+                time_est = powercurve_ops.time_to_full(
+                    v,
+                    _mech,
+                    _charger,
+                    target_soc,
+                    sim.sim_timestep_duration_seconds,
+                    min_delta_energy_change=env.config.sim.min_delta_energy_change,
+                )
+                return time_est
+
+        return _time_to_full
+
+    def _sort_enqueue_time(v: Vehicle) -> int:
+        if isinstance(v.vehicle_state, ChargeQueueing):
+            enqueue_time = int(v.vehicle_state.enqueue_time)
+        else:
+            log.error("calling _sort_enqueue_time on a vehicle state that is not ChargeQueueing")
+            enqueue_time = 0
+        return enqueue_time
+
+    # collect all vehicles that are either charging or enqueued at this station
+    vehicles_at_station = sim.get_vehicles(filter_function=_veh_at_station)
+    vehicles_enqueued = sim.get_vehicles(
+        filter_function=_veh_enqueued,
+        sort=True,
+        sort_key=_sort_enqueue_time,
+    )
+
+    estimates: Dict[ChargerId, Seconds] = {}
+    for charger_id in station.state.keys():
+
+        def _using_charger(charging_vehicle: Vehicle) -> bool:
+            if isinstance(charging_vehicle.vehicle_state, ChargingStation):
+                if charging_vehicle.vehicle_state.charger_id == charger_id:
+                    return True
+            return False
+
+        def _waiting_for_charger(enqueued_vehicle: Vehicle) -> bool:
+            if isinstance(enqueued_vehicle.vehicle_state, ChargeQueueing):
+                if enqueued_vehicle.vehicle_state.charger_id == charger_id:
+                    return True
+            return False
+
+        # collect all estimated remaining charge times for charging vehicles and sort them
+        charging = filter(
+            _using_charger,
+            vehicles_at_station,
+        )
+        charging_time_to_full: Tuple[Seconds, ...] = tuple(
+            sorted(map(_time_to_full_by_charger_id(charger_id), charging))
+        )
+
+        # collect estimated remaining charge times for vehicles enqueued for this charger
+        # leave them sorted by enqueue time
+        enqueued = filter(
+            _waiting_for_charger,
+            vehicles_enqueued,
+        )
+        enqueued_time_to_full: Tuple[Seconds, ...] = tuple(
+            map(_time_to_full_by_charger_id(charger_id), enqueued)
+        )
+
+        total_chargers = station.get_total_chargers(charger_id)
+        if total_chargers is None:
+            log.error(f"charger id {charger_id} not found at station {station.id}")
+            total_chargers = 0
+
+        # compute the estimated wait time to access a charger
+        estimates[charger_id] = charger_wait_time(
+            charging_time_to_full, enqueued_time_to_full, total_chargers
+        )
+
+    return estimates
+
+
+def charger_wait_time(
+    charging: Iterable[Seconds],
+    enqueued: Sequence[Seconds],
+    total_chargers: int,
+) -> Seconds:
+    """
+    computes the time estimated that a charger opens up for a vehicle to begin charging, by
+    greedily assigning enqueued vehicles to chargers as they free up. the time each charger
+    frees up is tracked in a min-heap, so this takes O(q log c) for q enqueued vehicles and c
+    chargers.
+
+    :param charging: remaining charge time estimates for vehicles using these chargers
+    :param enqueued: charge time estimates for enqueued vehicles, in the order they are served
+    :param total_chargers: the number of chargers these vehicles are competing for
+    :return: the time in the future we should expect to begin charging
+    """
+    if total_chargers <= 0:
+        return 0
+
+    # the time that each charger in use frees up
+    charger_free_times = list(charging)
+    heapq.heapify(charger_free_times)
+
+    time_passed = 0
+    next_enqueued = 0
+    while charger_free_times or next_enqueued < len(enqueued):
+        if len(charger_free_times) < total_chargers:
+            return time_passed
+
+        # advance time to the next released charger, and release all chargers done by then
+        time_passed = heapq.heappop(charger_free_times)
+        while charger_free_times and charger_free_times[0] <= time_passed:
+            heapq.heappop(charger_free_times)
+
+        # dequeue longest-waiting agents onto the vacant chargers
+        vacancies = max(total_chargers - len(charger_free_times), 0)
+        for charge_time in enqueued[next_enqueued : next_enqueued + vacancies]:
+            heapq.heappush(charger_free_times, time_passed + charge_time)
+        next_enqueued += vacancies
+
+    return time_passed
@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
-from typing import Tuple, TYPE_CHECKING
+from typing import Dict, Tuple, TYPE_CHECKING
 
 from nrel.hive.reporting import instruction_generator_event_ops
+from nrel.hive.reporting.report_type import ReportType
 from nrel.hive.state.vehicle_state.idle import Idle
 from nrel.hive.state.vehicle_state.repositioning import Repositioning
 
@@ -14,6 +15,8 @@ if TYPE_CHECKING:
     from nrel.hive.runner.environment import Environment
     from nrel.hive.dispatcher.instruction.instruction import Instruction
     from nrel.hive.config.dispatcher_config import DispatcherConfig
+    from nrel.hive.util.typealiases import ChargerId, StationId
+    from nrel.hive.util.units import Seconds
 
 from nrel.hive.dispatcher.instruction_generator.instruction_generator import InstructionGenerator
 from nrel.hive.dispatcher.instruction_generator.instruction_generator_ops import (
@@ -46,6 +49,9 @@ class ChargingFleetManager(InstructionGenerator):
         :return: the updated ChargingFleetManager along with instructions
         """
 
+        # station wait estimates are shared by every station search against this simulation state
+        wait_estimates: Dict[StationId, Dict[ChargerId, Seconds]] = {}
+
         # find vehicles that fall below the sum of the threshold distance and nearest valid station distance
 
         def charge_candidate(v: Vehicle) -> bool:
@@ -73,6 +79,7 @@ class ChargingFleetManager(InstructionGenerator):
                 environment=environment,
                 target_soc=environment.config.dispatcher.ideal_fastcharge_soc_limit,
                 charging_search_type=environment.config.dispatcher.charging_search_type,
+                wait_estimates=wait_estimates,
             )
             is_charge_candidate = (
                 environment.config.dispatcher.charging_range_km_threshold + nearest_station_distance
@@ -84,11 +91,12 @@ class ChargingFleetManager(InstructionGenerator):
         )
 
         # for each low_soc_vehicle that will conduct a refuel search, report the search event
-        for v in low_soc_vehicles:
-            report = instruction_generator_event_ops.refuel_search_event(
-                v, simulation_state, environment
-            )
-            environment.reporter.file_report(report)
+        if environment.reporter.wants(ReportType.REFUEL_SEARCH_EVENT):
+            for v in low_soc_vehicles:
+                report = instruction_generator_event_ops.refuel_search_event(
+                    v, simulation_state, environment
+                )
+                environment.reporter.file_report(report)
 
         charge_instructions = instruct_vehicles_to_dispatch_to_station(
             n=len(low_soc_vehicles),
@@ -98,6 +106,7 @@ class ChargingFleetManager(InstructionGenerator):
             environment=environment,
             target_soc=environment.config.dispatcher.ideal_fastcharge_soc_limit,
             charging_search_type=environment.config.dispatcher.charging_search_type,
+            wait_estimates=wait_estimates,
         )
 
         return self, charge_instructions
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import functools as ft
 import random
-from typing import List, Callable, NamedTuple
+from typing import Dict, List, Callable, NamedTuple
 
 import immutables
 
@@ -12,7 +12,7 @@ from nrel.hive.dispatcher.instruction_generator.charging_search_type import Char
 from nrel.hive.model.station.station import Station
 from nrel.hive.util.dict_ops import DictOps
 from nrel.hive.util.h3_ops import H3Ops
-from nrel.hive.util.units import Kilometers
+from nrel.hive.util.units import Kilometers, Seconds
 
 log = logging.getLogger(__name__)
 
@@ -166,6 +166,7 @@ def instruct_vehicles_to_dispatch_to_station(
     environment: Environment,
     target_soc: Ratio,
     charging_search_type: ChargingSearchType,
+    wait_estimates: Optional[Dict[StationId, Dict[ChargerId, Seconds]]] = None,
 ) -> Tuple[Instruction, ...]:
     """
     a helper function to set n vehicles to charge at a station
@@ -177,10 +178,15 @@ def instruct_vehicles_to_dispatch_to_station(
     :param environment: the simulation environment
     :param target_soc: when ranking alternatives, use this target SoC value
     :param charging_search_type: the type of search to conduct
+    :param wait_estimates: station wait estimates for this simulation state and target SoC,
+                           shared between calls by the caller. if omitted, they are shared
+                           by the vehicles in this call only.
     :return: instructions for vehicles to charge at stations
     """
 
     instructions: Tuple[Instruction, ...] = ()
+    if wait_estimates is None:
+        wait_estimates = {}
 
     for veh in vehicles:
         if len(instructions) >= n:
@@ -205,6 +211,7 @@ def instruct_vehicles_to_dispatch_to_station(
                 sim=simulation_state,
                 env=environment,
                 target_soc=target_soc,
+                wait_estimates=wait_estimates,
             )
 
         nearest_station = H3Ops.nearest_entity(
@@ -245,6 +252,7 @@ def instruct_vehicles_to_dispatch_to_station(
                     sim=simulation_state,
                     env=environment,
                     target_soc=target_soc,
+                    wait_estimates=wait_estimates,
                 )
                 if time_result is None:
                     continue
@@ -276,6 +284,7 @@ def get_nearest_valid_station_distance(
     environment: Environment,
     target_soc: Ratio,
     charging_search_type: ChargingSearchType,
+    wait_estimates: Optional[Dict[StationId, Dict[ChargerId, Seconds]]] = None,
 ) -> Kilometers:
     """
     a helper function to find the distance between a vehicle and the closest valid station
@@ -287,6 +296,8 @@ def get_nearest_valid_station_distance(
     :param environment: the simulation environment
     :param target_soc: when ranking alternatives, use this target SoC value
     :param charging_search_type: the type of search to conduct
+    :param wait_estimates: station wait estimates for this simulation state and target SoC,
+                           shared between calls by the caller
     :return: the distance in km to the nearest valid station
     """
 
@@ -309,6 +320,7 @@ def get_nearest_valid_station_distance(
             sim=simulation_state,
             env=environment,
             target_soc=target_soc,
+            wait_estimates=wait_estimates,
         )
 
     nearest_station = H3Ops.nearest_entity(
@@ -16,11 +16,14 @@ from nrel.hive.initialization.initialize_ops import (
 )
 from nrel.hive.model.base import Base
 from nrel.hive.model.energy.charger import build_chargers_table
+from nrel.hive.model.entity_position import EntityPosition
+from nrel.hive.model.roadnetwork.roadnetwork import positions_from_rows
 from nrel.hive.model.roadnetwork.osm.osm_roadnetwork import OSMRoadNetwork
 from nrel.hive.model.station.station import Station
 from nrel.hive.model.vehicle.mechatronics import build_mechatronics_table
 from nrel.hive.model.vehicle.schedules import build_schedules_table
 from nrel.hive.model.vehicle.vehicle import Vehicle
+from nrel.hive.reporting.handler.columnar_handler import ColumnarHandler
 from nrel.hive.reporting.handler.eventful_handler import EventfulHandler
 from nrel.hive.reporting.handler.instruction_handler import InstructionHandler
 from nrel.hive.reporting.handler.stateful_handler import StatefulHandler
@@ -185,15 +188,24 @@ def initialize_environment_reporting(
     :return: a SimulationState and Environment with reporting added
     """
     # configure reporting
-    reporter = Reporter()
-    if config.global_config.log_events:
-        reporter.add_handler(
-            EventfulHandler(config.global_config, config.scenario_output_directory)
-        )
-    if config.global_config.log_states:
-        reporter.add_handler(
-            StatefulHandler(config.global_config, config.scenario_output_directory)
-        )
+    reporter = Reporter(
+        flush_interval_steps=config.global_config.log_flush_interval_steps,
+        max_buffered_reports=config.global_config.log_max_buffered_reports,
+    )
+    if config.global_config.log_format != "json":
+        if config.global_config.log_events or config.global_config.log_states:
+            reporter.add_handler(
+                ColumnarHandler(config.global_config, config.scenario_output_directory)
+            )
+    else:
+        if config.global_config.log_events:
+            reporter.add_handler(
+                EventfulHandler(config.global_config, config.scenario_output_directory)
+            )
+        if config.global_config.log_states:
+            reporter.add_handler(
+                StatefulHandler(config.global_config, config.scenario_output_directory)
+            )
     if config.global_config.log_instructions:
         reporter.add_handler(
             InstructionHandler(config.global_config, config.scenario_output_directory)
@@ -249,6 +261,8 @@ def osm_init_function(
             sim_h3_resolution=config.sim.sim_h3_resolution,
             road_network_file=config.input_config.road_network_file,
             default_speed_kmph=config.network.default_speed_kmph,
+            simplify_graph=config.network.simplify_graph,
+            prune_graph=config.network.prune_graph,
         )
     elif config.input_config.geofence_file:
         try:
@@ -264,6 +278,8 @@ def osm_init_function(
         road_network = OSMRoadNetwork.from_polygon(
             sim_h3_resolution=config.sim.sim_h3_resolution,
             default_speed_kmph=config.network.default_speed_kmph,
+            simplify_graph=config.network.simplify_graph,
+            prune_graph=config.network.prune_graph,
             polygon=polygon_union,
             cache_dir=cache_dir,
         )
@@ -297,8 +313,10 @@ def vehicle_init_function(
         else None
     )
 
-    def _collect_vehicle(row: Dict[str, str]) -> Optional[Vehicle]:
-        veh = Vehicle.from_row(row, simulation_state.road_network, environment)
+    def _collect_vehicle(
+        row: Dict[str, str], position: Optional[EntityPosition]
+    ) -> Optional[Vehicle]:
+        veh = Vehicle.from_row(row, simulation_state.road_network, environment, position)
 
         if vehicle_member_ids is not None:
             if veh.id in vehicle_member_ids:
@@ -306,12 +324,13 @@ def vehicle_init_function(
 
         return veh
 
-    # open vehicles file and add each row
+    # open vehicles file and add each row, snapping all vehicle locations to the road network at once
     with open(vehicles_file, "r", encoding="utf-8-sig") as vf:
-        reader = csv.DictReader(vf)
-        vehicles_or_none = [_collect_vehicle(row) for row in reader]
-        vehicles = [v for v in vehicles_or_none if v is not None]
-        sim_with_vehicles = simulation_state_ops.add_entities(simulation_state, vehicles)
+        rows = list(csv.DictReader(vf))
+    positions = positions_from_rows(rows, simulation_state.road_network)
+    vehicles_or_none = [_collect_vehicle(row, pos) for row, pos in zip(rows, positions)]
+    vehicles = [v for v in vehicles_or_none if v is not None]
+    sim_with_vehicles = simulation_state_ops.add_entities(simulation_state, vehicles)
 
     return sim_with_vehicles, environment
 
@@ -336,19 +355,20 @@ def base_init_function(
         else None
     )
 
-    def _collect_base(row: Dict[str, str]) -> Optional[Base]:
-        base = Base.from_row(row, simulation_state.road_network)
+    def _collect_base(row: Dict[str, str], position: Optional[EntityPosition]) -> Optional[Base]:
+        base = Base.from_row(row, simulation_state.road_network, position)
 
         if base_member_ids is not None:
             if base.id in base_member_ids:
                 base = base.set_membership(base_member_ids[base.id])
         return base
 
-    # add all bases from the base file
+    # add all bases from the base file, snapping all base locations to the road network at once
     with open(config.input_config.bases_file, "r", encoding="utf-8-sig") as bf:
-        reader = csv.DictReader(bf)
-        bases_or_none = [_collect_base(row) for row in reader]
-        bases = [b for b in bases_or_none if b is not None]
+        rows = list(csv.DictReader(bf))
+    positions = positions_from_rows(rows, simulation_state.road_network)
+    bases_or_none = [_collect_base(row, pos) for row, pos in zip(rows, positions)]
+    bases = [b for b in bases_or_none if b is not None]
 
     sim_w_bases = simulation_state_ops.add_entities(simulation_state, bases)
 
@@ -442,9 +462,13 @@ def station_init_function(
     )
 
     def _add_row_unsafe(
-        builder: immutables.Map[str, Station], row: Dict[str, str]
+        builder: immutables.Map[str, Station],
+        row_and_position: Tuple[Dict[str, str], Optional[EntityPosition]],
     ) -> immutables.Map[str, Station]:
-        station = Station.from_row(row, builder, simulation_state.road_network, environment)
+        row, position = row_and_position
+        station = Station.from_row(
+            row, builder, simulation_state.road_network, environment, position
+        )
 
         if station_member_ids is not None:
             if station.id in station_member_ids:
@@ -453,12 +477,14 @@ def station_init_function(
         updated_builder = DictOps.add_to_dict(builder, station.id, station)
         return updated_builder
 
-    # grab all stations (some may exist on multiple rows)
+    # grab all stations (some may exist on multiple rows), snapping all station locations
+    # to the road network at once
     with open(config.input_config.stations_file, "r", encoding="utf-8-sig") as bf:
-        reader = csv.DictReader(bf)
-        stations_builder: immutables.Map[str, Station] = ft.reduce(
-            _add_row_unsafe, reader, immutables.Map()
-        )
+        rows = list(csv.DictReader(bf))
+    positions = positions_from_rows(rows, simulation_state.road_network)
+    stations_builder: immutables.Map[str, Station] = ft.reduce(
+        _add_row_unsafe, zip(rows, positions), immutables.Map()
+    )
 
     # add all stations to the simulation once we know they are complete
     return (
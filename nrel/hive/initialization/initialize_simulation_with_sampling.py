@@ -16,9 +16,11 @@ from nrel.hive.initialization.sample_vehicles import (
 )
 from nrel.hive.model.base import Base
 from nrel.hive.model.energy.charger import build_chargers_table
+from nrel.hive.model.entity_position import EntityPosition
 from nrel.hive.model.roadnetwork.haversine_roadnetwork import HaversineRoadNetwork
 from nrel.hive.model.roadnetwork.link import Link
 from nrel.hive.model.roadnetwork.osm.osm_roadnetwork import OSMRoadNetwork
+from nrel.hive.model.roadnetwork.roadnetwork import positions_from_rows
 from nrel.hive.model.station.station import Station
 from nrel.hive.model.vehicle.mechatronics import build_mechatronics_table
 from nrel.hive.model.vehicle.schedules import build_schedules_table, ScheduleId, ScheduleFunction
@@ -72,6 +74,8 @@ def initialize_simulation_with_sampling(
             sim_h3_resolution=config.sim.sim_h3_resolution,
             road_network_file=Path(config.input_config.road_network_file),
             default_speed_kmph=config.network.default_speed_kmph,
+            simplify_graph=config.network.simplify_graph,
+            prune_graph=config.network.prune_graph,
         )
         sim_initial = SimulationState(
             road_network=osm_road_network,
@@ -145,14 +149,15 @@ def _build_bases(
     :raises Exception if a parse error in Base.from_row or any error adding the Base to the Sim
     """
 
-    def _collect_base(row: Dict[str, str]) -> Base:
-        base = Base.from_row(row, simulation_state.road_network)
+    def _collect_base(row: Dict[str, str], position: Optional[EntityPosition]) -> Base:
+        base = Base.from_row(row, simulation_state.road_network, position)
         return base
 
-    # add all bases from the base file
+    # add all bases from the base file, snapping all base locations to the road network at once
     with open(bases_file, "r", encoding="utf-8-sig") as bf:
-        reader = csv.DictReader(bf)
-        bases = [_collect_base(row) for row in reader]
+        rows = list(csv.DictReader(bf))
+    positions = positions_from_rows(rows, simulation_state.road_network)
+    bases = [_collect_base(row, pos) for row, pos in zip(rows, positions)]
 
     sim_with_bases = simulation_state_ops.add_entities(simulation_state, bases)
 
@@ -172,18 +177,22 @@ def _build_stations(
     """
 
     def _add_row_unsafe(
-        builder: immutables.Map[str, Station], row: Dict[str, str]
+        builder: immutables.Map[str, Station],
+        row_and_position: Tuple[Dict[str, str], Optional[EntityPosition]],
     ) -> immutables.Map[str, Station]:
-        station = Station.from_row(row, builder, simulation_state.road_network, env)
+        row, position = row_and_position
+        station = Station.from_row(row, builder, simulation_state.road_network, env, position)
         updated_builder = DictOps.add_to_dict(builder, station.id, station)
         return updated_builder
 
-    # grab all stations (some may exist on multiple rows)
+    # grab all stations (some may exist on multiple rows), snapping all station locations
+    # to the road network at once
     with open(stations_file, "r", encoding="utf-8-sig") as bf:
-        reader = csv.DictReader(bf)
-        stations_builder: immutables.Map[str, Station] = ft.reduce(
-            _add_row_unsafe, reader, immutables.Map()
-        )
+        rows = list(csv.DictReader(bf))
+    positions = positions_from_rows(rows, simulation_state.road_network)
+    stations_builder: immutables.Map[str, Station] = ft.reduce(
+        _add_row_unsafe, zip(rows, positions), immutables.Map()
+    )
 
     # add all stations to the simulation once we know they are complete
     sim_with_stations = simulation_state_ops.add_entities(
@@ -75,15 +75,19 @@ class Request(Entity):
         allows_pooling: bool,
         fleet_id: Optional[MembershipId] = None,
         value: Currency = 0,
+        origin_position: Optional[EntityPosition] = None,
+        destination_position: Optional[EntityPosition] = None,
     ) -> Request:
         assert departure_time >= 0
         assert passengers > 0
-        origin_position = road_network.position_from_geoid(origin)
+        if origin_position is None:
+            origin_position = road_network.position_from_geoid(origin)
         if origin_position is None:
             raise ValueError(
                 f"request {request_id} origin cannot be positioned on the road network"
             )
-        destination_position = road_network.position_from_geoid(destination)
+        if destination_position is None:
+            destination_position = road_network.position_from_geoid(destination)
         if destination_position is None:
             raise ValueError(
                 f"request {request_id} destination cannot be positioned on the road network"
@@ -118,7 +122,12 @@ class Request(Entity):
 
     @classmethod
     def from_row(
-        cls, row: Dict[str, str], env: Environment, road_network: RoadNetwork
+        cls,
+        row: Dict[str, str],
+        env: Environment,
+        road_network: RoadNetwork,
+        origin_position: Optional[EntityPosition] = None,
+        destination_position: Optional[EntityPosition] = None,
     ) -> Tuple[Optional[Exception], Optional[Request]]:
         """
         takes a csv row and turns it into a Request
@@ -129,6 +138,8 @@ class Request(Entity):
         :param env: the static environment variables
 
         :param road_network: the road network
+        :param origin_position: the origin position, if it was already snapped to the road network
+        :param destination_position: the destination position, if it was already snapped to the road network
         :return: a Request, or an error
         """
         if "request_id" not in row:
@@ -194,6 +205,8 @@ class Request(Entity):
                     departure_time=departure_time_result,
                     passengers=passengers,
                     allows_pooling=allows_pooling,
+                    origin_position=origin_position,
+                    destination_position=destination_position,
                 )
                 return None, request
             except ValueError:
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from typing import Dict, Iterator, Optional, Sequence, Tuple, Union, overload
+
+import h3.api.basic_int as h3_int
+import numpy as np
+
+from nrel.hive.model.roadnetwork.linktraversal import LinkTraversal
+from nrel.hive.util.typealiases import LinkId
+from nrel.hive.util.units import Kilometers, Seconds, HOURS_TO_SECONDS
+
+
+class ArrayRoute(Sequence[LinkTraversal]):
+    """
+    a route stored as arrays over the links of a road network. each entry holds the index of
+    its road network link, the (integer) h3 cells where the traversal of that link starts and
+    ends, and the distance and speed of the traversal. slices share the underlying arrays, and
+    LinkTraversals are only built when an entry is accessed.
+
+    :param link_ids: the LinkIds of the road network, shared by all routes on that network
+    :param link_lookup: the index of each LinkId in link_ids
+    :param link_index: the index in link_ids of each link on the route
+    :param start_cells: the h3 cell where the traversal of each link starts
+    :param end_cells: the h3 cell where the traversal of each link ends
+    :param distance_km: the distance of each link traversal
+    :param speed_kmph: the speed of each link traversal
+    """
+
+    __slots__ = (
+        "link_ids",
+        "link_lookup",
+        "link_index",
+        "start_cells",
+        "end_cells",
+        "distance_km",
+        "speed_kmph",
+    )
+
+    def __init__(
+        self,
+        link_ids: Tuple[LinkId, ...],
+        link_lookup: Dict[LinkId, int],
+        link_index: np.ndarray,
+        start_cells: np.ndarray,
+        end_cells: np.ndarray,
+        distance_km: np.ndarray,
+        speed_kmph: np.ndarray,
+    ):
+        self.link_ids = link_ids
+        self.link_lookup = link_lookup
+        self.link_index = link_index
+        self.start_cells = start_cells
+        self.end_cells = end_cells
+        self.distance_km = distance_km
+        self.speed_kmph = speed_kmph
+
+    @classmethod
+    def from_link_traversals(
+        cls,
+        links: Sequence[LinkTraversal],
+        link_ids: Tuple[LinkId, ...],
+        link_lookup: Dict[LinkId, int],
+    ) -> Optional[ArrayRoute]:
+        """
+        packs a sequence of LinkTraversals into an ArrayRoute
+
+        :param links: the link traversals
+        :param link_ids: the LinkIds of the road network
+        :param link_lookup: the index of each LinkId in link_ids
+        :return: the ArrayRoute, or None if a link is not on the road network
+        """
+        indices = [link_lookup.get(link.link_id) for link in links]
+        if any(index is None for index in indices):
+            return None
+        return cls(
+            link_ids,
+            link_lookup,
+            np.array(indices, dtype=np.int64),
+            np.array([h3_int.string_to_h3(link.start) for link in links], dtype=np.uint64),
+            np.array([h3_int.string_to_h3(link.end) for link in links], dtype=np.uint64),
+            np.array([link.distance_km for link in links], dtype=np.float64),
+            np.array([link.speed_kmph for link in links], dtype=np.float64),
+        )
+
+    def _link_traversal(self, i: int) -> LinkTraversal:
+        return LinkTraversal(
+            link_id=self.link_ids[self.link_index[i]],
+            start=h3_int.h3_to_string(int(self.start_cells[i])),
+            end=h3_int.h3_to_string(int(self.end_cells[i])),
+            distance_km=float(self.distance_km[i]),
+            speed_kmph=float(self.speed_kmph[i]),
+        )
+
+    def _with_arrays(self, key: Union[slice, np.ndarray]) -> ArrayRoute:
+        return ArrayRoute(
+            self.link_ids,
+            self.link_lookup,
+            self.link_index[key],
+            self.start_cells[key],
+            self.end_cells[key],
+            self.distance_km[key],
+            self.speed_kmph[key],
+        )
+
+    def __len__(self) -> int:
+        return len(self.link_index)
+
+    @overload
+    def __getitem__(self, i: int) -> LinkTraversal:
+        ...
+
+    @overload
+    def __getitem__(self, i: slice) -> ArrayRoute:
+        ...
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[LinkTraversal, ArrayRoute]:
+        if isinstance(i, slice):
+            return self._with_arrays(i)
+        n = len(self)
+        if not -n <= i < n:
+            raise IndexError("ArrayRoute index out of range")
+        return self._link_traversal(i % n)
+
+    def __iter__(self) -> Iterator[LinkTraversal]:
+        for i in range(len(self)):
+            yield self._link_traversal(i)
+
+    def __add__(
+        self, other: Sequence[LinkTraversal]
+    ) -> Union[ArrayRoute, Tuple[LinkTraversal, ...]]:
+        other_route = self._as_array_route(other)
+        if other_route is None:
+            return tuple(self) + tuple(other)
+        return self._concatenate(self, other_route)
+
+    def __radd__(
+        self, other: Sequence[LinkTraversal]
+    ) -> Union[ArrayRoute, Tuple[LinkTraversal, ...]]:
+        other_route = self._as_array_route(other)
+        if other_route is None:
+            return tuple(other) + tuple(self)
+        return self._concatenate(other_route, self)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (tuple, ArrayRoute)):
+            return NotImplemented
+        return len(self) == len(other) and tuple(self) == tuple(other)
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
+    def __repr__(self) -> str:
+        return f"ArrayRoute({tuple(self)})"
+
+    def _as_array_route(self, other: Sequence[LinkTraversal]) -> Optional[ArrayRoute]:
+        if isinstance(other, ArrayRoute):
+            return other if other.link_ids is self.link_ids else None
+        return ArrayRoute.from_link_traversals(other, self.link_ids, self.link_lookup)
+
+    @staticmethod
+    def _concatenate(a: ArrayRoute, b: ArrayRoute) -> ArrayRoute:
+        return ArrayRoute(
+            a.link_ids,
+            a.link_lookup,
+            np.concatenate((a.link_index, b.link_index)),
+            np.concatenate((a.start_cells, b.start_cells)),
+            np.concatenate((a.end_cells, b.end_cells)),
+            np.concatenate((a.distance_km, b.distance_km)),
+            np.concatenate((a.speed_kmph, b.speed_kmph)),
+        )
+
+    def moving_links(self) -> np.ndarray:
+        """
+        :return: a mask of the links which do not start and end at the same location
+        """
+        return self.start_cells != self.end_cells
+
+    def without_stationary_links(self) -> ArrayRoute:
+        """
+        :return: this route, with any links that start and end at the same location removed
+        """
+        moving = self.moving_links()
+        return self if moving.all() else self._with_arrays(moving)
+
+    def travel_time_seconds(self) -> np.ndarray:
+        """
+        the travel time of each link, truncated to whole seconds as in LinkTraversal.travel_time_seconds
+
+        :return: the travel time of each link traversal
+        """
+        return (self.distance_km / self.speed_kmph * HOURS_TO_SECONDS).astype(np.int64)
+
+    def elapsed_seconds(self, duration_seconds: Seconds, min_links: int = 16) -> np.ndarray:
+        """
+        the cumulative travel time along the route, where links which start and end at the same
+        location take no time. only a prefix of the route is summed, growing it until it lasts
+        longer than duration_seconds, so that the cost follows the links reached and not the
+        length of the route.
+
+        :param duration_seconds: the time the prefix should outlast
+        :param min_links: the number of links in the first prefix
+        :return: the elapsed time at the end of each link of the prefix; it covers the whole
+                 route if the route does not last longer than duration_seconds
+        """
+        n = len(self)
+        prefix = min(n, min_links)
+        while True:
+            head = self._with_arrays(slice(0, prefix))
+            elapsed = np.cumsum(np.where(head.moving_links(), head.travel_time_seconds(), 0))
+            if prefix == n or elapsed[-1] > duration_seconds:
+                return elapsed
+            prefix = min(n, prefix * 4)
+
+    def total_distance_km(self) -> Kilometers:
+        return float(self.distance_km.sum())
+
+    def total_travel_time_seconds(self) -> Seconds:
+        return int(self.travel_time_seconds().sum())
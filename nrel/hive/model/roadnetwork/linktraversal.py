@@ -3,9 +3,10 @@ from __future__ import annotations
 from typing import Optional, NamedTuple, Tuple, TYPE_CHECKING
 
 from nrel.hive.util.h3_ops import H3Ops
-from nrel.hive.util.units import Seconds, Kilometers, Kmph, hours_to_seconds
+from nrel.hive.util.units import Seconds, Kilometers, Kmph, hours_to_seconds, SECONDS_TO_HOURS
 
 if TYPE_CHECKING:
+    from nrel.hive.model.roadnetwork.roadnetwork import RoadNetwork
     from nrel.hive.util.typealiases import LinkId, GeoId
 
 
@@ -94,7 +95,9 @@ class LinkTraversalResult(NamedTuple):
 
 
 def traverse_up_to(
-    link: LinkTraversal, available_time_seconds: Seconds
+    link: LinkTraversal,
+    available_time_seconds: Seconds,
+    road_network: Optional[RoadNetwork] = None,
 ) -> Tuple[Optional[Exception], Optional[LinkTraversalResult]]:
     """
     using the ground truth road network, and some agent Link traversal, attempt to traverse
@@ -104,6 +107,8 @@ def traverse_up_to(
     :param link: the plan the agent has to traverse a subset of a road network link
 
     :param available_time_seconds: the remaining time the agent has in this time step
+    :param road_network: the road network, used to find the point where a link is split.
+                         if not provided, the point is interpolated between the link endpoints
     :return: the updated traversal, or, an exception.
              on update, if there is any remaining traversal, return an updated Link.
              if no traversal remains, return None.
@@ -138,14 +143,30 @@ def traverse_up_to(
             # leaving no remaining time.
 
             # find the point in this link to split into two sub-links
-            mid_geoid = H3Ops.point_along_link(link, available_time_seconds)
-
-            # create two sub-links, one for the part that was traversed, and one for the remaining part
-            traversed = LinkTraversal.build(
-                link.link_id, link.start, mid_geoid, speed_kmph=link.speed_kmph
+            if road_network is None:
+                mid_geoid = H3Ops.point_along_link(link, available_time_seconds)
+            else:
+                mid_geoid = road_network.point_along_link(link, available_time_seconds)
+
+            # create two sub-links, one for the part that was traversed, and one for the remaining part.
+            # the link distance is split by the distance travelled instead of being recomputed from the
+            # new endpoints.
+            experienced_distance_km = min(
+                available_time_seconds * SECONDS_TO_HOURS * link.speed_kmph, link.distance_km
+            )
+            traversed = LinkTraversal(
+                link_id=link.link_id,
+                start=link.start,
+                end=mid_geoid,
+                distance_km=experienced_distance_km,
+                speed_kmph=link.speed_kmph,
             )
-            remaining = LinkTraversal.build(
-                link.link_id, mid_geoid, link.end, speed_kmph=link.speed_kmph
+            remaining = LinkTraversal(
+                link_id=link.link_id,
+                start=mid_geoid,
+                end=link.end,
+                distance_km=link.distance_km - experienced_distance_km,
+                speed_kmph=link.speed_kmph,
             )
 
             result = LinkTraversalResult(
@@ -1,18 +1,25 @@
 from __future__ import annotations
 
-import functools as ft
-from typing import Tuple, Optional, NamedTuple
+from typing import Dict, List, Tuple, Optional, NamedTuple, Sequence
 
 import h3
+import h3.api.basic_int as h3_int
 import immutables
+import numpy as np
 from networkx import MultiDiGraph
 from scipy.spatial import cKDTree
 
+from nrel.hive.model.entity_position import EntityPosition
+from nrel.hive.model.roadnetwork.array_route import ArrayRoute
 from nrel.hive.model.roadnetwork.link import Link
-from nrel.hive.model.roadnetwork.link_id import create_link_id
+from nrel.hive.model.roadnetwork.linktraversal import LinkTraversal
+from nrel.hive.model.roadnetwork.link_id import NodeId, create_link_id
 from nrel.hive.model.roadnetwork.osm.osm_roadnetwork_ops import safe_get_node_coordinates
 from nrel.hive.util.typealiases import GeoId, LinkId
-from nrel.hive.util.units import M_TO_KM, Kmph
+from nrel.hive.util.units import M_TO_KM, Kilometers, Kmph
+
+# fraction of a link's length by which its spatial index midpoint is shifted towards its source
+_MIDPOINT_SRC_OFFSET = 0.001
 
 
 class OSMRoadNetworkLinkHelper(NamedTuple):
@@ -23,12 +30,34 @@ class OSMRoadNetworkLinkHelper(NamedTuple):
                                  to the links_linkid_lookup collection
     :param links_linkid_lookup: used in conjunction with the cKDTree to provide the LinkId of the nearest Link
     :param link_count: the count of links
+    :param link_start_coords: (lat, lon) of each link's start, sharing an index with links_linkid_lookup
+    :param link_end_coords: (lat, lon) of each link's end, sharing an index with links_linkid_lookup
+    :param link_index: the index of each LinkId in links_linkid_lookup and the link geometry arrays
+    :param link_bearing: the bearing (degrees clockwise from north) of each link
+    :param link_line_offsets: the slice of link_line_cells and link_line_distance_km for link i
+                              begins at link_line_offsets[i] and ends at link_line_offsets[i + 1]
+    :param link_line_cells: the h3 line of each link (as integer h3 indices), concatenated
+    :param link_line_distance_km: the distance along its link to each cell in link_line_cells
+    :param link_distance_km: the distance of each link
+    :param link_speed_kmph: the speed of each link
+    :param link_shapes: for links which were merged when simplifying the road network, the
+                        (fraction along the link, lat, lon) of each interior point of the link
     """
 
     links: immutables.Map[LinkId, Link]
     links_spatial_lookup: cKDTree
     links_linkid_lookup: Tuple[LinkId, ...]
     link_count: int
+    link_start_coords: np.ndarray
+    link_end_coords: np.ndarray
+    link_index: Dict[LinkId, int]
+    link_bearing: np.ndarray
+    link_line_offsets: np.ndarray
+    link_line_cells: np.ndarray
+    link_line_distance_km: np.ndarray
+    link_distance_km: np.ndarray
+    link_speed_kmph: np.ndarray
+    link_shapes: Dict[LinkId, Tuple[Tuple[float, float, float], ...]]
 
     def link_by_geoid(self, geoid: GeoId) -> Tuple[Optional[Exception], Optional[Link]]:
         """
@@ -56,6 +85,216 @@ class OSMRoadNetworkLinkHelper(NamedTuple):
         except Exception as e:
             return e, None
 
+    def positions_by_geoids(
+        self, geoids: Sequence[GeoId]
+    ) -> Tuple[Optional[Exception], Optional[Tuple[EntityPosition, ...]]]:
+        """
+        snaps a batch of geoids to the road network. the nearest links are found with a single
+        query against the CKDTree, and each geoid is projected onto its nearest link to find the
+        position along that link, which is looked up in the precomputed h3 line of the link.
+
+        :param geoids: the geoids to query
+        :return: an error, or the position on the nearest link for each geoid, in the same order
+        """
+        if len(geoids) == 0:
+            return None, ()
+        try:
+            points = np.array([h3.h3_to_geo(geoid) for geoid in geoids], dtype=np.float64)
+            _, index_result = self.links_spatial_lookup.query(points, workers=-1)
+            indices = np.asarray(index_result, dtype=np.int64)
+            if np.any(indices >= self.link_count):
+                return (
+                    Exception(
+                        f"internal error on nearest link for geoids: resulting spatial index value is invalid"
+                    ),
+                    None,
+                )
+
+            # find the along-track distance of each point from its link start using the link
+            # bearing. longitude deltas are scaled by cos(latitude) so that this is (locally) orthogonal.
+            starts = self.link_start_coords[indices]
+            ends = self.link_end_coords[indices]
+            lon_scale = np.cos(np.radians(points[:, 0]))
+            link_lat = ends[:, 0] - starts[:, 0]
+            link_lon = (ends[:, 1] - starts[:, 1]) * lon_scale
+            link_length = np.hypot(link_lat, link_lon)
+            bearing = np.radians(self.link_bearing[indices])
+            along_track = (points[:, 0] - starts[:, 0]) * np.cos(bearing) + (
+                points[:, 1] - starts[:, 1]
+            ) * lon_scale * np.sin(bearing)
+            ratio = np.divide(
+                along_track, link_length, out=np.zeros_like(along_track), where=link_length > 0
+            )
+            ratio = np.clip(ratio, 0.0, 1.0)
+
+            # the cells of an h3 line are evenly spaced along the link
+            line_start = self.link_line_offsets[indices]
+            line_count = self.link_line_offsets[indices + 1] - line_start
+            cell_indices = line_start + np.rint(ratio * (line_count - 1)).astype(np.int64)
+
+            # links merged when simplifying the road network are not straight, so points on
+            # them are projected onto their shape instead of the chord between their endpoints
+            if self.link_shapes:
+                for i, index in enumerate(indices):
+                    if self.links_linkid_lookup[index] in self.link_shapes:
+                        cell_indices[i] = self._nearest_cell_on_shape(int(index), points[i])
+            cells = self.link_line_cells[cell_indices]
+
+            positions = tuple(
+                EntityPosition(self.links_linkid_lookup[index], h3_int.h3_to_string(int(cell)))
+                for index, cell in zip(indices, cells)
+            )
+            return None, positions
+
+        except Exception as e:
+            return e, None
+
+    def _nearest_cell_on_shape(self, index: int, point: np.ndarray) -> int:
+        """
+        projects a point onto the shape of a merged link, finding the cell of the link's h3 line
+        nearest to the projected point
+
+        :param index: the index of the link
+        :param point: the (lat, lon) of the point
+        :return: the index into link_line_cells of the nearest cell
+        """
+        link_id = self.links_linkid_lookup[index]
+        fractions, vertices = _shape_vertices(
+            self.link_shapes[link_id], self.link_start_coords[index], self.link_end_coords[index]
+        )
+        lon_scale = np.cos(np.radians(point[0]))
+        scaled = vertices * np.array([1.0, lon_scale])
+        target = point * np.array([1.0, lon_scale])
+        segment_start, segment = scaled[:-1], scaled[1:] - scaled[:-1]
+        segment_length_sq = np.einsum("ij,ij->i", segment, segment)
+        t = np.divide(
+            np.einsum("ij,ij->i", target - segment_start, segment),
+            segment_length_sq,
+            out=np.zeros_like(segment_length_sq),
+            where=segment_length_sq > 0,
+        )
+        t = np.clip(t, 0.0, 1.0)
+        offset = target - (segment_start + segment * t[:, np.newaxis])
+        nearest = int(np.argmin(np.einsum("ij,ij->i", offset, offset)))
+        fraction = fractions[nearest] + t[nearest] * (fractions[nearest + 1] - fractions[nearest])
+
+        line_start, line_end = self.link_line_offsets[index], self.link_line_offsets[index + 1]
+        distances = self.link_line_distance_km[line_start:line_end]
+        target_km = fraction * self.link_distance_km[index]
+        return int(line_start + np.argmin(np.abs(distances - target_km)))
+
+    def geoid_along_link(self, link: LinkTraversal, distance_km: Kilometers) -> Optional[GeoId]:
+        """
+        finds the GeoId some distance beyond the start of a (partial) link traversal,
+        using the precomputed h3 line of the link
+
+        :param link: the link traversal we are finding a point along
+        :param distance_km: the distance to move from the start of the traversal
+        :return: the GeoId on the link, or None if the traversal does not lie along a known link
+        """
+        index = self.link_index.get(link.link_id)
+        if index is None:
+            return None
+        road_link = self.links[link.link_id]
+        line_start, line_end = self.link_line_offsets[index], self.link_line_offsets[index + 1]
+        cells = self.link_line_cells[line_start:line_end]
+        distances = self.link_line_distance_km[line_start:line_end]
+
+        # traversals usually span to the end of the road network link, so we only search
+        # the line for the endpoints of a partial traversal
+        if link.start == road_link.start:
+            start_index = 0
+        else:
+            start_cells = np.flatnonzero(cells == h3_int.string_to_h3(link.start))
+            if len(start_cells) == 0:
+                return None
+            start_index = int(start_cells[0])
+        if link.end == road_link.end:
+            end_index = len(cells) - 1
+        else:
+            end_cells = np.flatnonzero(cells == h3_int.string_to_h3(link.end))
+            if len(end_cells) == 0:
+                return None
+            end_index = int(end_cells[-1])
+
+        target_km = min(distances[start_index] + distance_km, distances[end_index])
+        cell_index = min(int(distances.searchsorted(target_km)), end_index)
+        return h3_int.h3_to_string(int(cells[cell_index]))
+
+    def geometry_along_link(self, link: LinkTraversal) -> Optional[Tuple[Tuple[float, float], ...]]:
+        """
+        recovers the shape of a (partial) traversal of a link which was merged when
+        simplifying the road network
+
+        :param link: the link traversal
+        :return: the (lat, lon) points along the traversal, or None if the link has no shape
+        """
+        shape = self.link_shapes.get(link.link_id)
+        index = self.link_index.get(link.link_id)
+        if shape is None or index is None:
+            return None
+        road_link = self.links[link.link_id]
+        line_start, line_end = self.link_line_offsets[index], self.link_line_offsets[index + 1]
+        cells = self.link_line_cells[line_start:line_end]
+        distances = self.link_line_distance_km[line_start:line_end]
+
+        def _fraction(geoid: GeoId) -> Optional[float]:
+            matches = np.flatnonzero(cells == h3_int.string_to_h3(geoid))
+            if len(matches) == 0 or road_link.distance_km <= 0:
+                return None
+            return float(distances[matches[0]] / road_link.distance_km)
+
+        start = 0.0 if link.start == road_link.start else _fraction(link.start)
+        end = 1.0 if link.end == road_link.end else _fraction(link.end)
+        if start is None or end is None:
+            return None
+        interior = tuple((lat, lon) for fraction, lat, lon in shape if start < fraction < end)
+        return (h3.h3_to_geo(link.start),) + interior + (h3.h3_to_geo(link.end),)
+
+    def route_from_nx_path(
+        self,
+        nx_path: Sequence[NodeId],
+        origin: EntityPosition,
+        destination: EntityPosition,
+    ) -> Tuple[Optional[Exception], Optional[ArrayRoute]]:
+        """
+        builds an ArrayRoute from a networkx shortest path result (a list of node ids) between
+        the end of the origin link and the start of the destination link. the origin and
+        destination links are attached, starting and ending at the origin and destination GeoIds.
+
+        :param nx_path: the networkx path result
+        :param origin: the position the route starts from
+        :param destination: the position the route ends at
+        :return: an error, or, the resulting route
+        """
+        link_ids = (
+            [origin.link_id]
+            + [create_link_id(src, dst) for src, dst in zip(nx_path[:-1], nx_path[1:])]
+            + [destination.link_id]
+        )
+        indices = []
+        for link_id in link_ids:
+            index = self.link_index.get(link_id)
+            if index is None:
+                return Exception(f"route traverses link id {link_id} which does not exist"), None
+            indices.append(index)
+
+        link_index = np.array(indices, dtype=np.int64)
+        start_cells = self.link_line_cells[self.link_line_offsets[link_index]]
+        end_cells = self.link_line_cells[self.link_line_offsets[link_index + 1] - 1]
+        start_cells[0] = h3_int.string_to_h3(origin.geoid)
+        end_cells[-1] = h3_int.string_to_h3(destination.geoid)
+        route = ArrayRoute(
+            self.links_linkid_lookup,
+            self.link_index,
+            link_index,
+            start_cells,
+            end_cells,
+            self.link_distance_km[link_index],
+            self.link_speed_kmph[link_index],
+        )
+        return None, route
+
     @classmethod
     def build(
         cls,
@@ -64,154 +303,220 @@ class OSMRoadNetworkLinkHelper(NamedTuple):
         default_speed_kmph: Kmph = 40.0,
     ) -> Tuple[Optional[Exception], Optional[OSMRoadNetworkLinkHelper]]:
         """
-        reads in the graph links from a networkx graph and builds a table with Links by LinkId
+        reads in the graph links from a networkx graph and builds a table with Links by LinkId.
+        all edges are extracted in a single pass, and the link midpoints used for the spatial
+        index are computed over arrays of link start/end coordinates.
+
         :param graph: the input graph
         :param sim_h3_resolution: h3 resolution for entities in sim
         :param default_speed_kmph: default link speed for unlabeled links
         :return: either an error, or, the lookup table
         """
+        # each node is shared by multiple edges, so we only compute its GeoId and coordinate once
+        node_geoids: Dict[NodeId, GeoId] = {}
+        node_coords: Dict[NodeId, Tuple[float, float]] = {}
 
-        class Accumulator(NamedTuple):
-            """
-            builds data structures used to provide lookup features in the road network
-
-            :param lookup: each Link by it's LinkId
-            :param link_ids: link ids which share a common array index to the link_centroids
-            :param link_centroids: link centroids (lat,lon) which share a common array index to the link_ids
-            """
-
-            lookup: immutables.Map[LinkId, Link] = immutables.Map()
-            link_ids: Tuple[LinkId, ...] = ()
-            link_centroids: Tuple[Tuple[float, float], ...] = ()
-
-            def add_link(self, link: Link) -> Tuple[Optional[Exception], Optional[Accumulator]]:
-                """
-                adding a link to this accumulator creates an entry in the data structures used to
-                run spatial queries over the graph edge space
-                :param link: the link to add
-                :return: an error or updated accumulator
-                """
-                try:
-                    h3_line = h3.h3_line(link.start, link.end)
-
-                    # we want to look up edges by their midpoint. that said, two edges will share the same
-                    # endpoints, one for each direction. since these two edges would share the same midpoint,
-                    # we aim here to make both centroids _just barely_ different by subtracting the midpoint index by 1.
-                    midpoint_h3_line_index = round(len(h3_line) / 2)
-                    src_oriented_midpoint_index = (
-                        midpoint_h3_line_index - 1
-                        if midpoint_h3_line_index > 0
-                        else midpoint_h3_line_index
-                    )
-                    midpoint_hex = (
-                        h3_line[src_oriented_midpoint_index]
-                        if src_oriented_midpoint_index
-                        else link.start
-                    )
-                    link_centroid_lat, link_centroid_lon = h3.h3_to_geo(midpoint_hex)
-                    updated_acc = self._replace(
-                        lookup=self.lookup.set(link.link_id, link),
-                        link_ids=self.link_ids + (link.link_id,),
-                        link_centroids=self.link_centroids
-                        + ((link_centroid_lat, link_centroid_lon),),
-                    )
-                    return None, updated_acc
-                except Exception as e:
-                    return e, None
-
-        # inner loop function that attaches a LinkId -> Link pair to a Map
-        def create_link_entry(
-            acc: Tuple[Optional[Exception], Optional[Accumulator]],
-            link_tuple: Tuple[int, int, int],
-        ) -> Tuple[Optional[Exception], Optional[Accumulator]]:
-            acc_error, accumulator = acc
-            if acc_error:
-                return acc
-            elif accumulator is None:
-                return acc
+        def _node_position(
+            node_id: NodeId,
+        ) -> Tuple[Optional[Exception], Optional[Tuple[GeoId, Tuple[float, float]]]]:
+            geoid = node_geoids.get(node_id)
+            if geoid is not None:
+                return None, (geoid, node_coords[node_id])
+            coord_err, coord = safe_get_node_coordinates(graph.nodes[node_id], node_id)
+            if coord_err:
+                response = Exception(
+                    f"failure getting node coordinates while building OSMRoadNetworkLinkHelper"
+                )
+                response.__cause__ = coord_err
+                return response, None
+            elif coord is None:
+                response = Exception(
+                    f"failure getting node coordinates while building OSMRoadNetworkLinkHelper"
+                )
+                return response, None
             else:
-                try:
-                    src, dst, _ = link_tuple
-                    link_id = create_link_id(src, dst)
-                    src_node = graph.nodes[src]
-                    dst_node = graph.nodes[dst]
-                    src_coord_err, src_coord = safe_get_node_coordinates(src_node, src)
-                    dst_coord_err, dst_coord = safe_get_node_coordinates(dst_node, dst)
-                    if src_coord_err:
-                        response = Exception(
-                            f"failure getting node coordinates while building OSMRoadNetworkLinkHelper"
-                        )
-                        response.__cause__ = src_coord_err
-                        return response, None
-                    elif dst_coord_err:
-                        response = Exception(
-                            f"failure getting node coordinates while building OSMRoadNetworkLinkHelper"
-                        )
-                        response.__cause__ = dst_coord_err
-                        return response, None
-                    elif src_coord is None:
-                        response = Exception(
-                            f"failure getting node coordinates while building OSMRoadNetworkLinkHelper"
-                        )
-                        return response, None
-                    elif dst_coord is None:
-                        response = Exception(
-                            f"failure getting node coordinates while building OSMRoadNetworkLinkHelper"
-                        )
-                        return response, None
-                    else:
-                        src_lat, src_lon = src_coord
-                        dst_lat, dst_lon = dst_coord
-                        src_geoid = h3.geo_to_h3(src_lat, src_lon, resolution=sim_h3_resolution)
-                        dst_geoid = h3.geo_to_h3(dst_lat, dst_lon, resolution=sim_h3_resolution)
-                        data = graph.get_edge_data(
-                            src, dst, 0, None
-                        )  # data index "0" as this uses networkx's multigraph implementation
-                        speed = (
-                            data.get("speed_kmph", default_speed_kmph)
-                            if data
-                            else default_speed_kmph
-                        )
-                        distance_miles = data.get("length") if data else None
-                        if distance_miles is None:
-                            err = ValueError("Link must have distance")
-                            return err, None
-
-                        distance = distance_miles * M_TO_KM
-                        link = Link.build(link_id, src_geoid, dst_geoid, speed, distance)
-                        (
-                            add_link_error,
-                            updated_accumulator,
-                        ) = accumulator.add_link(link)
-                        if add_link_error:
-                            response = Exception(
-                                f"failure adding link while building OSMRoadNetworkLinkHelper"
-                            )
-                            response.__cause__ = add_link_error
-                            return response, None
-                        else:
-                            return None, updated_accumulator
-                except Exception as e:
-                    return e, None
+                lat, lon = coord
+                geoid = h3.geo_to_h3(lat, lon, resolution=sim_h3_resolution)
+                node_geoids[node_id] = geoid
+                node_coords[node_id] = h3.h3_to_geo(geoid)
+                return None, (geoid, node_coords[node_id])
 
         # process each link, building the collection of Links by LinkId, and
-        # the collections which will be used to build a spatial index over the edge centroids
-        initial: Tuple[Optional[Exception], Optional[Accumulator]] = (None, Accumulator())
-        error, accumulator = ft.reduce(create_link_entry, graph.edges, initial)
-        if error:
-            response = Exception(f"failure building OSMRoadNetworkLinkHelper")
-            response.__cause__ = error
-            return response, None
-        elif accumulator is None:
+        # the coordinate arrays which will be used to build a spatial index over the edge midpoints
+        lookup: Dict[LinkId, Link] = {}
+        link_ids: List[LinkId] = []
+        start_coords: List[Tuple[float, float]] = []
+        end_coords: List[Tuple[float, float]] = []
+        line_cells: List[np.ndarray] = []
+        shapes: Dict[LinkId, Tuple[Tuple[float, float, float], ...]] = {}
+        shape_distances: Dict[int, np.ndarray] = {}
+        try:
+            for src, dst, data in graph.edges(data=True):
+                link_id = create_link_id(src, dst)
+                if link_id in lookup:
+                    # parallel edges in the multigraph share a LinkId
+                    continue
+                src_err, src_position = _node_position(src)
+                if src_err:
+                    return src_err, None
+                dst_err, dst_position = _node_position(dst)
+                if dst_err:
+                    return dst_err, None
+                if src_position is None or dst_position is None:
+                    return (
+                        Exception(
+                            f"failure getting node coordinates while building OSMRoadNetworkLinkHelper"
+                        ),
+                        None,
+                    )
+                src_geoid, src_coord = src_position
+                dst_geoid, dst_coord = dst_position
+
+                speed = data.get("speed_kmph", default_speed_kmph)
+                distance_meters = data.get("length")
+                if distance_meters is None:
+                    response = Exception(f"failure building OSMRoadNetworkLinkHelper")
+                    response.__cause__ = ValueError("Link must have distance")
+                    return response, None
+
+                distance = distance_meters * M_TO_KM
+                lookup[link_id] = Link.build(link_id, src_geoid, dst_geoid, speed, distance)
+                link_ids.append(link_id)
+                if data.get("shape") and distance_meters > 0:
+                    shape = tuple(
+                        (point_length / distance_meters, lat, lon)
+                        for (lat, lon), point_length in zip(data["shape"], data["shape_length"])
+                    )
+                    shapes[link_id] = shape
+                    cells, distances = _shape_line(
+                        shape, src_coord, dst_coord, distance, sim_h3_resolution
+                    )
+                    line_cells.append(cells)
+                    shape_distances[len(link_ids) - 1] = distances
+                else:
+                    line = h3_int.h3_line(
+                        h3_int.string_to_h3(src_geoid), h3_int.string_to_h3(dst_geoid)
+                    )
+                    line_cells.append(np.array(line, dtype=np.uint64))
+                start_coords.append(src_coord)
+                end_coords.append(dst_coord)
+        except Exception as e:
             response = Exception(f"failure building OSMRoadNetworkLinkHelper")
+            response.__cause__ = e
             return response, None
-        else:
-            # construct the spatial index
-            tree = cKDTree(accumulator.link_centroids)
-            osm_road_network_links = OSMRoadNetworkLinkHelper(
-                accumulator.lookup,
-                tree,
-                accumulator.link_ids,
-                len(accumulator.link_ids),
+
+        if len(link_ids) == 0:
+            return Exception(f"failure building OSMRoadNetworkLinkHelper: graph has no edges"), None
+
+        # we want to look up edges by their midpoint. that said, two edges will share the same
+        # endpoints, one for each direction. since these two edges would share the same midpoint,
+        # we aim here to make both centroids _just barely_ different by nudging each midpoint
+        # towards the source of its link.
+        starts = np.array(start_coords, dtype=np.float64)
+        ends = np.array(end_coords, dtype=np.float64)
+        link_centroids = starts + (ends - starts) * (0.5 - _MIDPOINT_SRC_OFFSET)
+        # the midpoint of a merged link is taken along its shape, so that it lies on the road
+        for index in shape_distances:
+            fractions, vertices = _shape_vertices(
+                shapes[link_ids[index]], starts[index], ends[index]
             )
-            return None, osm_road_network_links
+            link_centroids[index] = [
+                np.interp(0.5 - _MIDPOINT_SRC_OFFSET, fractions, vertices[:, 0]),
+                np.interp(0.5 - _MIDPOINT_SRC_OFFSET, fractions, vertices[:, 1]),
+            ]
+
+        # precompute the geometry of each link: its bearing, the cells of its h3 line, and the
+        # distance along the link to each of those cells, which are evenly spaced along straight
+        # links, and evenly spaced along each segment of the shape of merged links
+        lon_scale = np.cos(np.radians(starts[:, 0]))
+        bearing = np.degrees(
+            np.arctan2((ends[:, 1] - starts[:, 1]) * lon_scale, ends[:, 0] - starts[:, 0])
+        )
+        line_counts = np.array([len(line) for line in line_cells], dtype=np.int64)
+        line_offsets = np.concatenate(([0], np.cumsum(line_counts)))
+        position_in_line = np.arange(line_offsets[-1]) - np.repeat(line_offsets[:-1], line_counts)
+        link_distances = np.array([lookup[link_id].distance_km for link_id in link_ids])
+        link_speeds = np.array([lookup[link_id].speed_kmph for link_id in link_ids])
+        line_distance_km = (
+            position_in_line
+            / np.repeat(np.maximum(line_counts - 1, 1), line_counts)
+            * np.repeat(link_distances, line_counts)
+        )
+        for index, distances in shape_distances.items():
+            line_distance_km[line_offsets[index] : line_offsets[index + 1]] = distances
+
+        # construct the spatial index
+        tree = cKDTree(link_centroids)
+        osm_road_network_links = OSMRoadNetworkLinkHelper(
+            immutables.Map(lookup),
+            tree,
+            tuple(link_ids),
+            len(link_ids),
+            starts,
+            ends,
+            {link_id: index for index, link_id in enumerate(link_ids)},
+            bearing,
+            line_offsets,
+            np.concatenate(line_cells),
+            line_distance_km,
+            link_distances,
+            link_speeds,
+            shapes,
+        )
+        return None, osm_road_network_links
+
+
+def _shape_vertices(
+    shape: Tuple[Tuple[float, float, float], ...],
+    start_coord: Sequence[float],
+    end_coord: Sequence[float],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    lists the vertices of a merged link, from its start, through each point of its shape, to its end
+
+    :param shape: the (fraction along the link, lat, lon) of each interior point of the link
+    :param start_coord: the (lat, lon) of the start of the link
+    :param end_coord: the (lat, lon) of the end of the link
+    :return: the fraction along the link and the (lat, lon) of each vertex
+    """
+    fractions = np.array([0.0] + [fraction for fraction, _, _ in shape] + [1.0])
+    vertices = np.array(
+        [tuple(start_coord)] + [(lat, lon) for _, lat, lon in shape] + [tuple(end_coord)],
+        dtype=np.float64,
+    )
+    return fractions, vertices
+
+
+def _shape_line(
+    shape: Tuple[Tuple[float, float, float], ...],
+    start_coord: Tuple[float, float],
+    end_coord: Tuple[float, float],
+    distance_km: Kilometers,
+    sim_h3_resolution: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    builds the h3 line of a merged link by joining the h3 lines between each of its vertices,
+    so that the line follows the road instead of the chord between the link endpoints
+
+    :param shape: the (fraction along the link, lat, lon) of each interior point of the link
+    :param start_coord: the (lat, lon) of the start of the link
+    :param end_coord: the (lat, lon) of the end of the link
+    :param distance_km: the distance of the link
+    :param sim_h3_resolution: h3 resolution for entities in sim
+    :return: the cells of the line, and the distance along the link to each cell
+    """
+    fractions, vertices = _shape_vertices(shape, start_coord, end_coord)
+    vertex_cells = [h3_int.geo_to_h3(lat, lon, sim_h3_resolution) for lat, lon in vertices]
+    cells: List[int] = [vertex_cells[0]]
+    distances: List[float] = [0.0]
+    for i in range(len(vertex_cells) - 1):
+        # each segment line starts at the cell which ended the previous segment line
+        segment = h3_int.h3_line(vertex_cells[i], vertex_cells[i + 1])[1:]
+        segment_start_km = fractions[i] * distance_km
+        segment_km = (fractions[i + 1] - fractions[i]) * distance_km
+        cells.extend(segment)
+        distances.extend(
+            segment_start_km + segment_km * (step + 1) / len(segment)
+            for step in range(len(segment))
+        )
+    return np.array(cells, dtype=np.uint64), np.array(distances, dtype=np.float64)
@@ -3,18 +3,20 @@ from __future__ import annotations
 import json
 import logging
 from pathlib import Path
-from typing import Optional, Union
+from typing import Optional, Sequence, Tuple, Union
 
 import networkx as nx
 
 from nrel.hive.model.entity_position import EntityPosition
 from nrel.hive.model.roadnetwork.link import Link
 from nrel.hive.model.roadnetwork.link_id import extract_node_ids
+from nrel.hive.model.roadnetwork.linktraversal import LinkTraversal
 from nrel.hive.model.roadnetwork.osm.osm_builders import osm_graph_from_polygon
 from nrel.hive.model.roadnetwork.osm.osm_road_network_link_helper import OSMRoadNetworkLinkHelper
 from nrel.hive.model.roadnetwork.osm.osm_roadnetwork_ops import (
-    route_from_nx_path,
-    resolve_route_src_dst_positions,
+    contract_degree_2_nodes,
+    largest_strongly_connected_component,
+    strongly_connected_components,
 )
 from nrel.hive.model.roadnetwork.roadnetwork import RoadNetwork
 from nrel.hive.model.roadnetwork.route import (
@@ -24,8 +26,9 @@ from nrel.hive.model.roadnetwork.route import (
 )
 from nrel.hive.model.sim_time import SimTime
 from nrel.hive.util import LinkId
+from nrel.hive.util.h3_ops import H3Ops
 from nrel.hive.util.typealiases import GeoId, H3Resolution
-from nrel.hive.util.units import Kmph, Kilometers
+from nrel.hive.util.units import Kmph, Kilometers, Seconds, SECONDS_TO_HOURS
 
 log = logging.getLogger(__name__)
 
@@ -41,14 +44,25 @@ class OSMRoadNetwork(RoadNetwork):
         graph: nx.MultiDiGraph,
         sim_h3_resolution: H3Resolution = 15,
         default_speed_kmph: Kmph = 40.0,
+        simplify_graph: bool = False,
+        prune_graph: bool = False,
     ):
         self.sim_h3_resolution = sim_h3_resolution
 
         # validate network
 
-        #   road network must be strongly connected
-        if not nx.is_strongly_connected(graph):
-            raise RuntimeError("Only strongly connected graphs are allowed.")
+        #   road network must be strongly connected, unless we are pruning it to its largest component
+        if prune_graph:
+            graph, removed_nodes = largest_strongly_connected_component(graph)
+            if removed_nodes > 0:
+                log.warning(
+                    f"removed {removed_nodes} nodes outside of the largest strongly connected "
+                    f"component of the road network"
+                )
+        else:
+            n_components, _, _ = strongly_connected_components(graph)
+            if n_components != 1:
+                raise RuntimeError("Only strongly connected graphs are allowed.")
 
         #   node ids must be either an integer or a tuple of integers
         def _valid_node_id(nid: Union[int, tuple]) -> bool:
@@ -80,6 +94,11 @@ class OSMRoadNetwork(RoadNetwork):
                 f"hive will automatically set these to {default_speed_kmph} kmph."
             )
 
+        #   optionally merge chains of links through degree-2 nodes into single links
+        if simplify_graph:
+            graph, removed_nodes = contract_degree_2_nodes(graph, default_speed_kmph)
+            log.info(f"simplified road network by contracting {removed_nodes} degree-2 nodes")
+
         # build tables on the network edges for spatial lookup and LinkId lookup
         link_helper_error, link_helper = OSMRoadNetworkLinkHelper.build(
             graph, sim_h3_resolution, default_speed_kmph
@@ -100,6 +119,8 @@ class OSMRoadNetwork(RoadNetwork):
         sim_h3_resolution: H3Resolution = 15,
         default_speed_kmph: Kmph = 40.0,
         cache_dir=Path.home(),
+        simplify_graph: bool = False,
+        prune_graph: bool = False,
     ) -> OSMRoadNetwork:
         """
         Build an OSMRoadNetwork from a shapely polygon
@@ -107,9 +128,13 @@ class OSMRoadNetwork(RoadNetwork):
         :param polygon: The polygon to build the road network from
         :param sim_h3_resolution: The h3 resolution of the simulation
         :param default_speed_kmph: The network will fill in missing speed values with this
+        :param simplify_graph: merge chains of links through degree-2 nodes into single links
+        :param prune_graph: remove nodes outside of the largest strongly connected component
         """
         graph = osm_graph_from_polygon(polygon, cache_dir)
-        return OSMRoadNetwork(graph, sim_h3_resolution, default_speed_kmph)
+        return OSMRoadNetwork(
+            graph, sim_h3_resolution, default_speed_kmph, simplify_graph, prune_graph
+        )
 
     @classmethod
     def from_file(
@@ -117,6 +142,8 @@ class OSMRoadNetwork(RoadNetwork):
         road_network_file: Union[Path, str],
         sim_h3_resolution: H3Resolution = 15,
         default_speed_kmph: Kmph = 40.0,
+        simplify_graph: bool = False,
+        prune_graph: bool = False,
     ) -> OSMRoadNetwork:
         """
         Build an OSMRoadNetwork from file
@@ -126,7 +153,9 @@ class OSMRoadNetwork(RoadNetwork):
         if road_network_path.suffix == ".json":
             with road_network_path.open("r") as f:
                 graph = nx.node_link_graph(json.load(f))
-            return OSMRoadNetwork(graph, sim_h3_resolution, default_speed_kmph)
+            return OSMRoadNetwork(
+                graph, sim_h3_resolution, default_speed_kmph, simplify_graph, prune_graph
+            )
         else:
             raise TypeError(
                 f"road network file of type {road_network_path.suffix} not supported by OSMRoadNetwork."
@@ -170,29 +199,19 @@ class OSMRoadNetwork(RoadNetwork):
             nx_path = nx.shortest_path(
                 self.graph, origin_node_id, destination_node_id, weight="travel_time"
             )
-            link_path_error, inner_link_path = route_from_nx_path(nx_path, self.link_helper.links)
+            route_error, route = self.link_helper.route_from_nx_path(nx_path, origin, destination)
 
-            if link_path_error:
+            if route_error:
                 log.error(f"unable to build route from {origin} to {destination}")
-                log.error(link_path_error)
+                log.error(route_error)
                 log.error(
                     f"origin node {origin_node_id}, destination node {destination_node_id}, shortest path node list result: {nx_path}"
                 )
                 return empty_route()
-            elif inner_link_path is None:
+            elif route is None:
                 return empty_route()
             else:
-                # modify the start and end GeoIds based on the positions in the src/dst links
-                resolved_route = resolve_route_src_dst_positions(
-                    inner_link_path, origin, destination, self
-                )
-                if not resolved_route:
-                    log.error(
-                        f"unable to resolve the route from/to/via:\n {origin}\n{destination}\n{inner_link_path}"
-                    )
-                    return empty_route()
-                else:
-                    return resolved_route
+                return route
 
     def distance_by_geoid_km(self, origin: GeoId, destination: GeoId) -> Kilometers:
         """
@@ -228,6 +247,64 @@ class OSMRoadNetwork(RoadNetwork):
         else:
             return link
 
+    def position_from_geoid(self, geoid: GeoId) -> Optional[EntityPosition]:
+        """
+        returns the position on the nearest link to a GeoId
+
+        :param geoid: the location for the stationary entity
+        :return: the position on the link nearest to the GeoId
+        """
+        return self.positions_from_geoids((geoid,))[0]
+
+    def positions_from_geoids(
+        self, geoids: Sequence[GeoId]
+    ) -> Tuple[Optional[EntityPosition], ...]:
+        """
+        snaps a batch of GeoIds to the road network with a single spatial query
+
+        :param geoids: the locations to position on the road network
+        :return: the position nearest to each GeoId, in the same order, or None where not found
+        """
+        error, positions = self.link_helper.positions_by_geoids(geoids)
+        if error:
+            log.warning(f"unable to find nearest links to {len(geoids)} geoids")
+            log.error(error)
+            return tuple(None for _ in geoids)
+        elif positions is None:
+            return tuple(None for _ in geoids)
+        else:
+            return positions
+
+    def point_along_link(self, link: LinkTraversal, available_time_seconds: Seconds) -> GeoId:
+        """
+        finds the GeoId an agent reaches when traversing part of a link by looking it up
+        in the precomputed h3 line of the link
+
+        :param link: the link traversal we are finding a point along
+        :param available_time_seconds: the amount of time to traverse
+        :return: a GeoId along the link
+        """
+        experienced_distance_km = (available_time_seconds * SECONDS_TO_HOURS) * link.speed_kmph
+        geoid = self.link_helper.geoid_along_link(link, experienced_distance_km)
+        if geoid is None:
+            return H3Ops.point_along_link(link, available_time_seconds)
+        else:
+            return geoid
+
+    def link_geometry(self, link: LinkTraversal) -> Tuple[Tuple[float, float], ...]:
+        """
+        the (lat, lon) points describing the shape of a link traversal, including the locations
+        of any nodes which were removed from the link when the road network was simplified
+
+        :param link: the link traversal
+        :return: the coordinates along the traversal
+        """
+        geometry = self.link_helper.geometry_along_link(link)
+        if geometry is None:
+            return super().link_geometry(link)
+        else:
+            return geometry
+
     def link_from_link_id(self, link_id: LinkId) -> Optional[Link]:
         """
         look up the provided LinkId in the LinkHelper table
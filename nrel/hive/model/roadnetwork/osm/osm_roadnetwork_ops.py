@@ -1,19 +1,15 @@
 from __future__ import annotations
 
-import functools as ft
-from typing import Union, TYPE_CHECKING
+from typing import Any, Dict, List
 
-import immutables
+import networkx as nx
+import numpy as np
 from networkx.classes.reportviews import NodeView
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
 
-from nrel.hive.model.entity_position import EntityPosition
-from nrel.hive.model.roadnetwork.link import Link
 from nrel.hive.model.roadnetwork.link_id import *
-from nrel.hive.model.roadnetwork.linktraversal import LinkTraversal
-from nrel.hive.model.roadnetwork.route import Route
-
-if TYPE_CHECKING:
-    from nrel.hive.model.roadnetwork.osm.osm_roadnetwork import OSMRoadNetwork
+from nrel.hive.util.units import M_TO_KM, Kmph
 
 
 def safe_get_node_coordinates(
@@ -37,79 +33,153 @@ def safe_get_node_coordinates(
             )
 
 
-def route_from_nx_path(
-    nx_path: Union[list, dict], link_lookup: immutables.Map[LinkId, Link]
-) -> Tuple[Optional[Exception], Optional[Route]]:
+def contract_degree_2_nodes(
+    graph: nx.MultiDiGraph, default_speed_kmph: Kmph = 40.0
+) -> Tuple[nx.MultiDiGraph, int]:
     """
-    takes a networkx shortest path result (a list of node ids) and turns it into a Route (list of Links)
-    :param nx_path: the networkx path result
-    :param link_lookup: a table of Links by LinkId in this simulation
-    :return: an error, or, the resulting Route
+    simplifies a road network graph by merging chains of links through degree-2 nodes
+    (nodes which only continue a one-way or two-way road) into single links.
+
+    each merged link gets the summed length and travel time of the chain it replaces, and a
+    speed such that its travel time is unchanged. the locations of the removed nodes are kept
+    on the merged link as its "shape", in order, along with their distance along the link
+    (in meters) as its "shape_length".
+
+    :param graph: the graph to simplify; it is not modified
+    :param default_speed_kmph: speed used for the travel time of links without speed information
+    :return: the simplified graph and the number of nodes that were removed
     """
-    if len(nx_path) == 1:
-        # when origin node == destination node in the networkx shortest path query,
-        # the result is a single node. since our graph is edge-oriented, this corresponds
-        # with an empty route.
-        return None, ()
-    else:
-
-        def _accumulate_links(
-            acc: Tuple[Optional[Exception], Optional[Tuple[LinkTraversal, ...]]],
-            node_id_pair: Tuple[int, int],
-        ) -> Tuple[Optional[Exception], Optional[Tuple[LinkTraversal, ...]]]:
-            err, prev_links = acc
-            if err:
-                return acc
-            elif prev_links is None:
-                return acc
-            else:
-                # build a LinkId from the node pair, then look up the associated Link and return it
-                src, dst = node_id_pair
-                link_id = create_link_id(src, dst)
-                link = link_lookup.get(link_id)
-                if not link:
-                    link_err = Exception(
-                        f"networkx shortest path traverses link id {link_id} which does not exist"
-                    )
-                    return link_err, None
+
+    def _is_through_node(node_id: NodeId) -> bool:
+        predecessors = set(graph.predecessors(node_id))
+        successors = set(graph.successors(node_id))
+        neighbors = predecessors | successors
+        if node_id in neighbors or len(neighbors) != 2:
+            return False
+        in_degree, out_degree = graph.in_degree(node_id), graph.out_degree(node_id)
+        if in_degree == 1 and out_degree == 1:
+            # continues a one-way road
+            return True
+        else:
+            # continues a two-way road
+            return in_degree == 2 and out_degree == 2 and predecessors == successors
+
+    through_nodes = {n for n in graph.nodes if _is_through_node(n)}
+    if len(through_nodes) == 0:
+        return graph, 0
+
+    simplified = graph.copy()
+    for src in graph.nodes:
+        if src in through_nodes:
+            continue
+        for first_node in list(graph.successors(src)):
+            if first_node not in through_nodes:
+                continue
+
+            # walk the chain of through nodes until we reach a node which is not a through node
+            path = [src, first_node]
+            while path[-1] in through_nodes:
+                next_nodes = [n for n in graph.successors(path[-1]) if n != path[-2]]
+                if len(next_nodes) != 1 or next_nodes[0] in path:
+                    break
+                path.append(next_nodes[0])
+            dst = path[-1]
+            if dst in through_nodes or dst == src or simplified.has_edge(src, dst):
+                # chain does not end at a junction or would duplicate an existing link
+                continue
+
+            length = 0.0
+            travel_time: Optional[float] = 0.0
+            travel_time_at_default_speed = 0.0
+            shape: List[Tuple[float, float]] = []
+            shape_length: List[float] = []
+            for i, (u, v) in enumerate(zip(path[:-1], path[1:])):
+                data = next(iter(graph[u][v].values()))
+                link_length = data["length"]
+                link_speed = data.get("speed_kmph", default_speed_kmph)
+                if travel_time is not None and "travel_time" in data:
+                    travel_time += data["travel_time"]
                 else:
-                    updated_links = prev_links + (link.to_link_traversal(),)
-                    return None, updated_links
+                    travel_time = None
+                travel_time_at_default_speed += (link_length * M_TO_KM) / link_speed
+                # shape points of previously merged links come before the link's end node
+                for point, point_length in zip(data.get("shape", ()), data.get("shape_length", ())):
+                    shape.append(tuple(point))
+                    shape_length.append(length + point_length)
+                length += link_length
+                if i < len(path) - 2:
+                    coord_err, coord = safe_get_node_coordinates(graph.nodes[v], v)
+                    if coord_err:
+                        raise coord_err
+                    elif coord is None:
+                        raise KeyError(f"node {v} does not have coordinate information")
+                    shape.append(coord)
+                    shape_length.append(length)
 
-        nx_path_adj_pairs = [(nx_path[i], nx_path[i + 1]) for i in range(0, len(nx_path) - 1)]
-        initial: Tuple[Optional[Exception], Optional[Tuple[LinkTraversal, ...]]] = (None, ())
-        result = ft.reduce(_accumulate_links, nx_path_adj_pairs, initial)
-        return result
+            merged: Dict[str, Any] = {
+                "length": length,
+                "speed_kmph": (length * M_TO_KM) / travel_time_at_default_speed
+                if travel_time_at_default_speed > 0
+                else default_speed_kmph,
+                "shape": shape,
+                "shape_length": shape_length,
+            }
+            if travel_time is not None:
+                merged["travel_time"] = travel_time
 
+            simplified.remove_edges_from(zip(path[:-1], path[1:]))
+            simplified.add_edge(src, dst, **merged)
 
-def resolve_route_src_dst_positions(
-    inner_route: Route,
-    src_link_pos: EntityPosition,
-    dst_link_pos: EntityPosition,
-    road_network: OSMRoadNetwork,
-) -> Optional[Route]:
+    removed = [n for n in through_nodes if simplified.degree(n) == 0]
+    simplified.remove_nodes_from(removed)
+    return simplified, len(removed)
+
+
+def strongly_connected_components(
+    graph: nx.MultiDiGraph,
+) -> Tuple[int, np.ndarray, Tuple[NodeId, ...]]:
+    """
+    labels the strongly connected components of a graph using a sparse (CSR) adjacency matrix,
+    which is much faster than the networkx graph algorithms on large road networks
+
+    :param graph: the graph
+    :return: the number of components, the component label of each node, and the node ids
+             in the same order as the labels
     """
-    our inner_route is a shortest path from the destination of the source link to the start
-    of the destination link. a 'positional' Link has been provided in the search query, assumed
-    to represent the static road network location of some entities. to complete the route,
-    the origin and destination links must be attached in a way that their start/end locations
-    correspond with the query entities.
-
-    :param inner_route: the result of a shortest path search
-    :param src_link_pos: the positional Link representation of an Entity
-    :param dst_link_pos: the positional Link representation of another Entity
-    :param road_network: the underlying OSM road network state
-    :return: a route if it is valid, otherwise None
+    nodes = tuple(graph.nodes)
+    node_index = {node_id: i for i, node_id in enumerate(nodes)}
+    # build the CSR arrays directly from the adjacency dict. parallel edges share a neighbor entry.
+    neighbor_counts = np.fromiter(
+        (len(neighbors) for _, neighbors in graph.adjacency()), dtype=np.int64, count=len(nodes)
+    )
+    neighbor_indices = np.fromiter(
+        (node_index[v] for _, neighbors in graph.adjacency() for v in neighbors),
+        dtype=np.int64,
+        count=int(neighbor_counts.sum()),
+    )
+    index_pointers = np.concatenate(([0], np.cumsum(neighbor_counts)))
+    adjacency = csr_matrix(
+        (np.ones(len(neighbor_indices), dtype=np.int8), neighbor_indices, index_pointers),
+        shape=(len(nodes), len(nodes)),
+    )
+    n_components, labels = connected_components(adjacency, directed=True, connection="strong")
+    return n_components, labels, nodes
+
+
+def largest_strongly_connected_component(
+    graph: nx.MultiDiGraph,
+) -> Tuple[nx.MultiDiGraph, int]:
+    """
+    removes all nodes from a graph which are not in its largest strongly connected component
+
+    :param graph: the graph; it is not modified
+    :return: the largest strongly connected component of the graph, and the number of removed nodes
     """
-    src_link = road_network.link_from_link_id(src_link_pos.link_id)
-    dst_link = road_network.link_from_link_id(dst_link_pos.link_id)
-    if not src_link or not dst_link:
-        return None
-    else:
-        # for any length inner route, form the total route by attaching these
-        # start and end links whose start or end values have been modified to
-        # align with the search start/end locations
-        src_link_traversal = src_link.to_link_traversal().update_start(src_link_pos.geoid)
-        dst_link_traversal = dst_link.to_link_traversal().update_end(dst_link_pos.geoid)
-        updated_route = (src_link_traversal,) + inner_route + (dst_link_traversal,)
-        return updated_route
+    n_components, labels, nodes = strongly_connected_components(graph)
+    if n_components <= 1:
+        return graph, 0
+    largest = np.argmax(np.bincount(labels))
+    removed = [node_id for node_id, label in zip(nodes, labels) if label != largest]
+    pruned = graph.copy()
+    pruned.remove_nodes_from(removed)
+    return pruned, len(removed)
@@ -1,16 +1,18 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import h3
 
 from nrel.hive.model.entity_position import EntityPosition
 from nrel.hive.model.roadnetwork.link import Link
+from nrel.hive.model.roadnetwork.linktraversal import LinkTraversal
 from nrel.hive.model.roadnetwork.route import Route
 from nrel.hive.model.sim_time import SimTime
+from nrel.hive.util.h3_ops import H3Ops
 from nrel.hive.util.typealiases import GeoId, H3Resolution, LinkId
-from nrel.hive.util.units import Kilometers
+from nrel.hive.util.units import Kilometers, Seconds
 
 
 class RoadNetwork(ABC):
@@ -84,6 +86,39 @@ class RoadNetwork(ABC):
                 position = EntityPosition(link.link_id, closest_hex_to_query)
                 return position
 
+    def positions_from_geoids(
+        self, geoids: Sequence[GeoId]
+    ) -> Tuple[Optional[EntityPosition], ...]:
+        """
+        returns the position on the road network for each of a batch of GeoIds. road networks
+        which can snap many locations at once should override this method.
+
+        :param geoids: the locations to position on the road network
+        :return: the position nearest to each GeoId, in the same order, or None where not found
+        """
+        return tuple(self.position_from_geoid(geoid) for geoid in geoids)
+
+    def point_along_link(self, link: LinkTraversal, available_time_seconds: Seconds) -> GeoId:
+        """
+        finds the GeoId an agent reaches when traversing part of a link. road networks which
+        store the geometry of their links should override this method.
+
+        :param link: the link traversal we are finding a point along
+        :param available_time_seconds: the amount of time to traverse
+        :return: a GeoId along the link
+        """
+        return H3Ops.point_along_link(link, available_time_seconds)
+
+    def link_geometry(self, link: LinkTraversal) -> Tuple[Tuple[float, float], ...]:
+        """
+        the (lat, lon) points describing the shape of a link traversal, from its start to its end.
+        road networks which simplify the geometry of their links should override this method.
+
+        :param link: the link traversal
+        :return: the coordinates along the traversal
+        """
+        return h3.h3_to_geo(link.start), h3.h3_to_geo(link.end)
+
     @abstractmethod
     def geoid_within_geofence(self, geoid: GeoId) -> bool:
         """
@@ -102,3 +137,34 @@ class RoadNetwork(ABC):
         :param sim_time:
         :return:
         """
+
+
+def positions_from_rows(
+    rows: Sequence[Dict[str, str]],
+    road_network: RoadNetwork,
+    lat_field: str = "lat",
+    lon_field: str = "lon",
+) -> Tuple[Optional[EntityPosition], ...]:
+    """
+    snaps the lat/lon location of each csv row to the road network in a single batch.
+    rows with a missing or invalid location get no position, so that the row parser
+    can report the problem.
+
+    :param rows: rows as interpreted by csv.DictReader
+    :param road_network: the road network
+    :param lat_field: the row field with the latitude
+    :param lon_field: the row field with the longitude
+    :return: the position for each row, in the same order, or None where not found
+    """
+    geoids: List[Optional[GeoId]] = []
+    for row in rows:
+        try:
+            lat, lon = float(row[lat_field]), float(row[lon_field])
+            geoids.append(h3.geo_to_h3(lat, lon, road_network.sim_h3_resolution))
+        except (KeyError, TypeError, ValueError):
+            geoids.append(None)
+
+    valid_geoids = [geoid for geoid in geoids if geoid is not None]
+    valid_positions = iter(road_network.positions_from_geoids(valid_geoids))
+    positions = tuple(next(valid_positions) if geoid is not None else None for geoid in geoids)
+    return positions
@@ -1,15 +1,20 @@
 import functools as ft
-from typing import Any, Tuple, Optional
+from typing import Any, Tuple, Optional, Union, TYPE_CHECKING
 
 import h3
+import numpy as np
 
 from nrel.hive.model.entity_position import EntityPosition
+from nrel.hive.model.roadnetwork.array_route import ArrayRoute
 from nrel.hive.model.roadnetwork.linktraversal import LinkTraversal
 from nrel.hive.runner import Environment
 from nrel.hive.util import TupleOps, wkt
 from nrel.hive.util.units import Kilometers, Seconds
 
-Route = Tuple[LinkTraversal, ...]
+if TYPE_CHECKING:
+    from nrel.hive.model.roadnetwork.roadnetwork import RoadNetwork
+
+Route = Union[Tuple[LinkTraversal, ...], ArrayRoute]
 
 
 def empty_route() -> Route:
@@ -25,6 +30,8 @@ def route_distance_km(route: Route) -> Kilometers:
     :rtype: :py:obj:`kilometers`
     :return: the distance in kilometers
     """
+    if isinstance(route, ArrayRoute):
+        return route.total_distance_km()
     distance_km = 0.0
     for l in route:
         distance_km += l.distance_km
@@ -39,10 +46,26 @@ def route_travel_time_seconds(route: Route) -> Seconds:
     :param route: route to calculate time from
     :return: the travel time, in seconds
     """
+    if isinstance(route, ArrayRoute):
+        return route.total_travel_time_seconds()
     tt = ft.reduce(lambda acc, l: acc + l.travel_time_seconds, route, 0.0)
     return int(tt)
 
 
+def route_link_arrays(route: Route) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    the distance and speed of each link on a route, as arrays
+
+    :param route: the route
+    :return: the distance (kilometers) and speed (kmph) of each link traversal on the route
+    """
+    if isinstance(route, ArrayRoute):
+        return route.distance_km, route.speed_kmph
+    distance_km = np.fromiter((l.distance_km for l in route), dtype=np.float64, count=len(route))
+    speed_kmph = np.fromiter((l.speed_kmph for l in route), dtype=np.float64, count=len(route))
+    return distance_km, speed_kmph
+
+
 def route_cooresponds_with_entities(
     route: Route, src: EntityPosition, dst: Optional[EntityPosition] = None
 ) -> bool:
@@ -71,26 +94,37 @@ def route_cooresponds_with_entities(
             return is_valid
 
 
-def to_linestring(route: Route, env: Environment) -> str:
+def to_linestring(
+    route: Route, env: Environment, road_network: Optional["RoadNetwork"] = None
+) -> str:
     """
     converts the traversal to a WKT linestring or an empty polygon if the traversal was empty
     see https://en.wikipedia.org/wiki/Well-known_text_representation_of_geometry
 
     :param route: a route
+    :param env: the simulation environment
+    :param road_network: optional road network, used to recover the original geometry of links
+                         which were simplified when the road network was loaded
     :return: a linestring or an empty WKT
     """
+
+    def _link_points(link: LinkTraversal) -> Tuple[Tuple[float, float], ...]:
+        if road_network is None:
+            return h3.h3_to_geo(link.start), h3.h3_to_geo(link.end)
+        else:
+            return road_network.link_geometry(link)
+
     if len(route) == 0:
         return wkt.polygon_empty()
     elif len(route) == 1:
-        link = route[0]
-        src = h3.h3_to_geo(link.start)
-        dst = h3.h3_to_geo(link.end)
-        linestring = wkt.linestring_2d((src, dst), env.config.global_config.wkt_x_y_ordering)
+        linestring = wkt.linestring_2d(
+            _link_points(route[0]), env.config.global_config.wkt_x_y_ordering
+        )
         return linestring
     else:
         inital: Tuple[Any, ...] = ()
         points = ft.reduce(
-            lambda acc, l: acc + (h3.h3_to_geo(l.start), h3.h3_to_geo(l.end)),
+            lambda acc, l: acc + _link_points(l),
             route,
             inital,
         )
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
-import functools as ft
-from typing import Optional, NamedTuple
+from typing import List, Optional, NamedTuple
 
+import numpy as np
+
+from nrel.hive.model.roadnetwork.array_route import ArrayRoute
 from nrel.hive.model.roadnetwork.linktraversal import (
     LinkTraversalResult,
     LinkTraversal,
 )
 from nrel.hive.model.roadnetwork.linktraversal import traverse_up_to
 from nrel.hive.model.roadnetwork.route import Route
+from nrel.hive.model.roadnetwork.roadnetwork import RoadNetwork
 from nrel.hive.util import TupleOps
 from nrel.hive.util.typealiases import *
 from nrel.hive.util.units import Kilometers, Seconds
@@ -84,7 +87,9 @@ class RouteTraversal(NamedTuple):
 
 
 def traverse(
-    route_estimate: Route, duration_seconds: Seconds
+    route_estimate: Route,
+    duration_seconds: Seconds,
+    road_network: Optional[RoadNetwork] = None,
 ) -> Tuple[Optional[Exception], Optional[RouteTraversal]]:
     """
     step through the route from the current agent position (assumed to be start.link_id) toward the destination
@@ -93,6 +98,7 @@ def traverse(
     :param route_estimate: the current route estimate
 
     :param duration_seconds: size of the time step for this traversal, in seconds
+    :param road_network: the road network, used to locate agents which stop part-way along a link
     :return: a route experience and updated route estimate;
              or, nothing (None, Empty RouteTraversal) if the route is consumed.
              an exception is possible if the current step is not found on the link or
@@ -102,22 +108,34 @@ def traverse(
         return None, RouteTraversal()
     elif TupleOps.head(route_estimate).start == TupleOps.last(route_estimate).end:
         return None, RouteTraversal()
-    else:
-        # function that steps through the route
-        def _traverse(
-            acc: Tuple[Optional[Exception], Optional[RouteTraversal]],
-            link: LinkTraversal,
-        ) -> Tuple[Optional[Exception], Optional[RouteTraversal]]:
-            acc_failures, acc_traversal = acc
-            if acc_failures:
-                return acc
-            elif acc_traversal is None:
-                return acc
-
-            if acc_traversal.no_time_left():
-                return acc_failures, acc_traversal.add_link_not_traversed(link)
-            # traverse this link as far as we can go
-            error, traverse_result = traverse_up_to(link, acc_traversal.remaining_time_seconds)
+    elif isinstance(route_estimate, ArrayRoute):
+        return _traverse_array_route(route_estimate, duration_seconds, road_network)
+
+    # walk forward only as far as the time step allows. links which are fully traversed are
+    # collected as-is, the remaining route is a slice of the route estimate, and only the link
+    # where we stop is split via traverse_up_to.
+    remaining_time_seconds = duration_seconds
+    traversal_distance_km = 0.0
+    experienced_route: List[LinkTraversal] = []
+    for index, link in enumerate(route_estimate):
+        if remaining_time_seconds == 0.0:
+            return None, RouteTraversal(
+                remaining_time_seconds=remaining_time_seconds,
+                traversal_distance_km=traversal_distance_km,
+                experienced_route=tuple(experienced_route),
+                remaining_route=route_estimate[index:],
+            )
+        elif link.start == link.end:
+            # nothing to traverse on this link
+            continue
+
+        link_travel_time_seconds = link.travel_time_seconds
+        if link_travel_time_seconds <= remaining_time_seconds:
+            experienced_route.append(link)
+            traversal_distance_km += link.distance_km
+            remaining_time_seconds -= link_travel_time_seconds
+        else:
+            error, traverse_result = traverse_up_to(link, remaining_time_seconds, road_network)
             if error:
                 response = Exception(f"failure during traverse")
                 response.__cause__ = error
@@ -126,15 +144,92 @@ def traverse(
                 response = Exception(f"failure during traverse")
                 return response, None
             else:
-                updated_experienced_route = acc_traversal.add_traversal(traverse_result)
-                return acc_failures, updated_experienced_route
+                if traverse_result.traversed is not None:
+                    experienced_route.append(traverse_result.traversed)
+                    traversal_distance_km += traverse_result.traversed.distance_km
+                remaining_link: Route = (
+                    () if traverse_result.remaining is None else (traverse_result.remaining,)
+                )
+                return None, RouteTraversal(
+                    remaining_time_seconds=traverse_result.remaining_time_seconds,
+                    traversal_distance_km=traversal_distance_km,
+                    experienced_route=tuple(experienced_route),
+                    remaining_route=remaining_link + route_estimate[index + 1 :],
+                )
+
+    return None, RouteTraversal(
+        remaining_time_seconds=remaining_time_seconds,
+        traversal_distance_km=traversal_distance_km,
+        experienced_route=tuple(experienced_route),
+    )
+
+
+def _traverse_array_route(
+    route_estimate: ArrayRoute,
+    duration_seconds: Seconds,
+    road_network: Optional[RoadNetwork] = None,
+) -> Tuple[Optional[Exception], Optional[RouteTraversal]]:
+    """
+    traverse for array-backed routes. the link where we stop is found by a binary search over
+    the cumulative travel time of the links we can reach, and the route is split by slicing
+    its arrays.
 
-        # initial search state has a route traversal and an Optional[Exception]
-        initial: Tuple[Optional[Exception], Optional[RouteTraversal]] = (
-            None,
-            RouteTraversal(remaining_time_seconds=duration_seconds),
+    :param route_estimate: the current route estimate
+    :param duration_seconds: size of the time step for this traversal, in seconds
+    :param road_network: the road network, used to locate agents which stop part-way along a link
+    :return: a route experience and updated route estimate, or an error
+    """
+    # links which start and end at the same location take no time and are not experienced
+    elapsed = route_estimate.elapsed_seconds(duration_seconds)
+    # we stop at the first link we can't finish, or, once time runs out, at the link after it
+    if duration_seconds <= 0:
+        stop = 0
+    else:
+        stop = min(
+            int(np.searchsorted(elapsed, duration_seconds, side="right")),
+            int(np.searchsorted(elapsed, duration_seconds, side="left")) + 1,
+        )
+    experienced_route = route_estimate[:stop].without_stationary_links()
+    traversal_distance_km = experienced_route.total_distance_km()
+    remaining_time_seconds = duration_seconds - (int(elapsed[stop - 1]) if stop > 0 else 0)
+
+    if stop == len(route_estimate):
+        return None, RouteTraversal(
+            remaining_time_seconds=remaining_time_seconds,
+            traversal_distance_km=traversal_distance_km,
+            experienced_route=experienced_route,
+        )
+    elif remaining_time_seconds == 0:
+        return None, RouteTraversal(
+            remaining_time_seconds=remaining_time_seconds,
+            traversal_distance_km=traversal_distance_km,
+            experienced_route=experienced_route,
+            remaining_route=route_estimate[stop:],
         )
 
-        result = ft.reduce(_traverse, route_estimate, initial)
-
-        return result
+    # only the link where we stop is materialized and split
+    error, traverse_result = traverse_up_to(
+        route_estimate[stop], remaining_time_seconds, road_network
+    )
+    if error:
+        response = Exception(f"failure during traverse")
+        response.__cause__ = error
+        return response, None
+    elif traverse_result is None:
+        response = Exception(f"failure during traverse")
+        return response, None
+    else:
+        traversed_link: Route = (
+            () if traverse_result.traversed is None else (traverse_result.traversed,)
+        )
+        remaining_link: Route = (
+            () if traverse_result.remaining is None else (traverse_result.remaining,)
+        )
+        if traverse_result.traversed is not None:
+            traversal_distance_km += traverse_result.traversed.distance_km
+        return None, RouteTraversal(
+            remaining_time_seconds=traverse_result.remaining_time_seconds,
+            traversal_distance_km=traversal_distance_km,
+            experienced_route=experienced_route + traversed_link,
+            remaining_route=remaining_link + route_estimate[stop + 1 :],
+        )
@@ -76,6 +76,7 @@ class Station(Entity):
         on_shift_access: FrozenSet[ChargerId],
         membership: Membership,
         env: Environment,
+        position: Optional[EntityPosition] = None,
     ):
         # TODO
         # problems with this
@@ -117,7 +118,8 @@ class Station(Entity):
             raise Exception(msg)
 
         energy_dispensed = immutables.Map({energy_type: 0.0 for energy_type in EnergyType})
-        position = road_network.position_from_geoid(geoid)
+        if position is None:
+            position = road_network.position_from_geoid(geoid)
         if position is None:
             msg = (
                 "could not find a road network position matching the position "
@@ -178,6 +180,7 @@ class Station(Entity):
         builder: Union[immutables.Map[StationId, Station], Dict[StationId, Station]],
         road_network: RoadNetwork,
         env: Environment,
+        position: Optional[EntityPosition] = None,
     ) -> Station:
         """
         takes a csv row and turns it into a Station
@@ -188,6 +191,7 @@ class Station(Entity):
         that there already was a row parsed for this station
 
         :param road_network: the road network
+        :param position: the station position, if it was already snapped to the road network
         :return: a Station, or an error
         """
         _EXPECTED_FIELDS = [
@@ -228,6 +232,7 @@ class Station(Entity):
                 on_shift_access=frozenset([charger_id]) if on_shift_access else frozenset(),
                 membership=Membership(),
                 env=env,
+                position=position,
             )
         else:
             # add this charger to the existing station
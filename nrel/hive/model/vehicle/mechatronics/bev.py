@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
-from typing import Any, Callable, TYPE_CHECKING, Optional, Tuple
+from typing import Any, Callable, TYPE_CHECKING, Optional, Sequence, Tuple
 
 import immutables
+import numpy as np
 
 from nrel.hive.model.energy.energytype import EnergyType
 from nrel.hive.model.vehicle.mechatronics.mechatronics_interface import MechatronicsInterface
@@ -165,6 +166,31 @@ class BEV(MechatronicsInterface):
         :return:
         """
         energy_used = self.powertrain.energy_cost(route)
+        return self._use_energy(vehicle, energy_used)
+
+    def consume_energy_batch(
+        self, vehicles: Sequence[Vehicle], routes: Sequence[Route]
+    ) -> Tuple[Vehicle, ...]:
+        """
+        consume energy over a route for each vehicle, computing the energy of all routes at once
+
+
+        :param vehicles: the vehicles
+        :param routes: the route traversed by each vehicle
+        :return: the vehicles after moving, in the same order
+        """
+        energy_used = self.powertrain.energy_costs(routes)
+        return tuple(self._use_energy(v, e) for v, e in zip(vehicles, energy_used))
+
+    def _use_energy(self, vehicle: Vehicle, energy_used: float) -> Vehicle:
+        """
+        removes energy (in the units of the powertrain) from the battery
+
+
+        :param vehicle: the vehicle
+        :param energy_used: the energy used
+        :return: the updated vehicle
+        """
         energy_used_kwh = energy_used * get_unit_conversion(
             self.powertrain.energy_units, Unit.KILOWATT_HOUR
         )
@@ -200,6 +226,26 @@ class BEV(MechatronicsInterface):
 
         return updated_vehicle
 
+    def idle_batch(self, vehicles: Sequence[Vehicle], time_seconds: Seconds) -> Tuple[Vehicle, ...]:
+        """
+        idle each vehicle for a set amount of time, drawing idle energy from all batteries at once
+
+        :param vehicles: the vehicles
+        :param time_seconds: the time spent idling
+        :return: the updated vehicles, in the same order
+        """
+        idle_energy_kwh = self.idle_kwh_per_hour * time_seconds * SECONDS_TO_HOURS
+        vehicle_energy_kwh = np.array([v.energy[EnergyType.ELECTRIC] for v in vehicles])
+        new_energy_kwh = np.maximum(0.0, vehicle_energy_kwh - idle_energy_kwh)
+        expended_kwh = vehicle_energy_kwh - new_energy_kwh
+
+        return tuple(
+            v.modify_energy(immutables.Map({EnergyType.ELECTRIC: new})).tick_energy_expended(
+                immutables.Map({EnergyType.ELECTRIC: expended})
+            )
+            for v, new, expended in zip(vehicles, new_energy_kwh.tolist(), expended_kwh.tolist())
+        )
+
     def add_energy(
         self, vehicle: Vehicle, charger: Charger, time_seconds: Seconds
     ) -> Tuple[Vehicle, Seconds]:
@@ -237,11 +283,79 @@ class BEV(MechatronicsInterface):
             )
             new_energy_kwh = min(self.battery_capacity_kwh, charger_energy_kwh)
 
+        updated_vehicle = self._gain_energy(vehicle, start_energy_kwh, new_energy_kwh)
+        return updated_vehicle, time_charging_seconds
+
+    def add_energy_batch(
+        self, vehicles: Sequence[Vehicle], charger: Charger, time_seconds: Seconds
+    ) -> Tuple[Vehicle, ...]:
+        """
+        add energy into each vehicle, charging all of the batteries at once
+
+
+        :param vehicles: the vehicles
+        :param charger: the charger used by every vehicle
+        :param time_seconds: the time spent charging
+        :return: the updated vehicles, in the same order
+        """
+        if not self.valid_charger(charger):
+            return super().add_energy_batch(vehicles, charger, time_seconds)
+
+        start_energy_kwh = np.array([v.energy[EnergyType.ELECTRIC] for v in vehicles])
+
+        if charger.rate < self.charge_taper_cutoff_kw:
+            charger_energy_kwh = start_energy_kwh + charger.rate * time_seconds * SECONDS_TO_HOURS
+        else:
+            # if we're above the charge taper cutoff, we'll use the powercurve
+            energy_limit_kwh = self.battery_capacity_kwh - self.battery_full_threshold_kwh
+            charger_energy_kwh, _ = self.powercurve.charge_batch(
+                start_soc=start_energy_kwh,
+                full_soc=energy_limit_kwh,
+                power_kw=charger.rate,
+                duration_seconds=time_seconds,
+            )
+        new_energy_kwh = np.minimum(self.battery_capacity_kwh, charger_energy_kwh)
+
+        return tuple(
+            self._gain_energy(v, start, new)
+            for v, start, new in zip(vehicles, start_energy_kwh.tolist(), new_energy_kwh.tolist())
+        )
+
+    def _gain_energy(self, vehicle: Vehicle, start_energy_kwh: KwH, new_energy_kwh: KwH) -> Vehicle:
+        """
+        sets the battery energy after charging
+
+
+        :param vehicle: the vehicle
+        :param start_energy_kwh: the battery energy before charging
+        :param new_energy_kwh: the battery energy after charging
+        :return: the updated vehicle
+        """
         updated_vehicle = vehicle.modify_energy(
             immutables.Map({EnergyType.ELECTRIC: new_energy_kwh})
         )
         updated_vehicle = updated_vehicle.tick_energy_gained(
             immutables.Map({EnergyType.ELECTRIC: new_energy_kwh - start_energy_kwh})
         )
+        return updated_vehicle
 
-        return updated_vehicle, time_charging_seconds
+    def charge_time_curve(self, charger: Charger, soc: np.ndarray) -> Optional[np.ndarray]:
+        """
+        the time to charge an empty vehicle up to each state of charge. below the charge taper
+        cutoff the charger rate is constant, otherwise the time is integrated over the powercurve,
+        which stops charging at the battery full threshold.
+
+        :param charger: the charger used
+        :param soc: the states of charge, sorted ascending
+        :return: the seconds to reach each state of charge, or None if not supported
+        """
+        if not self.valid_charger(charger):
+            return None
+        energy_kwh = soc * self.battery_capacity_kwh
+        if charger.rate < self.charge_taper_cutoff_kw:
+            return energy_kwh / charger.rate * HOURS_TO_SECONDS
+        else:
+            energy_limit_kwh = self.battery_capacity_kwh - self.battery_full_threshold_kwh
+            return self.powercurve.charge_time_curve(
+                energy_kwh.clip(max=energy_limit_kwh), charger.rate
+            )
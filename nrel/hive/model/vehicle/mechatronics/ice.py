@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
-from typing import Any, Callable, TYPE_CHECKING, Optional, Tuple
+from typing import Any, Callable, TYPE_CHECKING, Optional, Sequence, Tuple
 
 import immutables
 
@@ -13,6 +13,8 @@ from nrel.hive.util.typealiases import MechatronicsId
 from nrel.hive.util.units import *
 
 if TYPE_CHECKING:
+    import numpy as np
+
     from nrel.hive.model.energy.charger.charger import Charger
     from nrel.hive.model.vehicle.vehicle import Vehicle
     from nrel.hive.model.roadnetwork.route import Route
@@ -141,6 +143,29 @@ class ICE(MechatronicsInterface):
         :return:
         """
         energy_used = self.powertrain.energy_cost(route)
+        return self._use_energy(vehicle, energy_used)
+
+    def consume_energy_batch(
+        self, vehicles: Sequence[Vehicle], routes: Sequence[Route]
+    ) -> Tuple[Vehicle, ...]:
+        """
+        consume energy over a route for each vehicle, computing the energy of all routes at once
+
+        :param vehicles: the vehicles
+        :param routes: the route traversed by each vehicle
+        :return: the vehicles after moving, in the same order
+        """
+        energy_used = self.powertrain.energy_costs(routes)
+        return tuple(self._use_energy(v, e) for v, e in zip(vehicles, energy_used))
+
+    def _use_energy(self, vehicle: Vehicle, energy_used: float) -> Vehicle:
+        """
+        removes energy (in the units of the powertrain) from the tank
+
+        :param vehicle: the vehicle
+        :param energy_used: the energy used
+        :return: the updated vehicle
+        """
         energy_used_gal_gas = energy_used * get_unit_conversion(
             self.powertrain.energy_units, Unit.GALLON_GASOLINE
         )
@@ -207,3 +232,15 @@ class ICE(MechatronicsInterface):
         )
 
         return updated_vehicle, time_seconds
+
+    def charge_time_curve(self, charger: Charger, soc: np.ndarray) -> Optional[np.ndarray]:
+        """
+        the time to fill an empty tank up to each state of charge, at the pump rate
+
+        :param charger: the charger used
+        :param soc: the states of charge, sorted ascending
+        :return: the seconds to reach each state of charge, or None if not supported
+        """
+        if not self.valid_charger(charger):
+            return None
+        return soc * self.tank_capacity_gallons / charger.rate
@@ -1,16 +1,19 @@
 from __future__ import annotations
 
 from abc import abstractmethod, ABC
-from dataclasses import dataclass
-from typing import Dict, TYPE_CHECKING, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence, TYPE_CHECKING, Tuple
 
 import immutables
 
 from nrel.hive.model.energy import EnergyType
 
 if TYPE_CHECKING:
-    from nrel.hive.util.units import Seconds, Ratio, Kilometers
-    from nrel.hive.util.typealiases import MechatronicsId
+    import numpy as np
+
+    from nrel.hive.util.units import Seconds, Ratio, Kilometers, Kw
+    from nrel.hive.util.typealiases import ChargerId, MechatronicsId
+    from nrel.hive.model.vehicle.mechatronics.powercurve.powercurve_ops import ChargeTimeTable
     from nrel.hive.model.energy.charger import Charger
     from nrel.hive.model.vehicle.vehicle import Vehicle
     from nrel.hive.model.roadnetwork.route import Route
@@ -20,6 +23,12 @@ if TYPE_CHECKING:
 class MechatronicsMixin:
     mechatronics_id: MechatronicsId
 
+    # charge time tables built for this mechatronics, by charger id, charger rate, time step
+    # and minimum energy change; see powercurve_ops.get_charge_time_table
+    charge_time_tables: Dict[Tuple[ChargerId, Kw, Seconds, Ratio], ChargeTimeTable] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
 
 class MechatronicsInterfaceABC(ABC):
     """
@@ -98,6 +107,20 @@ class MechatronicsInterfaceABC(ABC):
         :return: the vehicle after moving;
         """
 
+    def consume_energy_batch(
+        self, vehicles: Sequence[Vehicle], routes: Sequence[Route]
+    ) -> Tuple[Vehicle, ...]:
+        """
+        consume energy over a route for each of a collection of vehicles which share this
+        mechatronics. implementations which can compute the energy of many routes at once should
+        override this method.
+
+        :param vehicles: the vehicles
+        :param routes: the route traversed by each vehicle
+        :return: the vehicles after moving, in the same order
+        """
+        return tuple(self.consume_energy(v, r) for v, r in zip(vehicles, routes))
+
     @abstractmethod
     def idle(self, vehicle: Vehicle, time_seconds: Seconds) -> Vehicle:
         """
@@ -109,6 +132,17 @@ class MechatronicsInterfaceABC(ABC):
         :return:
         """
 
+    def idle_batch(self, vehicles: Sequence[Vehicle], time_seconds: Seconds) -> Tuple[Vehicle, ...]:
+        """
+        idle each of a collection of vehicles which share this mechatronics for a set amount of
+        time. implementations which can idle many vehicles at once should override this method.
+
+        :param vehicles: the vehicles
+        :param time_seconds: the time spent idling
+        :return: the updated vehicles, in the same order
+        """
+        return tuple(self.idle(v, time_seconds) for v in vehicles)
+
     @abstractmethod
     def add_energy(
         self, vehicle: Vehicle, charger: Charger, time_seconds: Seconds
@@ -123,6 +157,32 @@ class MechatronicsInterfaceABC(ABC):
         :return: the updated vehicle, along with the time spent charging
         """
 
+    def add_energy_batch(
+        self, vehicles: Sequence[Vehicle], charger: Charger, time_seconds: Seconds
+    ) -> Tuple[Vehicle, ...]:
+        """
+        add energy into each of a collection of vehicles which share this mechatronics and a
+        charger. implementations which can charge many vehicles at once should override this
+        method.
+
+        :param vehicles: the vehicles
+        :param charger: the charger used by every vehicle
+        :param time_seconds: the time spent charging
+        :return: the updated vehicles, in the same order
+        """
+        return tuple(self.add_energy(v, charger, time_seconds)[0] for v in vehicles)
+
+    def charge_time_curve(self, charger: Charger, soc: np.ndarray) -> Optional[np.ndarray]:
+        """
+        the time to charge an empty vehicle up to each of a sorted array of states of charge,
+        for mechatronics which can compute it in closed form.
+
+        :param charger: the charger used
+        :param soc: the states of charge, sorted ascending
+        :return: the seconds to reach each state of charge, or None if not supported
+        """
+        return None
+
 
 class MechatronicsInterface(MechatronicsMixin, MechatronicsInterfaceABC):
     """"""
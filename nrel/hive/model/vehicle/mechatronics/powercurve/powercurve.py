@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Tuple
+from typing import TYPE_CHECKING, Optional, Tuple
+
+import numpy as np
 
 if TYPE_CHECKING:
     from nrel.hive.util.units import Ratio, Kw, Seconds, KwH
@@ -29,3 +31,34 @@ class Powercurve(ABC):
         :param duration_seconds:
         :return: the charge amount along with the time spent charging
         """
+
+    def charge_batch(
+        self,
+        start_soc: np.ndarray,
+        full_soc: Ratio,
+        power_kw: Kw,
+        duration_seconds: Seconds = 1,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        charges many vehicles which share this powercurve and a charger. powercurves which can
+        charge many vehicles at once should override this method.
+
+        :param start_soc: the energy of each vehicle
+        :param full_soc: the cutoff energy limit
+        :param power_kw: how fast to charge
+        :param duration_seconds: the amount of time to charge for
+        :return: the energy of each vehicle after charging, along with the time each charged
+        """
+        charged = [self.charge(s, full_soc, power_kw, duration_seconds) for s in start_soc]
+        return np.array([e for e, _ in charged]), np.array([t for _, t in charged])
+
+    def charge_time_curve(self, energy_kwh: np.ndarray, power_kw: Kw) -> Optional[np.ndarray]:
+        """
+        the time to charge from empty to each of a sorted array of energy levels, for
+        powercurves which can compute it in closed form.
+
+        :param energy_kwh: the energy levels, sorted ascending
+        :param power_kw: how fast to charge
+        :return: the seconds to reach each energy level, or None if not supported
+        """
+        return None
@@ -1,4 +1,8 @@
 import logging
+import math
+from typing import NamedTuple
+
+import numpy as np
 
 from nrel.hive.model.energy.charger import Charger
 from nrel.hive.model.vehicle.mechatronics import MechatronicsInterface
@@ -7,6 +11,146 @@ from nrel.hive.util import Seconds, Ratio
 
 log = logging.getLogger(__file__)
 
+# number of state of charge bins in a ChargeTimeTable
+SOC_BINS = 1000
+
+
+class ChargeTimeTable(NamedTuple):
+    """
+    the time to charge an empty vehicle up to each of a set of evenly-spaced state of charge
+    bins, for one mechatronics and charger. looking up a charge time is O(1).
+
+    :param seconds: the seconds to reach soc i / (len(seconds) - 1) from empty
+    :param stop_soc: the state of charge where charging stops making progress
+    """
+
+    seconds: np.ndarray
+    stop_soc: Ratio
+
+    def seconds_at(self, soc: Ratio) -> float:
+        """
+        :param soc: a state of charge, no greater than stop_soc
+        :return: the seconds to reach this state of charge from empty
+        """
+        position = min(max(soc, 0.0), 1.0) * (len(self.seconds) - 1)
+        i = min(int(position), len(self.seconds) - 2)
+        t0, t1 = self.seconds[i], self.seconds[i + 1]
+        return float(t0 + (position - i) * (t1 - t0)) if position > i else float(t0)
+
+    def time_to_soc(self, start_soc: Ratio, target_soc: Ratio) -> Seconds:
+        """
+        :param start_soc: the state of charge where charging begins
+        :param target_soc: the state of charge where charging should end
+        :return: the time to charge, rounded up to the second
+        """
+        stop_soc = min(target_soc, self.stop_soc)
+        if start_soc >= stop_soc:
+            return 0
+        return int(math.ceil(self.seconds_at(stop_soc) - self.seconds_at(start_soc)))
+
+
+def build_charge_time_table(
+    vehicle: Vehicle,
+    mechatronics: MechatronicsInterface,
+    charger: Charger,
+    sim_timestep_duration_seconds: Seconds,
+    min_delta_energy_change: Ratio,
+) -> ChargeTimeTable:
+    """
+    builds a ChargeTimeTable, using the closed-form charge times of the mechatronics when
+    available, and otherwise by filling an imaginary empty vehicle one time step at a time.
+
+    charging stops at the first state of charge where the relative energy gained over a time
+    step is no more than min_delta_energy_change, as it does in a simulated charge.
+
+    :param vehicle: a vehicle with this mechatronics, used when charge times are simulated
+    :param mechatronics: the physics of the vehicle
+    :param charger: the charger used
+    :param sim_timestep_duration_seconds: the stride, in seconds, of the simulation
+    :param min_delta_energy_change: minimum change in vehicle energy before charging stops
+    :return: the charge time table
+    """
+    soc = np.linspace(0.0, 1.0, SOC_BINS + 1)
+    seconds = mechatronics.charge_time_curve(charger, soc)
+    if seconds is None:
+        seconds = _simulate_charge_time_curve(
+            vehicle, mechatronics, charger, soc, sim_timestep_duration_seconds
+        )
+
+    # charging cannot continue past the first bin which is unreachable or takes no time to reach
+    progress = np.isfinite(seconds[1:]) & (seconds[1:] > seconds[:-1])
+    n_reachable = len(soc) if progress.all() else int(np.argmin(progress)) + 1
+    reachable_soc, reachable_seconds = soc[:n_reachable], seconds[:n_reachable]
+
+    # find where one more time step of charging adds too little energy
+    soc_after_step = np.interp(
+        reachable_seconds + sim_timestep_duration_seconds, reachable_seconds, reachable_soc
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta = (soc_after_step - reachable_soc) / reachable_soc
+    stalled = (reachable_soc > 0) & (delta <= min_delta_energy_change)
+    if stalled.any():
+        stop_soc = float(soc_after_step[np.argmax(stalled)])
+    else:
+        stop_soc = float(reachable_soc[-1])
+
+    return ChargeTimeTable(seconds=seconds, stop_soc=stop_soc)
+
+
+def _simulate_charge_time_curve(
+    vehicle: Vehicle,
+    mechatronics: MechatronicsInterface,
+    charger: Charger,
+    soc: np.ndarray,
+    sim_timestep_duration_seconds: Seconds,
+) -> np.ndarray:
+    """
+    fills an imaginary empty vehicle one time step at a time, recording the time to reach each
+    state of charge. states of charge which are never reached take infinite time.
+    """
+    vehicle = vehicle.modify_energy(mechatronics.initial_energy(0.0))
+    soc_charged, time_charged = [0.0], [0.0]
+    while soc_charged[-1] < 1.0:
+        vehicle, time_delta = mechatronics.add_energy(
+            vehicle, charger, sim_timestep_duration_seconds
+        )
+        vehicle_soc = mechatronics.fuel_source_soc(vehicle)
+        if time_delta <= 0 or vehicle_soc <= soc_charged[-1]:
+            break
+        soc_charged.append(vehicle_soc)
+        time_charged.append(time_charged[-1] + time_delta)
+    return np.interp(soc, soc_charged, time_charged, right=np.inf)
+
+
+def get_charge_time_table(
+    vehicle: Vehicle,
+    mechatronics: MechatronicsInterface,
+    charger: Charger,
+    sim_timestep_duration_seconds: Seconds,
+    min_delta_energy_change: Ratio,
+) -> ChargeTimeTable:
+    """
+    gets the ChargeTimeTable for this mechatronics and charger, building it on first use.
+    tables are kept on the mechatronics, so they live as long as the mechatronics does.
+
+    :param vehicle: a vehicle with this mechatronics
+    :param mechatronics: the physics of the vehicle
+    :param charger: the charger used
+    :param sim_timestep_duration_seconds: the stride, in seconds, of the simulation
+    :param min_delta_energy_change: minimum change in vehicle energy before charging stops
+    :return: the charge time table
+    """
+    key = (charger.id, charger.rate, sim_timestep_duration_seconds, min_delta_energy_change)
+    table = mechatronics.charge_time_tables.get(key)
+    if table is not None:
+        return table
+
+    table = build_charge_time_table(
+        vehicle, mechatronics, charger, sim_timestep_duration_seconds, min_delta_energy_change
+    )
+    mechatronics.charge_time_tables[key] = table
+    return table
+
 
 def time_to_full(
     vehicle: Vehicle,
@@ -17,8 +161,10 @@ def time_to_full(
     min_delta_energy_change: Ratio,
 ) -> Seconds:
     """
-    fills an imaginary vehicle in order to determine the estimated time to charge
-    Calculating a delta because vehicles take a long time to reach a value of 100%
+    estimates the time to charge a vehicle from a ChargeTimeTable for its mechatronics and
+    charger. the table stops at the state of charge where a time step of charging changes
+    the vehicle energy by less than min_delta_energy_change, since vehicles take a long time
+    to reach a value of 100%.
 
     :param vehicle: a vehicle to estimate
     :param mechatronics: the physics of this vehicle
@@ -37,19 +183,7 @@ def time_to_full(
             f"Charger energy type is not in vehicle.energy,\n"
             "needed for is_full calculation {charger.energy_type} {vehicle.energy}"
         )
-    time_charged = 0
-    delta = 1.0  # setting default to pass the first time
-    while (
-        not mechatronics.fuel_source_soc(vehicle) >= target_soc and delta > min_delta_energy_change
-    ):
-        prev_energy = vehicle.energy.get(charger.energy_type)
-
-        vehicle, time_delta = mechatronics.add_energy(
-            vehicle, charger, sim_timestep_duration_seconds
-        )
-        if prev_energy != 0:
-            cur_energy = vehicle.energy.get(charger.energy_type)
-            if prev_energy is not None and cur_energy is not None:
-                delta = abs(prev_energy - cur_energy) / prev_energy
-        time_charged += time_delta
-    return time_charged
+    table = get_charge_time_table(
+        vehicle, mechatronics, charger, sim_timestep_duration_seconds, min_delta_energy_change
+    )
+    return table.time_to_soc(mechatronics.fuel_source_soc(vehicle), target_soc)
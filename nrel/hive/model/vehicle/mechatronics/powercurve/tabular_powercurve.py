@@ -1,20 +1,27 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Optional, Dict, Tuple, Any
+import bisect
+import logging
+import math
+
+from typing import TYPE_CHECKING, Optional, Dict, NamedTuple, Tuple, Any
 
 import numpy as np
 
 from nrel.hive.model.energy.energytype import EnergyType
 from nrel.hive.model.vehicle.mechatronics.powercurve.powercurve import Powercurve
-from nrel.hive.util.units import Seconds, SECONDS_TO_HOURS, Ratio
+from nrel.hive.util.units import Seconds, SECONDS_TO_HOURS, HOURS_TO_SECONDS, Ratio
 
 if TYPE_CHECKING:
     from nrel.hive.util.units import KwH, Kw
 
+log = logging.getLogger(__name__)
+
 
 class TabularPowercurve(Powercurve):
     """
-    builds a tabular, interpolated lookup model from a file
+    builds a tabular, interpolated lookup model from a file. the charge rate is integrated
+    exactly over each charge, so the step_size_seconds key of older powercurve files is ignored.
     """
 
     def __init__(
@@ -41,7 +48,6 @@ class TabularPowercurve(Powercurve):
         expected_keys = [
             "name",
             "power_type",
-            "step_size_seconds",
             "power_curve",
         ]
         for key in expected_keys:
@@ -52,7 +58,11 @@ class TabularPowercurve(Powercurve):
 
         self.id = data["name"]
         self.energy_type = EnergyType.from_string(data["power_type"])
-        self.step_size_seconds = data["step_size_seconds"]  # seconds
+        if "step_size_seconds" in data:
+            log.warning(
+                f"powercurve {self.id} sets step_size_seconds, which is deprecated and ignored; "
+                "the charge rate is integrated exactly"
+            )
 
         if self.energy_type is None:
             raise AttributeError(
@@ -66,6 +76,54 @@ class TabularPowercurve(Powercurve):
         self._charging_rate_kw = (
             np.array(list(map(lambda x: x["power_kw"], charging_model))) * nominal_max_charge_kw
         )
+        self._charge_curves: Dict[Kw, _ChargeCurve] = {}
+
+    def _charge_curve(self, power_kw: Kw) -> _ChargeCurve:
+        """
+        the charge rate min(curve(energy), power_kw) as linear pieces, along with the time to
+        charge from empty to the start of each piece. built once per charger power.
+
+        :param power_kw: how fast to charge
+        :return: the charge curve
+        """
+        curve = self._charge_curves.get(power_kw)
+        if curve is not None:
+            return curve
+
+        curve_energy = self._charging_energy_kwh
+        curve_rate = self._charging_rate_kw
+
+        # add the energy levels where the curve crosses the charger power, so that each piece
+        # between breakpoints is linear
+        a, b = curve_rate[:-1] - power_kw, curve_rate[1:] - power_kw
+        crossing = a * b < 0
+        crossing_energy = curve_energy[:-1][crossing] + (
+            a[crossing] / (a[crossing] - b[crossing])
+        ) * (curve_energy[1:][crossing] - curve_energy[:-1][crossing])
+
+        energy = np.unique(np.concatenate(([0.0], curve_energy, crossing_energy)).clip(min=0.0))
+        rate = np.minimum(np.interp(energy, curve_energy, curve_rate), power_kw)
+        slope = np.diff(rate) / np.diff(energy)
+
+        # a piece from e0 to e1 with rates r0 and r1 takes (e1 - e0) * ln(r1 / r0) / (r1 - r0) hours
+        e0, e1, r0, r1 = energy[:-1], energy[1:], rate[:-1], rate[1:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            hours = np.where(
+                slope == 0,
+                (e1 - e0) / r0,
+                (e1 - e0) * np.log(r1 / r0) / (r1 - r0),
+            )
+        hours[(r0 <= 0) | (r1 <= 0)] = np.inf
+        elapsed_hours = np.concatenate(([0.0], np.cumsum(hours)))
+
+        curve = _ChargeCurve(
+            tuple(energy.tolist()),
+            tuple(rate.tolist()),
+            tuple(slope.tolist()),
+            tuple(elapsed_hours.tolist()),
+        )
+        self._charge_curves[power_kw] = curve
+        return curve
 
     def charge(
         self,
@@ -75,7 +133,8 @@ class TabularPowercurve(Powercurve):
         duration_seconds: Seconds = 1,  # seconds
     ) -> Tuple[KwH, Seconds]:
         """
-        (estimated) energy rate due to fueling, based on an interpolated tabular lookup model
+        (estimated) energy rate due to fueling, based on an interpolated tabular lookup model.
+        the piecewise-linear charge rate is integrated exactly over the duration, see charge_batch.
 
         :param start_soc:
         :param full_soc: the cutoff energy limit
@@ -83,19 +142,164 @@ class TabularPowercurve(Powercurve):
         :param duration_seconds: the amount of time to charge for
         :return: the energy source charged for this duration using this charger_id, along with the time charged
         """
+        if start_soc >= full_soc:
+            return start_soc, 0
 
-        # iterate for as many seconds in a time step, by step_size_seconds
-        t = 0
-        energy_kwh = start_soc
-        while t < duration_seconds and energy_kwh < full_soc:
-            veh_kw_rate = float(
-                np.interp(energy_kwh, self._charging_energy_kwh, self._charging_rate_kw)
-            )  # kilowatt
-            charge_power_kw = min(veh_kw_rate, power_kw)  # kilowatt
-            kwh = charge_power_kw * (self.step_size_seconds * SECONDS_TO_HOURS)  # kilowatt-hours
+        curve = self._charge_curve(power_kw)
+        start_hours = curve.hours_to_energy(start_soc)
+        full_hours = curve.hours_to_energy(full_soc)
+        end_hours = start_hours + duration_seconds * SECONDS_TO_HOURS
 
-            energy_kwh += kwh
+        if math.isinf(start_hours):
+            # the charge rate is zero at this energy
+            return start_soc, duration_seconds
+        elif end_hours >= full_hours:
+            return full_soc, int(math.ceil((full_hours - start_hours) * HOURS_TO_SECONDS))
+        else:
+            return curve.energy_after_hours(end_hours), duration_seconds
 
-            t += self.step_size_seconds
+    def charge_batch(
+        self,
+        start_soc: np.ndarray,
+        full_soc: Ratio,
+        power_kw: Kw,
+        duration_seconds: Seconds = 1,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        charges many vehicles which share this powercurve and a charger. the energy of each
+        vehicle follows the charge rate exactly: over a piece of the curve starting at e0 with
+        rate r0 and slope k, after h hours a vehicle has e0 + r0 * (exp(k * h) - 1) / k energy.
+
+        compared to advancing in substeps, the energy charged differs by the error of those
+        substeps, which is largest on steep pieces of the curve. for the default powercurve it is
+        within 0.5% of the energy charged at 1 second substeps. charging stops exactly at
+        full_soc instead of at the substep which passes it.
 
-        return energy_kwh, t
+        :param start_soc: the energy of each vehicle
+        :param full_soc: the cutoff energy limit
+        :param power_kw: how fast to charge
+        :param duration_seconds: the amount of time to charge for
+        :return: the energy of each vehicle after charging, along with the time each charged
+        """
+        curve = self._charge_curve(power_kw)
+        start_hours = curve.hours_to(start_soc)
+        full_hours = curve.hours_to(np.array([full_soc], dtype=np.float64))[0]
+        end_hours = start_hours + duration_seconds * SECONDS_TO_HOURS
+
+        # vehicles where the charge rate is zero do not charge
+        stalled = ~np.isfinite(start_hours)
+        reaches_full = ~stalled & (end_hours >= full_hours)
+        with np.errstate(invalid="ignore"):
+            energy_kwh = np.where(
+                reaches_full,
+                full_soc,
+                np.where(stalled, start_soc, curve.energy_after(end_hours)),
+            )
+            time_seconds = np.where(
+                reaches_full,
+                np.ceil((full_hours - start_hours) * HOURS_TO_SECONDS),
+                duration_seconds,
+            )
+
+        # vehicles which are already full do not charge
+        already_full = start_soc >= full_soc
+        energy_kwh = np.where(already_full, start_soc, energy_kwh)
+        time_seconds = np.where(already_full, 0, time_seconds)
+        return energy_kwh, time_seconds
+
+    def charge_time_curve(self, energy_kwh: np.ndarray, power_kw: Kw) -> np.ndarray:
+        """
+        integrates the time to charge from empty to each energy level over the charge curve
+
+        :param energy_kwh: the energy levels, sorted ascending
+        :param power_kw: how fast to charge
+        :return: the seconds to reach each energy level, inf where the charge rate reaches zero
+        """
+        return self._charge_curve(power_kw).hours_to(energy_kwh) * HOURS_TO_SECONDS
+
+
+class _ChargeCurve(NamedTuple):
+    """
+    a charge rate which is linear in energy between each of a sorted sequence of energy levels.
+    held as tuples, since scalar lookups on tuples are much faster than on numpy arrays.
+
+    :param energy_kwh: the energy levels at the ends of each linear piece
+    :param rate_kw: the charge rate at each energy level
+    :param slope: the change in charge rate per kilowatt-hour along each piece
+    :param elapsed_hours: the time to charge from empty to each energy level
+    """
+
+    energy_kwh: Tuple[float, ...]
+    rate_kw: Tuple[float, ...]
+    slope: Tuple[float, ...]
+    elapsed_hours: Tuple[float, ...]
+
+    def hours_to_energy(self, energy_kwh: float) -> float:
+        """
+        :param energy_kwh: an energy level
+        :return: the time to charge from empty to this energy level
+        """
+        energy_kwh = min(max(energy_kwh, self.energy_kwh[0]), self.energy_kwh[-1])
+        i = min(bisect.bisect_right(self.energy_kwh, energy_kwh) - 1, len(self.slope) - 1)
+        delta_kwh = energy_kwh - self.energy_kwh[i]
+        r0, k = self.rate_kw[i], self.slope[i]
+        if delta_kwh == 0:
+            hours = 0.0
+        elif r0 <= 0 or r0 + k * delta_kwh <= 0:
+            hours = math.inf
+        elif k == 0:
+            hours = delta_kwh / r0
+        else:
+            hours = math.log1p(k * delta_kwh / r0) / k
+        return self.elapsed_hours[i] + hours
+
+    def energy_after_hours(self, hours: float) -> float:
+        """
+        :param hours: time spent charging from empty
+        :return: the energy after charging from empty for this amount of time
+        """
+        i = min(max(bisect.bisect_right(self.elapsed_hours, hours) - 1, 0), len(self.slope) - 1)
+        elapsed = hours - self.elapsed_hours[i]
+        r0, k = self.rate_kw[i], self.slope[i]
+        if k == 0:
+            delta_kwh = r0 * elapsed
+        else:
+            delta_kwh = r0 * math.expm1(min(k * elapsed, 700.0)) / k
+        return min(self.energy_kwh[i] + delta_kwh, self.energy_kwh[i + 1])
+
+    def hours_to(self, energy_kwh: np.ndarray) -> np.ndarray:
+        """
+        :param energy_kwh: energy levels
+        :return: the time to charge from empty to each energy level
+        """
+        energy, rate, slope = (
+            np.asarray(self.energy_kwh),
+            np.asarray(self.rate_kw),
+            np.asarray(self.slope),
+        )
+        energy_kwh = energy_kwh.clip(energy[0], energy[-1])
+        i = np.searchsorted(energy, energy_kwh, side="right") - 1
+        i = np.clip(i, 0, len(slope) - 1)
+        delta_kwh, r0, k = energy_kwh - energy[i], rate[i], slope[i]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            hours = np.where(k == 0, delta_kwh / r0, np.log1p(k * delta_kwh / r0) / k)
+        hours = np.where(np.isnan(hours), np.inf, hours)
+        return np.asarray(self.elapsed_hours)[i] + np.where(delta_kwh == 0, 0.0, hours)
+
+    def energy_after(self, hours: np.ndarray) -> np.ndarray:
+        """
+        :param hours: time spent charging from empty
+        :return: the energy after charging from empty for each amount of time
+        """
+        energy, rate, slope = (
+            np.asarray(self.energy_kwh),
+            np.asarray(self.rate_kw),
+            np.asarray(self.slope),
+        )
+        elapsed_hours = np.asarray(self.elapsed_hours)
+        i = np.searchsorted(elapsed_hours, hours, side="right") - 1
+        i = np.clip(i, 0, len(slope) - 1)
+        elapsed, r0, k = hours - elapsed_hours[i], rate[i], slope[i]
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            delta_kwh = np.where(k == 0, r0 * elapsed, r0 * np.expm1(k * elapsed) / k)
+        return np.minimum(energy[i] + delta_kwh, energy[i + 1])
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from abc import abstractmethod, ABC
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Dict, Sequence
 
 from nrel.hive.model.roadnetwork.route import Route
 from nrel.hive.util.units import Unit
@@ -30,6 +30,16 @@ class PowertrainABC(ABC):
         :return: energy cost of this route
         """
 
+    def energy_costs(self, routes: Sequence[Route]) -> Sequence[float]:
+        """
+        (estimated) energy cost to traverse each of a collection of routes. powertrains which
+        can compute many routes at once should override this method.
+
+        :param routes: the routes
+        :return: the energy cost of each route
+        """
+        return [self.energy_cost(route) for route in routes]
+
     @classmethod
     @abstractmethod
     def from_data(cls, data: Dict[str, Any]) -> Powertrain:
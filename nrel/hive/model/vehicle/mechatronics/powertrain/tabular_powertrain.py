@@ -1,9 +1,11 @@
-from dataclasses import dataclass
-from typing import Dict, Any
+from dataclasses import dataclass, field
+from typing import Dict, Any, Sequence
 
 import numpy as np
 
 from nrel.hive.model.roadnetwork.linktraversal import LinkTraversal
+from nrel.hive.model.roadnetwork.array_route import ArrayRoute
+from nrel.hive.model.roadnetwork.route import route_link_arrays
 from nrel.hive.model.roadnetwork.routetraversal import Route
 from nrel.hive.model.vehicle.mechatronics.powertrain.powertrain import Powertrain
 from nrel.hive.util.units import Unit, get_unit_conversion
@@ -22,6 +24,11 @@ class TabularPowertrain(Powertrain):
     consumption_speed: np.ndarray
     consumption_energy_per_distance: np.ndarray
 
+    # memoized energy per kilometer for each link speed (kmph) seen by this powertrain
+    _energy_per_km_by_speed: Dict[float, float] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
     @classmethod
     def from_data(
         self,
@@ -67,28 +74,72 @@ class TabularPowertrain(Powertrain):
             consumption_energy_per_distance,
         )
 
+    def _energy_per_km(self, speed_kmph: np.ndarray) -> np.ndarray:
+        """
+        interpolates the energy used per kilometer at each of the provided speeds
+
+        :param speed_kmph: link speeds in kilometers per hour
+        :return: energy per kilometer, in units captured by self.energy_units
+        """
+        # convert kilometers per hour to whatever units are used by this powertrain
+        link_speed = speed_kmph * get_unit_conversion(Unit.KMPH, self.speed_units)
+        energy_per_distance = np.interp(
+            link_speed,
+            self.consumption_speed,
+            self.consumption_energy_per_distance,
+        )
+        # link distance is in kilometers
+        return energy_per_distance * get_unit_conversion(Unit.KILOMETERS, self.distance_units)
+
     def link_cost(self, link: LinkTraversal) -> float:
         """
-        uses mph tabular value to calculate energy over a link
+        uses mph tabular value to calculate energy over a link. the energy rate at each link
+        speed is interpolated once and then memoized.
 
 
         :param link: the link to calculate energy over.
         :return: energy in units captured by self.energy_units
         """
-        # convert kilometers per hour to whatever units are used by this powertrain
-        link_speed = link.speed_kmph * get_unit_conversion(Unit.KMPH, self.speed_units)
-
-        energy_per_distance = float(
-            np.interp(
-                link_speed,
-                self.consumption_speed,
-                self.consumption_energy_per_distance,
-            )
-        )
-        # link distance is in kilometers
-        link_distance = link.distance_km * get_unit_conversion(Unit.KILOMETERS, self.distance_units)
-        energy = energy_per_distance * link_distance
-        return energy
+        energy_per_km = self._energy_per_km_by_speed.get(link.speed_kmph)
+        if energy_per_km is None:
+            energy_per_km = float(self._energy_per_km(np.array(link.speed_kmph)))
+            self._energy_per_km_by_speed[link.speed_kmph] = energy_per_km
+        return energy_per_km * link.distance_km
+
+    def route_energy(self, route: Route) -> float:
+        """
+        calculates the energy over all links of a route with a single interpolation
+
+        :param route: the route to calculate energy over
+        :return: energy in units captured by self.energy_units
+        """
+        distance_km, speed_kmph = route_link_arrays(route)
+        return float(np.dot(self._energy_per_km(speed_kmph), distance_km))
 
     def energy_cost(self, route: Route) -> float:
+        if isinstance(route, ArrayRoute):
+            return self.route_energy(route)
         return sum([self.link_cost(link) for link in route])
+
+    def energy_costs(self, routes: Sequence[Route]) -> Sequence[float]:
+        """
+        computes the energy cost of many routes with a single interpolation over all of their links
+
+        :param routes: the routes
+        :return: the energy cost of each route, in units captured by self.energy_units
+        """
+        if len(routes) == 0:
+            return []
+        link_arrays = [route_link_arrays(route) for route in routes]
+        distance_km = np.concatenate([distance for distance, _ in link_arrays])
+        speed_kmph = np.concatenate([speed for _, speed in link_arrays])
+        link_energy = self._energy_per_km(speed_kmph) * distance_km
+
+        # sum the link energy of each route; empty routes have no energy cost
+        route_lengths = np.array([len(distance) for distance, _ in link_arrays])
+        route_energy = np.zeros(len(routes))
+        non_empty = route_lengths > 0
+        offsets = np.concatenate(([0], np.cumsum(route_lengths)[:-1]))
+        if non_empty.any():
+            route_energy[non_empty] = np.add.reduceat(link_energy, offsets[non_empty])
+        return route_energy.tolist()
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, Iterable, List, Optional
+
+from nrel.hive.reporting import vehicle_event_ops
+from nrel.hive.reporting.handler.eventful_handler import EventfulHandler
+from nrel.hive.reporting.handler.handler import Handler
+from nrel.hive.reporting.handler.stateful_handler import StateLogSelector, StatefulHandler
+from nrel.hive.reporting.report_type import ReportType
+
+if TYPE_CHECKING:
+    from nrel.hive.config.global_config import GlobalConfig
+    from nrel.hive.runner.runner_payload import RunnerPayload
+    from nrel.hive.reporting.reporter import Report
+
+log = logging.getLogger(__name__)
+
+# the columnar log formats which can be set in the global config
+COLUMNAR_LOG_FORMATS = ("parquet", "arrow")
+
+# flush a report type early once it has buffered this many rows
+MAX_BUFFERED_ROWS = 500_000
+
+STATE_REPORT_TYPES = (
+    ReportType.DRIVER_STATE,
+    ReportType.VEHICLE_STATE,
+    ReportType.STATION_STATE,
+)
+
+
+class _ColumnBuffer:
+    """
+    the rows of one report type waiting to be written, stored column-wise. a column which
+    first appears partway through the buffer is back-filled with nulls.
+    """
+
+    def __init__(self) -> None:
+        self.columns: Dict[str, List[Any]] = {}
+        self.n_rows = 0
+
+    def append(self, row: Dict[str, Any]):
+        for key, value in row.items():
+            column = self.columns.get(key)
+            if column is None:
+                column = [None] * self.n_rows
+                self.columns[key] = column
+            column.append(value)
+        self.n_rows += 1
+        if len(self.columns) > len(row):
+            for column in self.columns.values():
+                if len(column) < self.n_rows:
+                    column.append(None)
+
+    def clear(self):
+        self.columns = {}
+        self.n_rows = 0
+
+
+class ColumnarHandler(Handler):
+    """
+    writes events and entity states to one Parquet or Arrow IPC file per report type, based on
+    global logging settings. rows are buffered in typed columns and written as one row group
+    (or record batch) at the first log flush after every log_columnar_flush_steps time steps.
+
+    the column types of a report type are inferred when it is first written: bools, ints and
+    floats keep their type and all other values are stored as strings, as they appear in the json
+    logs. if later rows hold new columns, or values which do not fit a column's type, the file is
+    closed and the report type continues in a new part file with a wider schema, so no values are
+    lost and written rows are never read back. the first part is named after the report type,
+    such as vehicle_state.parquet, and later parts are numbered, such as vehicle_state.1.parquet.
+    each part's schema holds the columns of the parts before it, with the same or wider types.
+    """
+
+    def __init__(
+        self,
+        global_config: GlobalConfig,
+        scenario_output_directory: Path,
+        max_buffered_rows: int = MAX_BUFFERED_ROWS,
+    ):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "the pyarrow package is required for parquet or arrow log output, "
+                "install it with `pip install nrel.hive[columnar]`"
+            ) from e
+
+        if global_config.log_format not in COLUMNAR_LOG_FORMATS:
+            raise ValueError(
+                f"columnar log format {global_config.log_format} must be one of "
+                f"{COLUMNAR_LOG_FORMATS}"
+            )
+
+        self.global_config = global_config
+        self.scenario_output_directory = scenario_output_directory
+        self.flush_steps = max(global_config.log_columnar_flush_steps, 1)
+        self.max_buffered_rows = max_buffered_rows
+
+        self._buffers: Dict[ReportType, _ColumnBuffer] = {}
+        self._writers: Dict[ReportType, Any] = {}
+        self._schemas: Dict[ReportType, Any] = {}
+        self._parts: Dict[ReportType, int] = {}
+        self._steps_since_flush = 0
+        self._state_selector = StateLogSelector(global_config)
+        self._station_loads: Optional[vehicle_event_ops.StationLoadAccumulator] = None
+        if ReportType.STATION_LOAD_EVENT in global_config.log_sim_config:
+            self._station_loads = vehicle_event_ops.StationLoadAccumulator(
+                global_config.log_station_load_interval_steps
+            )
+
+    def handle(self, reports: List[Report], runner_payload: RunnerPayload):
+        if self.global_config.log_events:
+            log_sim_config = self.global_config.log_sim_config
+            self._buffer_reports(r for r in reports if r.report_type in log_sim_config)
+
+        if self._steps_since_flush >= self.flush_steps:
+            self.flush()
+        else:
+            for report_type, buffer in self._buffers.items():
+                if buffer.n_rows >= self.max_buffered_rows:
+                    self._write(report_type, buffer)
+
+    def step(self, reports: List[Report], runner_payload: RunnerPayload):
+        sim_state = runner_payload.s
+        log_sim_config = self.global_config.log_sim_config
+
+        if self.global_config.log_events and self._station_loads is not None:
+            for report in reports:
+                if report.report_type == ReportType.VEHICLE_CHARGE_EVENT:
+                    self._station_loads.add(report)
+            self._buffer_reports(self._station_loads.station_load_events(sim_state))
+
+        if self.global_config.log_states and self._state_selector.next_step():
+            sim_time = str(sim_state.sim_time)
+            if ReportType.DRIVER_STATE in log_sim_config:
+                self._buffer_entities(
+                    ReportType.DRIVER_STATE,
+                    sim_state.vehicles.values(),
+                    StatefulHandler.driver_asdict,
+                    sim_time,
+                )
+            if ReportType.VEHICLE_STATE in log_sim_config:
+                self._buffer_entities(
+                    ReportType.VEHICLE_STATE,
+                    sim_state.vehicles.values(),
+                    StatefulHandler.vehicle_asdict,
+                    sim_time,
+                )
+            if ReportType.STATION_STATE in log_sim_config:
+                self._buffer_entities(
+                    ReportType.STATION_STATE,
+                    sim_state.stations.values(),
+                    StatefulHandler.station_asdict,
+                    sim_time,
+                )
+
+        self._steps_since_flush += 1
+
+    def report_types(self) -> FrozenSet[ReportType]:
+        if not self.global_config.log_events:
+            return frozenset()
+        return EventfulHandler.event_report_types(self.global_config.log_sim_config)
+
+    def flush(self):
+        """
+        writes all buffered rows
+        """
+        for report_type, buffer in self._buffers.items():
+            if buffer.n_rows > 0:
+                self._write(report_type, buffer)
+        self._steps_since_flush = 0
+
+    def close(self, runner_payload: RunnerPayload):
+        self.flush()
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+
+    def _buffer_reports(self, reports: Iterable[Report]):
+        for report in reports:
+            buffer = self._buffers.get(report.report_type)
+            if buffer is None:
+                buffer = _ColumnBuffer()
+                self._buffers[report.report_type] = buffer
+            buffer.append(report.report)
+
+    def _buffer_entities(
+        self,
+        report_type: ReportType,
+        entities: Iterable[Any],
+        asdict: Callable[[Any], Dict[str, Any]],
+        sim_time: str,
+    ):
+        buffer = self._buffers.setdefault(report_type, _ColumnBuffer())
+        for row in self._state_selector.records(report_type, entities, asdict):
+            row["sim_time"] = sim_time
+            buffer.append(row)
+
+    def _write(self, report_type: ReportType, buffer: _ColumnBuffer):
+        import pyarrow as pa
+
+        schema = self._schemas.get(report_type)
+        if schema is None:
+            schema = pa.schema(
+                [(name, _infer_arrow_type(values)) for name, values in buffer.columns.items()]
+            )
+            self._schemas[report_type] = schema
+            self._parts[report_type] = 0
+            self._writers[report_type] = self._open_writer(report_type, schema)
+        else:
+            widened = _widen_schema(schema, buffer.columns)
+            if not widened.equals(schema):
+                self._next_part(report_type, widened)
+                schema = widened
+
+        arrays = [
+            _to_arrow_array(buffer.columns.get(field.name, [None] * buffer.n_rows), field.type)
+            for field in schema
+        ]
+        table = pa.Table.from_arrays(arrays, schema=schema)
+        self._writers[report_type].write_table(table)
+        buffer.clear()
+
+    def _next_part(self, report_type: ReportType, schema):
+        """
+        closes the file of a report type and continues in a new part file with a wider schema,
+        when later rows hold new columns or values which do not fit the types written so far
+        """
+        log.debug(f"widening the {report_type.name.lower()} schema to {schema}")
+        self._writers[report_type].close()
+        self._parts[report_type] += 1
+        self._schemas[report_type] = schema
+        self._writers[report_type] = self._open_writer(report_type, schema)
+
+    def _path(self, report_type: ReportType) -> Path:
+        suffix = "parquet" if self.global_config.log_format == "parquet" else "arrow"
+        part = self._parts.get(report_type, 0)
+        name = report_type.name.lower() if part == 0 else f"{report_type.name.lower()}.{part}"
+        return self.scenario_output_directory / f"{name}.{suffix}"
+
+    def _open_writer(self, report_type: ReportType, schema):
+        path = self._path(report_type)
+        if self.global_config.log_format == "parquet":
+            import pyarrow.parquet as pq
+
+            return pq.ParquetWriter(path, schema)
+        else:
+            import pyarrow as pa
+
+            return pa.ipc.new_file(path, schema)
+
+
+def _infer_arrow_type(values: List[Any]):
+    """
+    picks the arrow type for a column from the python types of its values; columns mixing
+    ints and floats are floats, and everything else is a string.
+    """
+    import pyarrow as pa
+
+    value_types = {type(v) for v in values if v is not None}
+    if value_types == {bool}:
+        return pa.bool_()
+    elif value_types == {int}:
+        return pa.int64()
+    elif len(value_types) > 0 and value_types.issubset({int, float}):
+        return pa.float64()
+    else:
+        return pa.string()
+
+
+def _widen_schema(schema, columns: Dict[str, List[Any]]):
+    """
+    widens a schema to hold a new batch of columns: int columns holding floats become floats,
+    typed columns holding other values become strings, and new columns are added.
+    """
+    import pyarrow as pa
+
+    fields = []
+    for field in schema:
+        value_types = {type(v) for v in columns.get(field.name, ()) if v is not None}
+        if pa.types.is_string(field.type) or len(value_types) == 0:
+            fields.append(field)
+        elif pa.types.is_boolean(field.type):
+            fields.append(field if value_types == {bool} else field.with_type(pa.string()))
+        elif value_types.issubset({int, float}):
+            if pa.types.is_integer(field.type) and float in value_types:
+                fields.append(field.with_type(pa.float64()))
+            else:
+                fields.append(field)
+        else:
+            fields.append(field.with_type(pa.string()))
+    for name, values in columns.items():
+        if name not in schema.names:
+            fields.append(pa.field(name, _infer_arrow_type(values)))
+    return pa.schema(fields)
+
+
+def _to_arrow_array(values: List[Any], arrow_type):
+    """
+    builds an arrow array of a fixed type. the schema is widened before writing so that every
+    value fits; any value which still does not fit a numeric type is written as a null.
+    """
+    import pyarrow as pa
+
+    if pa.types.is_string(arrow_type):
+        return pa.array([v if v is None or type(v) is str else str(v) for v in values], arrow_type)
+    elif pa.types.is_boolean(arrow_type):
+        return pa.array([v if type(v) is bool else None for v in values], arrow_type)
+    elif pa.types.is_integer(arrow_type):
+        return pa.array([_as_int(v) for v in values], arrow_type)
+    else:
+        return pa.array([_as_float(v) for v in values], arrow_type)
+
+
+def _as_int(value: Any) -> Optional[int]:
+    if type(value) is int:
+        return value
+    elif type(value) is float and value.is_integer():
+        return int(value)
+    return None
+
+
+def _as_float(value: Any) -> Optional[float]:
+    return float(value) if type(value) in (int, float) else None
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-import json
 import logging
 from pathlib import Path
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, FrozenSet, Iterable, List, Optional
 
 from nrel.hive.reporting import vehicle_event_ops
 from nrel.hive.reporting.handler.handler import Handler
+from nrel.hive.reporting.handler.log_writer import build_log_writer
 from nrel.hive.reporting.report_type import ReportType
 
 if TYPE_CHECKING:
@@ -24,32 +24,65 @@ class EventfulHandler(Handler):
 
     def __init__(self, global_config: GlobalConfig, scenario_output_directory: Path):
         log_path = scenario_output_directory / "event.log"
-        self.log_file = open(log_path, "a")
+        self.log_writer = build_log_writer(global_config, log_path)
 
         self.global_config = global_config
 
-    def handle(self, reports: List[Report], runner_payload: RunnerPayload):
-        sim_state = runner_payload.s
-
-        reports_not_instructions = tuple(
-            filter(lambda r: r.report_type != ReportType.INSTRUCTION, reports)
-        )
-
         # station load events, written with reference to a specific station, take the sum of
         # charge events over a time step associated with a single station
-        if ReportType.STATION_LOAD_EVENT in self.global_config.log_sim_config:
-            station_load_reports = vehicle_event_ops.construct_station_load_events(
-                reports_not_instructions, sim_state
+        self.station_loads: Optional[vehicle_event_ops.StationLoadAccumulator] = None
+        if ReportType.STATION_LOAD_EVENT in global_config.log_sim_config:
+            self.station_loads = vehicle_event_ops.StationLoadAccumulator(
+                global_config.log_station_load_interval_steps
             )
-            for report in station_load_reports:
-                entry = json.dumps(report.as_json(), default=str)
-                self.log_file.write(entry + "\n")
 
-        for report in reports_not_instructions:
-            if report.report_type in self.global_config.log_sim_config:
-                report_json = report.as_json()
-                entry = json.dumps(report_json, default=str)
-                self.log_file.write(entry + "\n")
+        # station load events waiting for the next flush
+        self.station_load_reports: List[Report] = []
+
+    def handle(self, reports: List[Report], runner_payload: RunnerPayload):
+        log_sim_config = self.global_config.log_sim_config
+
+        # station load events are written ahead of the other events from the same flush.
+        # reports are converted to log entries by the log writer.
+        events, self.station_load_reports = self.station_load_reports, []
+        events.extend(report for report in reports if report.report_type in log_sim_config)
+
+        self.log_writer.write_reports(events)
+
+    def buffered_count(self) -> int:
+        return len(self.station_load_reports)
+
+    def step(self, reports: List[Report], runner_payload: RunnerPayload):
+        if self.station_loads is None:
+            return
+        for report in reports:
+            if report.report_type == ReportType.VEHICLE_CHARGE_EVENT:
+                self.station_loads.add(report)
+        self.station_load_reports.extend(self.station_loads.station_load_events(runner_payload.s))
+
+    def report_types(self) -> FrozenSet[ReportType]:
+        return self.event_report_types(self.global_config.log_sim_config)
+
+    @staticmethod
+    def event_report_types(log_sim_config: Iterable[ReportType]) -> FrozenSet[ReportType]:
+        """
+        the report types read when logging events
+
+        :param log_sim_config: the report types to log
+        :return: the logged event report types, along with the charge events used to build
+                 station load events
+        """
+        logged = set(log_sim_config).difference(
+            (
+                ReportType.INSTRUCTION,
+                ReportType.DRIVER_STATE,
+                ReportType.VEHICLE_STATE,
+                ReportType.STATION_STATE,
+            )
+        )
+        if ReportType.STATION_LOAD_EVENT in logged:
+            logged.add(ReportType.VEHICLE_CHARGE_EVENT)
+        return frozenset(logged)
 
     def close(self, runner_payload: RunnerPayload):
-        self.log_file.close()
+        self.log_writer.close()
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, FrozenSet, List
+
+from nrel.hive.reporting.report_type import ReportType
 
 if TYPE_CHECKING:
     from nrel.hive.reporting.reporter import Report
@@ -16,15 +18,47 @@ class Handler(ABC):
     @abstractmethod
     def handle(self, reports: List[Report], runner_payload: RunnerPayload):
         """
-        called at each log step.
+        called at each log flush, which may cover several time steps.
 
 
-        :param reports:
+        :param reports: the reports filed since the last flush with one of this handler's report
+                        types. the list is emptied and reused after the flush, so a handler which
+                        keeps the reports should copy them
 
         :param runner_payload:
         :return:
         """
 
+    def step(self, reports: List[Report], runner_payload: RunnerPayload):
+        """
+        called at each time step, even when reports are flushed less often. handlers which read
+        the simulation state at every time step override this; by default, it does nothing.
+
+
+        :param reports: the reports filed during this step with one of this handler's report types
+
+        :param runner_payload: the simulation state at the end of this step
+        :return:
+        """
+
+    def buffered_count(self) -> int:
+        """
+        the number of entries this handler holds until the next flush, which count towards the
+        reporter's limit on buffered reports
+
+        :return: the number of buffered entries, by default 0
+        """
+        return 0
+
+    def report_types(self) -> FrozenSet[ReportType]:
+        """
+        the types of reports read by this handler. only reports of these types are passed to
+        handle, and reports of types which no handler reads are not built.
+
+        :return: the report types this handler reads, by default all of them
+        """
+        return frozenset(ReportType)
+
     @abstractmethod
     def close(self, runner_payload: RunnerPayload):
         """
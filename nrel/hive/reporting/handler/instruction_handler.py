@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-import json
 import logging
 from pathlib import Path
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, FrozenSet, List
 
 from nrel.hive.reporting.handler.handler import Handler
+from nrel.hive.reporting.handler.log_writer import build_log_writer
 from nrel.hive.reporting.report_type import ReportType
 
 if TYPE_CHECKING:
@@ -23,19 +23,16 @@ class InstructionHandler(Handler):
 
     def __init__(self, global_config: GlobalConfig, scenario_output_directory: Path):
         log_path = scenario_output_directory / "instruction.log"
-        self.log_file = open(log_path, "a")
+        self.log_writer = build_log_writer(global_config, log_path)
 
         self.global_config = global_config
 
     def handle(self, reports: List[Report], runner_payload: RunnerPayload):
-        for report in reports:
-            if (
-                report.report_type == ReportType.INSTRUCTION
-                and ReportType.INSTRUCTION in self.global_config.log_sim_config
-            ):
-                report_json = report.as_json()
-                entry = json.dumps(report_json, default=str)
-                self.log_file.write(entry + "\n")
+        # the reporter reuses its list of reports, so the log writer is given a copy
+        self.log_writer.write_reports(list(reports))
+
+    def report_types(self) -> FrozenSet[ReportType]:
+        return frozenset({ReportType.INSTRUCTION}).intersection(self.global_config.log_sim_config)
 
     def close(self, runner_payload: RunnerPayload):
-        self.log_file.close()
+        self.log_writer.close()
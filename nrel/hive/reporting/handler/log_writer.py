@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import logging
+import queue
+import threading
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+if TYPE_CHECKING:
+    from nrel.hive.config.global_config import GlobalConfig
+    from nrel.hive.reporting.reporter import Report
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+log = logging.getLogger(__name__)
+
+# the log writer modes and backpressure policies which can be set in the global config
+LOG_WRITER_MODES = ("sync", "async")
+LOG_WRITER_BACKPRESSURE = ("block", "drop")
+
+# the log compression codecs which can be set in the global config, by the suffix they add to
+# log file names
+LOG_COMPRESSION_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+
+class LogWriter:
+    """
+    writes log entries as lines of json to a log file on the calling thread. typed log entries
+    are serialized with orjson, when it is installed. the log file may be written through a
+    streaming gzip or zstd compressor.
+    """
+
+    def __init__(
+        self,
+        log_path: Path,
+        buffer_bytes: int = -1,
+        typed: bool = False,
+        compression: str = "none",
+        compression_level: int = 3,
+    ):
+        self.log_file = open_log_file(log_path, buffer_bytes, compression, compression_level)
+        self.log_path = log_path
+        self.typed = typed
+
+    def write(self, entries: Sequence[Dict]):
+        """
+        writes a batch of log entries
+
+        :param entries: the log entries
+        """
+        if len(entries) > 0:
+            self.log_file.write(serialize(entries, self.typed))
+
+    def write_reports(self, reports: Sequence[Report]):
+        """
+        writes a batch of reports as log entries
+
+        :param reports: the reports
+        """
+        if len(reports) > 0:
+            self.log_file.write(serialize_reports(reports, self.typed))
+
+    def close(self):
+        """
+        writes any remaining entries and closes the log file
+        """
+        self.log_file.close()
+
+
+class AsyncLogWriter(LogWriter):
+    """
+    serializes and writes log entries on a background writer thread. batches of log entries
+    wait on a bounded queue; when the queue is full, the backpressure policy either blocks
+    the calling thread until the writer catches up ("block") or discards the batch ("drop").
+    reports passed to write_reports are also converted to log entries on the writer thread.
+
+    entries and reports must not be modified after they are passed to the writer.
+    """
+
+    _CLOSE = None
+
+    def __init__(
+        self,
+        log_path: Path,
+        buffer_bytes: int = -1,
+        queue_size: int = 64,
+        backpressure: str = "block",
+        typed: bool = False,
+        compression: str = "none",
+        compression_level: int = 3,
+    ):
+        if backpressure not in LOG_WRITER_BACKPRESSURE:
+            raise ValueError(
+                f"log writer backpressure {backpressure} must be one of {LOG_WRITER_BACKPRESSURE}"
+            )
+        super().__init__(log_path, buffer_bytes, typed, compression, compression_level)
+        self.backpressure = backpressure
+        self.dropped_entries = 0
+        # each batch is queued along with whether it holds reports or log entries
+        self._queue: queue.Queue[Optional[Tuple[Sequence[Any], bool]]] = queue.Queue(
+            maxsize=queue_size
+        )
+        self._error: Optional[Exception] = None
+        self._thread = threading.Thread(
+            target=self._drain, name=f"hive-log-writer-{Path(log_path).name}", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, entries: Sequence[Dict]):
+        """
+        queues a batch of log entries to be written by the writer thread
+
+        :param entries: the log entries
+        """
+        self._put(entries, False)
+
+    def write_reports(self, reports: Sequence[Report]):
+        """
+        queues a batch of reports to be serialized and written by the writer thread
+
+        :param reports: the reports
+        """
+        self._put(reports, True)
+
+    def _put(self, batch: Sequence[Any], are_reports: bool):
+        if self._error is not None:
+            raise self._error
+        if len(batch) == 0:
+            return
+        if self.backpressure == "block":
+            self._queue.put((batch, are_reports))
+        else:
+            try:
+                self._queue.put_nowait((batch, are_reports))
+            except queue.Full:
+                self.dropped_entries += len(batch)
+
+    def close(self):
+        """
+        blocks until all queued entries are written, and then closes the log file
+        """
+        if self._thread.is_alive():
+            self._queue.put(self._CLOSE)
+            self._thread.join()
+        super().close()
+        if self.dropped_entries > 0:
+            log.warning(
+                f"dropped {self.dropped_entries} log entries from {self.log_path} "
+                "while the log writer queue was full"
+            )
+        if self._error is not None:
+            raise self._error
+
+    def _drain(self) -> None:
+        closing = False
+        while not closing:
+            batch: List[Tuple[Sequence[Any], bool]] = []
+            entries = self._queue.get()
+            # gather any other waiting batches into one larger write
+            while entries is not self._CLOSE:
+                batch.append(entries)
+                try:
+                    entries = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            closing = entries is self._CLOSE
+            if self._error is None and len(batch) > 0:
+                try:
+                    self.log_file.write(
+                        "".join(
+                            serialize_reports(b, self.typed)
+                            if are_reports
+                            else serialize(b, self.typed)
+                            for b, are_reports in batch
+                        )
+                    )
+                except Exception as e:
+                    # raised on the simulation thread at the next write or on close
+                    self._error = e
+
+
+def serialize(entries: Sequence[Dict], typed: bool = False) -> str:
+    """
+    serializes log entries as lines of json
+
+    :param entries: the log entries
+    :param typed: if the entries hold typed values, which may be serialized with orjson
+    :return: the lines of json, each ending in a newline
+    """
+    if typed and HAS_ORJSON:
+        dumps, option = orjson.dumps, orjson.OPT_APPEND_NEWLINE
+        return b"".join(dumps(entry, default=str, option=option) for entry in entries).decode()
+    return "".join(json.dumps(entry, default=str) + "\n" for entry in entries)
+
+
+def serialize_reports(reports: Sequence[Report], typed: bool = False) -> str:
+    """
+    serializes reports as lines of json
+
+    :param reports: the reports
+    :param typed: if the reports keep the json types of their values, see Report.as_json
+    :return: the lines of json, each ending in a newline
+    """
+    return serialize([report.as_json(typed) for report in reports], typed)
+
+
+def open_log_file(
+    log_path: Path,
+    buffer_bytes: int = -1,
+    compression: str = "none",
+    compression_level: int = 3,
+) -> IO[str]:
+    """
+    opens a log file for appending lines of text, writing through a streaming compressor when
+    one is set. compressed log files are named with the suffix of the compressor, such as
+    event.log.gz.
+
+    :param log_path: the log file
+    :param buffer_bytes: the size of the write buffer, or -1 for the default size
+    :param compression: one of "none", "gzip" or "zstd"
+    :param compression_level: the compression level
+    :return: the open log file
+    """
+    if compression not in LOG_COMPRESSION_SUFFIXES:
+        raise ValueError(
+            f"log compression {compression} must be one of {tuple(LOG_COMPRESSION_SUFFIXES)}"
+        )
+    elif compression == "none":
+        return open(log_path, "a", buffering=buffer_bytes)
+
+    compressed_path = f"{log_path}{LOG_COMPRESSION_SUFFIXES[compression]}"
+    stream: Any
+    if compression == "gzip":
+        stream = gzip.open(compressed_path, "ab", compresslevel=compression_level)
+    else:
+        zstandard = _import_zstandard()
+        compressor = zstandard.ZstdCompressor(level=compression_level)
+        stream = compressor.stream_writer(open(compressed_path, "ab"), closefd=True)
+
+    buffer_size = io.DEFAULT_BUFFER_SIZE if buffer_bytes < 0 else buffer_bytes
+    if buffer_size > 0:
+        stream = io.BufferedWriter(stream, buffer_size=buffer_size)
+    return io.TextIOWrapper(stream, encoding="utf-8")
+
+
+def read_log(log_path: Union[str, Path]) -> Iterator[Dict]:
+    """
+    reads the entries of a json log file, such as event.log or state.log. if the log was
+    written compressed, either the compressed file or the uncompressed name may be given.
+
+    :param log_path: the log file
+    :return: the log entries, in the order they were written
+    """
+    path = Path(log_path)
+    if not path.exists():
+        for suffix in LOG_COMPRESSION_SUFFIXES.values():
+            if Path(f"{path}{suffix}").exists():
+                path = Path(f"{path}{suffix}")
+                break
+
+    stream: Any
+    if path.suffix == LOG_COMPRESSION_SUFFIXES["gzip"]:
+        stream = gzip.open(path, "rb")
+    elif path.suffix == LOG_COMPRESSION_SUFFIXES["zstd"]:
+        zstandard = _import_zstandard()
+        decompressor = zstandard.ZstdDecompressor()
+        stream = decompressor.stream_reader(open(path, "rb"), read_across_frames=True, closefd=True)
+    else:
+        stream = open(path, "rb")
+
+    with io.TextIOWrapper(stream, encoding="utf-8") as log_file:
+        for line in log_file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _import_zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "the zstandard package is required for zstd log compression, "
+            "install it with `pip install nrel.hive[zstd]`"
+        ) from e
+    return zstandard
+
+
+def build_log_writer(global_config: GlobalConfig, log_path: Path) -> LogWriter:
+    """
+    builds the log writer for a log file based on global logging settings
+
+    :param global_config: the global config
+    :param log_path: the log file to append to
+    :return: the log writer
+    """
+    if global_config.log_writer_mode == "sync":
+        return LogWriter(
+            log_path,
+            buffer_bytes=global_config.log_writer_buffer_bytes,
+            typed=global_config.log_json_typed,
+            compression=global_config.log_compression,
+            compression_level=global_config.log_compression_level,
+        )
+    elif global_config.log_writer_mode == "async":
+        return AsyncLogWriter(
+            log_path,
+            buffer_bytes=global_config.log_writer_buffer_bytes,
+            queue_size=global_config.log_writer_queue_size,
+            backpressure=global_config.log_writer_backpressure,
+            typed=global_config.log_json_typed,
+            compression=global_config.log_compression,
+            compression_level=global_config.log_compression_level,
+        )
+    else:
+        raise ValueError(
+            f"log writer mode {global_config.log_writer_mode} must be one of {LOG_WRITER_MODES}"
+        )
@@ -1,15 +1,85 @@
-import json
+import zlib
 from dataclasses import asdict
 from pathlib import Path
-from typing import List
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Tuple
 
 from nrel.hive.config.global_config import GlobalConfig
 from nrel.hive.model.station.station import Station
 from nrel.hive.model.vehicle.vehicle import Vehicle
 from nrel.hive.reporting.handler.handler import Handler
+from nrel.hive.reporting.handler.log_writer import build_log_writer
 from nrel.hive.reporting.report_type import ReportType
 from nrel.hive.reporting.reporter import Report
 from nrel.hive.runner import RunnerPayload
+from nrel.hive.util.typealiases import EntityId
+
+
+class StateLogSelector:
+    """
+    selects the entity states to log based on global logging settings. states are logged every
+    log_states_interval_steps time steps, for the share of entities sampled by
+    log_states_sample_ratio. with log_states_changes_only, an entity is only logged when its
+    record differs from the last one logged for it.
+
+    sampling is by a hash of the entity id, so the same entities are logged at every time step
+    and in every run.
+    """
+
+    def __init__(self, global_config: GlobalConfig):
+        self.interval_steps = max(global_config.log_states_interval_steps, 1)
+        self.sample_ratio = global_config.log_states_sample_ratio
+        self.changes_only = global_config.log_states_changes_only
+
+        self._steps = 0
+        self._sampled: Dict[EntityId, bool] = {}
+        self._last_logged: Dict[ReportType, Dict[EntityId, Tuple[Any, dict]]] = {}
+
+    def next_step(self) -> bool:
+        """
+        advances the selector by one time step
+
+        :return: True if entity states are logged at this time step
+        """
+        log_step = self._steps % self.interval_steps == 0
+        self._steps += 1
+        return log_step
+
+    def records(
+        self, report_type: ReportType, entities: Iterable[Any], asdict: Callable[[Any], dict]
+    ) -> Iterator[dict]:
+        """
+        builds the records of the selected entities
+
+        :param report_type: the type of state report
+        :param entities: the entities of the simulation
+        :param asdict: builds the record of an entity
+        :return: the records to log, which may be modified by the caller
+        """
+        last_logged = self._last_logged.setdefault(report_type, {})
+        for entity in entities:
+            if self.sample_ratio < 1.0 and not self._is_sampled(entity.id):
+                continue
+            elif not self.changes_only:
+                yield asdict(entity)
+                continue
+
+            # entities are immutable, so an entity which was not replaced has not changed
+            last = last_logged.get(entity.id)
+            if last is not None and last[0] is entity:
+                continue
+            record = asdict(entity)
+            if last is not None and last[1] == record:
+                last_logged[entity.id] = (entity, last[1])
+                continue
+            last_logged[entity.id] = (entity, record)
+            yield dict(record)
+
+    def _is_sampled(self, entity_id: EntityId) -> bool:
+        sampled = self._sampled.get(entity_id)
+        if sampled is None:
+            sampled = zlib.crc32(entity_id.encode()) < self.sample_ratio * 2**32
+            self._sampled[entity_id] = sampled
+        return sampled
 
 
 class StatefulHandler(Handler):
@@ -19,26 +89,48 @@ class StatefulHandler(Handler):
 
     def __init__(self, global_config: GlobalConfig, scenario_output_directory: Path):
         log_path = scenario_output_directory / "state.log"
-        self.log_file = open(log_path, "a")
+        self.log_writer = build_log_writer(global_config, log_path)
 
         self.global_config = global_config
+        self.selector = StateLogSelector(global_config)
+        # state log entries waiting for the next flush
+        self.entries: List[dict] = []
 
     def handle(self, reports: List[Report], runner_payload: RunnerPayload):
+        """
+        writes the states reported since the last flush to state.log.
+
+        :param reports: ignored
+
+        :param runner_payload: ignored
+        """
+        entries, self.entries = self.entries, []
+        self.log_writer.write(entries)
+
+    def buffered_count(self) -> int:
+        return len(self.entries)
+
+    def step(self, reports: List[Report], runner_payload: RunnerPayload):
         """
         reports the driver, vehicle and station state at the current time for all
-        entities, written to state.log.
+        entities, to be written to state.log at the next flush.
 
         :param reports: ignored
 
         :param runner_payload: provides the current simulation state
         """
+        if not self.selector.next_step():
+            return
+
         sim_state = runner_payload.s
+        entries = self.entries
         if ReportType.DRIVER_STATE in self.global_config.log_sim_config:
             self._report_entities(
                 entities=sim_state.vehicles.values(),
                 asdict=self.driver_asdict,
                 sim_time=sim_state.sim_time,
                 report_type=ReportType.DRIVER_STATE,
+                entries=entries,
             )
 
         if ReportType.VEHICLE_STATE in self.global_config.log_sim_config:
@@ -47,6 +139,7 @@ class StatefulHandler(Handler):
                 asdict=self.vehicle_asdict,
                 sim_time=sim_state.sim_time,
                 report_type=ReportType.VEHICLE_STATE,
+                entries=entries,
             )
 
         if ReportType.STATION_STATE in self.global_config.log_sim_config:
@@ -55,10 +148,15 @@ class StatefulHandler(Handler):
                 asdict=self.station_asdict,
                 sim_time=sim_state.sim_time,
                 report_type=ReportType.STATION_STATE,
+                entries=entries,
             )
 
+    def report_types(self) -> FrozenSet[ReportType]:
+        # entity states are read from the simulation state
+        return frozenset()
+
     def close(self, runner_payload: RunnerPayload):
-        self.log_file.close()
+        self.log_writer.close()
 
     @staticmethod
     def driver_asdict(vehicle: Vehicle) -> dict:
@@ -120,10 +218,8 @@ class StatefulHandler(Handler):
 
         return out_dict
 
-    def _report_entities(self, entities, asdict, sim_time, report_type):
-        for e in entities:
-            log_dict = asdict(e)
+    def _report_entities(self, entities, asdict, sim_time, report_type, entries):
+        for log_dict in self.selector.records(report_type, entities, asdict):
             log_dict["sim_time"] = str(sim_time)
             log_dict["report_type"] = report_type.name
-            entry = json.dumps(log_dict, default=str)
-            self.log_file.write(entry + "\n")
+            entries.append(log_dict)
@@ -4,7 +4,7 @@ import json
 import logging
 from collections import Counter
 from pathlib import Path
-from typing import TYPE_CHECKING, List, Dict
+from typing import TYPE_CHECKING, Dict, FrozenSet, List
 
 from nrel.hive.reporting.handler.handler import Handler
 from nrel.hive.reporting.handler.summary_stats import SummaryStats
@@ -35,7 +35,7 @@ class StatsHandler(Handler):
 
     def handle(self, reports: List[Report], runner_payload: RunnerPayload):
         """
-        called at each log step.
+        called at each log flush.
 
 
         :param reports:
@@ -44,6 +44,27 @@ class StatsHandler(Handler):
         :return:
         """
 
+        # capture the distance traveled in move states, and count any requests and cancelled
+        # requests
+        for report in reports:
+            if report.report_type == ReportType.VEHICLE_MOVE_EVENT:
+                self.stats.vkt[report.report["vehicle_state"]] += report.report["distance_km"]
+            elif report.report_type == ReportType.ADD_REQUEST_EVENT:
+                self.stats.requests += 1
+            elif report.report_type == ReportType.CANCEL_REQUEST_EVENT:
+                self.stats.cancelled_requests += 1
+
+    def step(self, reports: List[Report], runner_payload: RunnerPayload):
+        """
+        called at each time step.
+
+
+        :param reports: ignored
+
+        :param runner_payload
+        :return:
+        """
+
         # update the proportion of time spent by vehicles in each vehicle state
         sim_state = runner_payload.s
         state_counts = Counter(
@@ -54,20 +75,14 @@ class StatsHandler(Handler):
         )
         self.stats.state_count += state_counts
 
-        # capture the distance traveled in move states
-        move_events = list(
-            filter(
-                lambda r: r.report_type == ReportType.VEHICLE_MOVE_EVENT,
-                reports,
-            )
+    def report_types(self) -> FrozenSet[ReportType]:
+        return frozenset(
+            {
+                ReportType.VEHICLE_MOVE_EVENT,
+                ReportType.ADD_REQUEST_EVENT,
+                ReportType.CANCEL_REQUEST_EVENT,
+            }
         )
-        for me in move_events:
-            self.stats.vkt[me.report["vehicle_state"]] += me.report["distance_km"]
-
-        # count any requests and cancelled requests
-        c = Counter(map(lambda r: r.report_type, reports))
-        self.stats.requests += c[ReportType.ADD_REQUEST_EVENT]
-        self.stats.cancelled_requests += c[ReportType.CANCEL_REQUEST_EVENT]
 
     def close(self, runner_payload: RunnerPayload):
         """
@@ -2,28 +2,86 @@ from __future__ import annotations
 
 import logging
 import os
-from collections import Counter
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 from immutables import Map
 from pandas import DataFrame
 
+from nrel.hive.model.sim_time import SimTime
 from nrel.hive.reporting.handler.handler import Handler
 from nrel.hive.reporting.report_type import ReportType
 from nrel.hive.state.vehicle_state.vehicle_state_type import VehicleStateType
 
 if TYPE_CHECKING:
     from nrel.hive.config import HiveConfig
-    from nrel.hive.model.vehicle.vehicle import Vehicle
     from nrel.hive.runner.runner_payload import RunnerPayload
     from nrel.hive.reporting.reporter import Report
-    from nrel.hive.util.typealiases import MembershipId
+    from nrel.hive.util.typealiases import ChargerId, MembershipId
 
 log = logging.getLogger(__name__)
 
+# the count columns which precede the vehicle state counts
+ASSIGNED, ACTIVE, CANCELED, SERVICING, VEHICLES = range(5)
+
+
+class _StatsBuffer:
+    """
+    time step stats rows stored column-wise in numpy arrays preallocated for the expected
+    number of time steps. the arrays double in length if the simulation runs longer.
+    """
+
+    def __init__(self, count_columns: Tuple[str, ...], capacity: int):
+        self.count_columns = count_columns
+        self.time_steps = np.zeros(capacity, dtype=np.int64)
+        self.sim_times = np.zeros(capacity, dtype=np.int64)
+        self.avg_soc_percent = np.full(capacity, np.nan)
+        self.vkt = np.zeros(capacity)
+        self.counts = np.zeros((capacity, len(count_columns)), dtype=np.int64)
+        self.n_rows = 0
+
+    def append(
+        self,
+        time_step: int,
+        sim_time: SimTime,
+        avg_soc_percent: Optional[float],
+        vkt: float,
+        counts: List[int],
+    ):
+        if self.n_rows == len(self.time_steps):
+            self._grow()
+        i = self.n_rows
+        self.time_steps[i] = time_step
+        self.sim_times[i] = sim_time
+        if avg_soc_percent is not None:
+            self.avg_soc_percent[i] = avg_soc_percent
+        self.vkt[i] = vkt
+        self.counts[i] = counts
+        self.n_rows += 1
+
+    def to_dataframe(self) -> DataFrame:
+        n = self.n_rows
+        data: Dict[str, Any] = {
+            "time_step": self.time_steps[:n],
+            "sim_time": [SimTime(int(t)).as_iso_time() for t in self.sim_times[:n]],
+            "avg_soc_percent": self.avg_soc_percent[:n],
+            "vkt": self.vkt[:n],
+        }
+        for i, column in enumerate(self.count_columns):
+            data[column] = self.counts[:n, i]
+        return DataFrame(data)
+
+    def _grow(self):
+        self.time_steps = np.concatenate([self.time_steps, np.zeros_like(self.time_steps)])
+        self.sim_times = np.concatenate([self.sim_times, np.zeros_like(self.sim_times)])
+        self.avg_soc_percent = np.concatenate(
+            [self.avg_soc_percent, np.full_like(self.avg_soc_percent, np.nan)]
+        )
+        self.vkt = np.concatenate([self.vkt, np.zeros_like(self.vkt)])
+        self.counts = np.concatenate([self.counts, np.zeros_like(self.counts)])
+
 
 class TimeStepStatsHandler(Handler):
     def __init__(
@@ -37,31 +95,43 @@ class TimeStepStatsHandler(Handler):
 
         self.start_time = config.sim.start_time
         self.timestep_duration_seconds = config.sim.timestep_duration_seconds
+        self.expected_time_steps = (
+            max(int((config.sim.end_time - self.start_time) / self.timestep_duration_seconds), 0)
+            + 1
+        )
 
         self.vehicle_state_names = tuple(vs.name for vs in VehicleStateType)
+        self._state_columns = {vs: VEHICLES + 1 + i for i, vs in enumerate(VehicleStateType)}
+        self._driver_columns = {
+            True: VEHICLES + 1 + len(self.vehicle_state_names),
+            False: VEHICLES + 2 + len(self.vehicle_state_names),
+        }
 
-        if config.global_config.log_time_step_stats:
-            self.log_time_step_stats = True
-            self.data: List[Dict[str, Any]] = []
+        self.log_time_step_stats = config.global_config.log_time_step_stats
+        if self.log_time_step_stats:
             self.time_step_stats_outpath = scenario_output_directory.joinpath(
                 f"{file_name}_all.csv"
             )
-        else:
-            self.log_time_step_stats = False
 
+        # stats are gathered for all vehicles (group 0) and for each fleet (groups 1 and up)
+        self.fleet_names: Tuple[str, ...] = ()
         if config.global_config.log_fleet_time_step_stats and len(fleet_ids) > 0:
             self.log_fleet_time_step_stats = True
             self.fleets_timestep_stats_outpath = scenario_output_directory.joinpath(
                 "fleet_time_step_stats/"
             )
-            self.fleets_data: Dict[str, List[Dict[str, Any]]] = {}
-            for fleet_id in fleet_ids:
-                if fleet_id is None:
-                    self.fleets_data["none"] = []
-                else:
-                    self.fleets_data[fleet_id] = []
+            self.fleet_names = tuple("none" if f is None else f for f in fleet_ids)
         else:
             self.log_fleet_time_step_stats = False
+        self._fleet_groups = {f: i for i, f in enumerate(self.fleet_names, 1) if f != "none"}
+        self._none_group = (
+            self.fleet_names.index("none") + 1 if "none" in self.fleet_names else None
+        )
+        self._groups_by_membership: Dict[Optional[FrozenSet[MembershipId]], Tuple[int, ...]] = {}
+
+        # built on the first time step, once the chargers are known
+        self._charger_columns: Dict[ChargerId, int] = {}
+        self._buffers: List[_StatsBuffer] = []
 
     def get_time_step_stats(self) -> Optional[DataFrame]:
         """
@@ -71,8 +141,10 @@ class TimeStepStatsHandler(Handler):
         """
         if not self.log_time_step_stats:
             return None
+        elif len(self._buffers) == 0:
+            return DataFrame()
 
-        return DataFrame(self.data)
+        return self._buffers[0].to_dataframe()
 
     def get_fleet_time_step_stats(
         self,
@@ -84,15 +156,23 @@ class TimeStepStatsHandler(Handler):
         """
         result = Map(
             {
-                fleet_id: DataFrame(data) if len(data) > 0 else None
-                for fleet_id, data in self.fleets_data.items()
+                fleet_id: self._buffers[i].to_dataframe()
+                if len(self._buffers) > 0 and self._buffers[i].n_rows > 0
+                else None
+                for i, fleet_id in enumerate(self.fleet_names, 1)
             }
         )
         return result
 
     def handle(self, reports: List[Report], runner_payload: RunnerPayload):
         """
-        called at each log step. aggregates various statistics to the time bin level
+        statistics are aggregated at each time step, so there is nothing to do at a log flush
+        """
+
+    def step(self, reports: List[Report], runner_payload: RunnerPayload):
+        """
+        called at each time step. aggregates various statistics to the time bin level, for all
+        vehicles and for each fleet, in one pass over the vehicles and the reports.
 
         :param reports: reports for gathering statistics
 
@@ -103,6 +183,9 @@ class TimeStepStatsHandler(Handler):
         sim_state = runner_payload.s
         env = runner_payload.e
 
+        if len(self._buffers) == 0:
+            self._build_buffers(env.chargers.keys())
+
         # get the time step
         sim_time = sim_state.sim_time
         time_step = int(
@@ -110,262 +193,116 @@ class TimeStepStatsHandler(Handler):
             / self.timestep_duration_seconds
         )
 
-        # sort reports by type
-        reports_by_type: Dict[ReportType, List[Report]] = {}
+        n_groups = len(self._buffers)
+        counts = [[0] * len(self._buffers[0].count_columns) for _ in range(n_groups)]
+        socs: List[List[float]] = [[] for _ in range(n_groups)]
+        vkt = [0.0] * n_groups
+
+        # count vehicles by state, driver availability and requests in service for each group
+        for v in sim_state.vehicles.values():
+            vehicle_state = v.vehicle_state
+            state_type = vehicle_state.vehicle_state_type
+            state_column = self._state_columns[state_type]
+            driver_column = self._driver_columns[v.driver_state.available]
+            if state_type == VehicleStateType.SERVICING_TRIP:
+                servicing, assigned = 1, 0
+            elif state_type == VehicleStateType.SERVICING_POOLING_TRIP:
+                servicing, assigned = len(vehicle_state.boarded_requests), 0  # type: ignore
+            elif state_type == VehicleStateType.DISPATCH_TRIP:
+                servicing, assigned = 0, 1
+            elif state_type == VehicleStateType.DISPATCH_POOLING_TRIP:
+                servicing, assigned = 0, len(vehicle_state.trip_plan)  # type: ignore
+            else:
+                servicing, assigned = 0, 0
+            soc = env.mechatronics[v.mechatronics_id].fuel_source_soc(v)
+
+            for group in self._groups(v.membership.memberships, env.fleet_ids):
+                row = counts[group]
+                row[VEHICLES] += 1
+                row[state_column] += 1
+                row[driver_column] += 1
+                row[SERVICING] += servicing
+                row[ASSIGNED] += assigned
+                socs[group].append(soc)
+
+        # sum vkt and count chargers in use by type for each group
+        canceled_requests_count = 0
         for report in reports:
-            if report.report_type not in reports_by_type.keys():
-                reports_by_type[report.report_type] = []
-            reports_by_type[report.report_type].append(report)
-
-        # get number of assigned requests in this time step
-        assigned_requests_count = len(
-            sim_state.get_requests(filter_function=lambda r: r.dispatched_vehicle is not None)
+            if report.report_type == ReportType.CANCEL_REQUEST_EVENT:
+                canceled_requests_count += 1
+            elif report.report_type == ReportType.VEHICLE_MOVE_EVENT:
+                distance_km = float(report.report["distance_km"])
+                for group in self._groups(report.report["vehicle_memberships"], env.fleet_ids):
+                    vkt[group] += distance_km
+            elif report.report_type == ReportType.VEHICLE_CHARGE_EVENT:
+                charger_column = self._charger_columns.get(report.report["charger_id"])
+                if charger_column is not None:
+                    for group in self._groups(report.report["vehicle_memberships"], env.fleet_ids):
+                        counts[group][charger_column] += 1
+
+        # get number of assigned and active (unassigned) requests in this time step
+        assigned_requests_count = 0
+        for request in sim_state.requests.values():
+            if request.dispatched_vehicle is not None:
+                assigned_requests_count += 1
+        active_requests_count = len(sim_state.requests) - assigned_requests_count
+
+        # the overall assigned request count includes requests not yet picked up by a vehicle
+        counts[0][ASSIGNED] = assigned_requests_count
+        for group, row in enumerate(counts):
+            row[ACTIVE] = active_requests_count
+            row[CANCELED] = canceled_requests_count
+            if group == 0 and not self.log_time_step_stats:
+                continue
+            avg_soc_percent = float(100 * np.mean(socs[group])) if len(socs[group]) > 0 else None
+            self._buffers[group].append(time_step, sim_time, avg_soc_percent, vkt[group], row)
+
+    def _build_buffers(self, charger_ids: Iterable[ChargerId]):
+        charger_ids = tuple(charger_ids)
+        count_columns = (
+            "assigned_requests",
+            "active_requests",
+            "canceled_requests",
+            "servicing_requests",
+            "vehicles",
+            *(f"vehicles_{state.lower()}" for state in self.vehicle_state_names),
+            "drivers_available",
+            "drivers_unavailable",
+            *(f"charger_{charger.lower()}" for charger in charger_ids),
         )
-
-        # get number of active requests in this time step (unassigned)
-        active_requests_count = len(sim_state.get_requests()) - assigned_requests_count
-
-        # get number of canceled requests in this time step
-        if ReportType.CANCEL_REQUEST_EVENT in reports_by_type.keys():
-            canceled_requests_count = len(reports_by_type[ReportType.CANCEL_REQUEST_EVENT])
-        else:
-            canceled_requests_count = 0
-
-        if self.log_time_step_stats:
-            # grab all vehicles that are pooling
-            veh_pooling = sim_state.get_vehicles(
-                filter_function=lambda v: v.vehicle_state.vehicle_state_type
-                == VehicleStateType.SERVICING_POOLING_TRIP
-            )
-
-            # count the number of vehicles in each vehicle state
-            veh_state_counts = Counter(
-                map(
-                    lambda v: v.vehicle_state.vehicle_state_type.name,
-                    sim_state.get_vehicles(),
-                )
-            )
-
-            stats_row = {
-                "time_step": time_step,
-                "sim_time": sim_time.as_iso_time(),
+        first_charger_column = len(count_columns) - len(charger_ids)
+        self._charger_columns = {c: first_charger_column + i for i, c in enumerate(charger_ids)}
+        self._buffers = [
+            _StatsBuffer(count_columns, self.expected_time_steps)
+            for _ in range(len(self.fleet_names) + 1)
+        ]
+
+    def _groups(
+        self,
+        memberships: Optional[Iterable[MembershipId]],
+        fleet_ids: FrozenSet[Optional[MembershipId]],
+    ) -> Tuple[int, ...]:
+        """
+        the stats groups which a vehicle or vehicle report with these memberships counts towards
+        """
+        key = None if memberships is None else frozenset(memberships)
+        groups = self._groups_by_membership.get(key)
+        if groups is None:
+            member_of = frozenset() if key is None else key
+            groups = (0, *(self._fleet_groups[m] for m in member_of if m in self._fleet_groups))
+            if self._none_group is not None and member_of.isdisjoint(fleet_ids):
+                groups = groups + (self._none_group,)
+            self._groups_by_membership[key] = groups
+        return groups
+
+    def report_types(self) -> FrozenSet[ReportType]:
+        return frozenset(
+            {
+                ReportType.CANCEL_REQUEST_EVENT,
+                ReportType.VEHICLE_MOVE_EVENT,
+                ReportType.VEHICLE_CHARGE_EVENT,
             }
-
-            # get average SOC of vehicles
-            if len(sim_state.get_vehicles()) > 0:
-                stats_row["avg_soc_percent"] = 100 * np.mean(
-                    [
-                        env.mechatronics[v.mechatronics_id].fuel_source_soc(v)
-                        for v in sim_state.get_vehicles()
-                    ]
-                )
-            else:
-                stats_row["avg_soc_percent"] = None
-
-            # get the total vkt
-            if ReportType.VEHICLE_MOVE_EVENT in reports_by_type.keys():
-                stats_row["vkt"] = sum(
-                    [
-                        float(me.report["distance_km"])
-                        for me in reports_by_type[ReportType.VEHICLE_MOVE_EVENT]
-                    ]
-                )
-            else:
-                stats_row["vkt"] = 0
-
-            # add assigned request count
-            stats_row["assigned_requests"] = assigned_requests_count
-
-            # get number of active requests in this time step (unassigned)
-            stats_row["active_requests"] = active_requests_count
-
-            # get number of canceled requests in this time step
-            stats_row["canceled_requests"] = canceled_requests_count
-
-            # get count of requests currently being serviced by a vehicle
-            pooling_request_count = sum(
-                [len(v.vehicle_state.boarded_requests) for v in veh_pooling]  # type: ignore
-            )
-            stats_row["servicing_requests"] = (
-                veh_state_counts[VehicleStateType.SERVICING_TRIP.name] + pooling_request_count
-            )
-
-            # add the number of vehicles in each vehicle state
-            stats_row["vehicles"] = len(sim_state.vehicles)
-            for state in self.vehicle_state_names:
-                stats_row[f"vehicles_{state.lower()}"] = veh_state_counts[state]
-
-            available_driver_counts = Counter(
-                map(
-                    lambda v: v.driver_state.available,
-                    sim_state.get_vehicles(),
-                )
-            )
-            stats_row["drivers_available"] = available_driver_counts[True]
-            stats_row["drivers_unavailable"] = available_driver_counts[False]
-
-            # count number of chargers in use by type
-            if ReportType.VEHICLE_CHARGE_EVENT in reports_by_type.keys():
-                charger_counts = Counter(
-                    map(
-                        lambda r: r.report["charger_id"],
-                        reports_by_type[ReportType.VEHICLE_CHARGE_EVENT],
-                    )
-                )
-                for charger in env.chargers.keys():
-                    stats_row[f"charger_{charger.lower()}"] = charger_counts[charger]
-            else:
-                for charger in env.chargers.keys():
-                    stats_row[f"charger_{charger.lower()}"] = 0
-
-            # append the statistics row to the data list
-            self.data.append(stats_row)
-
-        if self.log_fleet_time_step_stats:
-            for fleet_id in self.fleets_data.keys():
-
-                def _get_veh_filter_func(
-                    membership_id: MembershipId,
-                ) -> Callable[[Vehicle], bool]:
-                    if membership_id == "none":
-                        return lambda v: not any(set(env.fleet_ids) & set(v.membership.memberships))
-                    else:
-                        return lambda v: fleet_id in v.membership.memberships
-
-                def _get_report_filter_func(
-                    membership_id: MembershipId,
-                ) -> Callable[[Report], bool]:
-                    if membership_id == "none":
-                        return lambda r: not any(
-                            set(env.fleet_ids) & set(r.report["vehicle_memberships"])
-                        )
-                    else:
-                        return lambda r: fleet_id in r.report["vehicle_memberships"]
-
-                # get vehicles in this fleet
-                veh_in_fleet = sim_state.get_vehicles(
-                    filter_function=_get_veh_filter_func(fleet_id)
-                )
-
-                # get vehicle reports in this fleet
-                requests_in_fleet = {}
-                for report_type in reports_by_type:
-                    if report_type in (
-                        ReportType.VEHICLE_MOVE_EVENT,
-                        ReportType.VEHICLE_CHARGE_EVENT,
-                    ):
-                        requests_in_fleet[report_type] = list(
-                            filter(
-                                _get_report_filter_func(fleet_id),
-                                reports_by_type[report_type],
-                            )
-                        )
-
-                # get vehicles pooling in this fleet
-                veh_pooling_in_fleet = list(
-                    filter(
-                        lambda v: v.vehicle_state.vehicle_state_type
-                        == VehicleStateType.SERVICING_POOLING_TRIP,
-                        veh_in_fleet,
-                    )
-                )
-
-                # get vehicles dispatched to service pooling trips in this fleet
-                veh_dispatch_pooling_in_fleet = list(
-                    filter(
-                        lambda v: v.vehicle_state.vehicle_state_type
-                        == VehicleStateType.DISPATCH_POOLING_TRIP,
-                        veh_in_fleet,
-                    )
-                )
-
-                # count the number of vehicles in each vehicle state in this fleet
-                veh_state_counts_in_fleet = Counter(
-                    map(
-                        lambda v: v.vehicle_state.vehicle_state_type.name,
-                        veh_in_fleet,
-                    )
-                )
-
-                # create stats row with the time step
-                fleet_stats_row = {
-                    "time_step": time_step,
-                    "sim_time": sim_time.as_iso_time(),
-                }
-
-                # get average SOC of vehicles in this fleet
-                if len(veh_in_fleet) > 0:
-                    fleet_stats_row["avg_soc_percent"] = 100 * np.mean(
-                        [
-                            env.mechatronics[v.mechatronics_id].fuel_source_soc(v)
-                            for v in veh_in_fleet
-                        ]
-                    )
-                else:
-                    fleet_stats_row["avg_soc_percent"] = None
-
-                # get the total vkt of vehicles in this fleet
-                if ReportType.VEHICLE_MOVE_EVENT in requests_in_fleet.keys():
-                    fleet_stats_row["vkt"] = sum(
-                        [
-                            float(me.report["distance_km"])
-                            for me in requests_in_fleet[ReportType.VEHICLE_MOVE_EVENT]
-                        ]
-                    )
-                else:
-                    fleet_stats_row["vkt"] = 0
-
-                # get number of assigned requests in this fleet
-                assigned_requests = veh_state_counts_in_fleet[VehicleStateType.DISPATCH_TRIP.name]
-                assigned_pooling_requests = sum(
-                    [len(v.vehicle_state.trip_plan) for v in veh_dispatch_pooling_in_fleet]  # type: ignore
-                )
-                fleet_stats_row["assigned_requests"] = assigned_requests + assigned_pooling_requests
-
-                # add number of active requests in this time step (unassigned)
-                fleet_stats_row["active_requests"] = active_requests_count
-
-                # add number of canceled requests in this time step
-                fleet_stats_row["canceled_requests"] = canceled_requests_count
-
-                # get count of requests currently being serviced by a vehicle
-                servicing_requests = veh_state_counts_in_fleet[VehicleStateType.SERVICING_TRIP.name]
-                servicing_pooling_requests = sum(
-                    [len(v.vehicle_state.boarded_requests) for v in veh_pooling_in_fleet]  # type: ignore
-                )
-                fleet_stats_row["servicing_requests"] = (
-                    servicing_requests + servicing_pooling_requests
-                )
-
-                # add the number of vehicles in each vehicle state in this fleet
-                fleet_stats_row["vehicles"] = len(veh_in_fleet)
-                for state in self.vehicle_state_names:
-                    fleet_stats_row[f"vehicles_{state.lower()}"] = veh_state_counts_in_fleet[state]
-
-                available_driver_counts_in_fleet = Counter(
-                    map(lambda v: v.driver_state.available, veh_in_fleet)
-                )
-                fleet_stats_row["drivers_available"] = available_driver_counts_in_fleet[True]
-                fleet_stats_row["drivers_unavailable"] = available_driver_counts_in_fleet[False]
-
-                # count number of chargers in use by type
-                if ReportType.VEHICLE_CHARGE_EVENT in requests_in_fleet.keys():
-                    charger_counts_in_fleet = Counter(
-                        map(
-                            lambda r: r.report["charger_id"],
-                            requests_in_fleet[ReportType.VEHICLE_CHARGE_EVENT],
-                        )
-                    )
-                    for charger in env.chargers.keys():
-                        fleet_stats_row[f"charger_{charger.lower()}"] = charger_counts_in_fleet[
-                            charger
-                        ]
-                else:
-                    for charger in env.chargers.keys():
-                        fleet_stats_row[f"charger_{charger.lower()}"] = 0
-
-                # append the statistics row to the fleet's data list
-                self.fleets_data[fleet_id].append(fleet_stats_row)
+        )
 
     def close(self, runner_payload: RunnerPayload):
         """
@@ -1,4 +1,4 @@
-from typing import List, Dict
+from typing import Dict, FrozenSet, List
 
 import pandas as pd
 
@@ -26,17 +26,16 @@ class VehicleChargeEventsHandler(Handler):
 
     def handle(self, reports: List[Report], runner_payload: RunnerPayload):
         for report in reports:
-            if report.report_type == ReportType.VEHICLE_CHARGE_EVENT:
-                try:
-                    self.events["vehicle_id"].append(report.report["vehicle_id"])
-                    self.events["sim_time_start"].append(report.report["sim_time_start"])
-                    self.events["sim_time_end"].append(report.report["sim_time_end"])
-                    self.events["energy"].append(report.report["energy"])
-                    self.events["units"].append(report.report["energy_units"])
-                except KeyError as e:
-                    raise SimulationStateError(
-                        f"unable to parse charge event from report {report}, missing entry for {e}"
-                    )
+            try:
+                self.events["vehicle_id"].append(report.report["vehicle_id"])
+                self.events["sim_time_start"].append(report.report["sim_time_start"])
+                self.events["sim_time_end"].append(report.report["sim_time_end"])
+                self.events["energy"].append(report.report["energy"])
+                self.events["units"].append(report.report["energy_units"])
+            except KeyError as e:
+                raise SimulationStateError(
+                    f"unable to parse charge event from report {report}, missing entry for {e}"
+                )
 
     def get_events(self):
         """
@@ -53,5 +52,8 @@ class VehicleChargeEventsHandler(Handler):
         """
         self.events = self.prototype.copy()
 
+    def report_types(self) -> FrozenSet[ReportType]:
+        return frozenset({ReportType.VEHICLE_CHARGE_EVENT})
+
     def close(self, runner_payload: RunnerPayload):
         pass
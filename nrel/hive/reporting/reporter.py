@@ -1,10 +1,24 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Dict, NamedTuple, Optional, Tuple
+import functools
+from datetime import timedelta
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
 
 from immutables import Map
 from pandas import DataFrame
 
+from nrel.hive.model.sim_time import SimTime
+from nrel.hive.reporting.handler.handler import Handler
 from nrel.hive.reporting.handler.stats_handler import StatsHandler
 from nrel.hive.reporting.handler.time_step_stats_handler import TimeStepStatsHandler
 from nrel.hive.reporting.report_type import ReportType
@@ -12,15 +26,60 @@ from nrel.hive.reporting.report_type import ReportType
 if TYPE_CHECKING:
     from nrel.hive.model.membership import MembershipId
     from nrel.hive.runner.runner_payload import RunnerPayload
-    from nrel.hive.reporting.handler.handler import Handler
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+@functools.lru_cache(maxsize=4096)
+def _encode_sim_time(sim_time: SimTime) -> str:
+    # reports filed in the same time step share their times
+    return sim_time.as_iso_time()
+
+
+# encoders for report values by type. json types are kept as they are and any other type is
+# written as a string.
+_VALUE_ENCODERS: Dict[type, Callable[[Any], Any]] = {
+    str: _identity,
+    int: _identity,
+    float: _identity,
+    bool: _identity,
+    type(None): _identity,
+    list: lambda v: [encode_value(x) for x in v],
+    tuple: lambda v: [encode_value(x) for x in v],
+    timedelta: str,
+    SimTime: _encode_sim_time,
+}
+
+
+def encode_value(value: Any) -> Any:
+    """
+    encodes a report value as a json type, keeping numbers and bools native
+
+    :param value: a report value
+    :return: the value, or its string representation if it is not a json type
+    """
+    return _VALUE_ENCODERS.get(type(value), str)(value)
 
 
 class Report(NamedTuple):
     report_type: ReportType
-    report: Dict[str, str]
+    report: Dict[str, Any]
+
+    def as_json(self, typed: bool = False) -> Dict[str, Any]:
+        """
+        converts this report to a json object
 
-    def as_json(self) -> Dict[str, str]:
-        out = {str(k): str(v) for k, v in self.report.items()}
+        :param typed: if True, numbers, bools, nulls and lists keep their json types. otherwise,
+                      every value is written as a string
+        :return: the report as a json object
+        """
+        if typed:
+            encoders = _VALUE_ENCODERS
+            out = {k: encoders.get(type(v), str)(v) for k, v in self.report.items()}
+        else:
+            out = {str(k): str(v) for k, v in self.report.items()}
         out["report_type"] = self.report_type.name.lower()
         return out
 
@@ -28,27 +87,131 @@ class Report(NamedTuple):
 class Reporter:
     """
     A class that generates reports for the simulation.
+
+    :param flush_interval_steps: reports are buffered and passed to the handlers every this
+                                 many time steps
+    :param max_buffered_reports: reports are flushed early, at the end of a time step, once more
+                                 than this many are buffered, counting the entries buffered by
+                                 handlers; 0 for no limit
+
+    callers which advance the simulation should call step at each time step. a caller which only
+    calls flush, once per time step, gets the same logs, since each flush then runs the per-step
+    hooks of the handlers first.
     """
 
-    def __init__(self):
-        self.reports = []
-        self.handlers = []
+    def __init__(self, flush_interval_steps: int = 1, max_buffered_reports: int = 0):
+        self.flush_interval_steps = max(flush_interval_steps, 1)
+        self.max_buffered_reports = max_buffered_reports
+        self.reports: List[Report] = []
+        self.handlers: List[Handler] = []
+        self.wanted_report_types: FrozenSet[ReportType] = frozenset()
+        self._steps_since_flush = 0
+        # set once step is called; until then, each flush is treated as one time step
+        self._stepping = False
+
+        # the report types read by each handler
+        self._subscriptions: List[FrozenSet[ReportType]] = []
+        # the reports filed for each subscription, shared by handlers with the same subscription
+        self._buckets: Dict[FrozenSet[ReportType], List[Report]] = {}
+        # the buckets which receive each report type
+        self._routes: Dict[ReportType, Tuple[List[Report], ...]] = {}
+        # the handlers with a per-step hook, and where this step's reports start in their bucket
+        self._stepped_handlers: List[int] = []
+        self._step_offsets: List[int] = []
 
     def add_handler(self, handler: Handler):
+        subscription = handler.report_types()
         self.handlers.append(handler)
+        self._subscriptions.append(subscription)
+        self._step_offsets.append(0)
+        if type(handler).step is not Handler.step:
+            self._stepped_handlers.append(len(self.handlers) - 1)
+        self.wanted_report_types = self.wanted_report_types.union(subscription)
+        self._route_reports()
+
+    def _route_reports(self):
+        """
+        sets up a bucket of reports for each subscription when a handler is added. handlers
+        which read every wanted report type share the list of all filed reports instead. the
+        buckets are emptied at each flush and reused.
+        """
+        self._buckets = {
+            subscription: [r for r in self.reports if r.report_type in subscription]
+            for subscription in self._subscriptions
+            if not subscription.issuperset(self.wanted_report_types)
+        }
+        self._routes = {
+            report_type: tuple(
+                bucket
+                for subscription, bucket in self._buckets.items()
+                if report_type in subscription
+            )
+            for report_type in self.wanted_report_types
+        }
+        self._step_offsets = [0] * len(self.handlers)
+
+    def wants(self, report_type: ReportType) -> bool:
+        """
+        checks if any handler reads reports of this type. reports should only be built and
+        filed when they are wanted.
+
+        :param report_type: the type of report
+        :return: True if a handler reads this report type
+        """
+        return report_type in self.wanted_report_types
+
+    def step(self, runner_payload: RunnerPayload):
+        """
+        called at each sim step. handlers with a per-step hook are given the reports filed
+        during the step, and the buffered reports are flushed every flush_interval_steps
+        steps, or sooner once there are more than max_buffered_reports.
+
+
+        :param runner_payload: The runner payload.
+        :return: Does not return a value.
+        """
+        self._stepping = True
+        self._step_handlers(runner_payload)
+
+        self._steps_since_flush += 1
+        if self._steps_since_flush >= self.flush_interval_steps or (
+            0 < self.max_buffered_reports < self.buffered_count()
+        ):
+            self.flush(runner_payload)
+
+    def buffered_count(self) -> int:
+        """
+        :return: the number of reports and handler entries waiting for the next flush
+        """
+        return len(self.reports) + sum(handler.buffered_count() for handler in self.handlers)
+
+    def _step_handlers(self, runner_payload: RunnerPayload):
+        for i in self._stepped_handlers:
+            reports = self._buckets.get(self._subscriptions[i], self.reports)
+            self.handlers[i].step(reports[self._step_offsets[i] :], runner_payload)
+            self._step_offsets[i] = len(reports)
 
     def flush(self, runner_payload: RunnerPayload):
         """
-        called at each sim step.
+        passes the buffered reports to the handlers. each handler is given the reports of
+        the types it reads, in the order they were filed. if step has never been called, the
+        per-step hooks of the handlers are run first, so that each flush covers one time step.
 
 
         :param runner_payload: The runner payload.
         :return: Does not return a value.
         """
-        for handler in self.handlers:
-            handler.handle(self.reports, runner_payload)
+        if not self._stepping:
+            self._step_handlers(runner_payload)
+
+        for handler, subscription in zip(self.handlers, self._subscriptions):
+            handler.handle(self._buckets.get(subscription, self.reports), runner_payload)
 
-        self.reports = []
+        self.reports.clear()
+        for bucket in self._buckets.values():
+            bucket.clear()
+        self._step_offsets = [0] * len(self.handlers)
+        self._steps_since_flush = 0
 
     def file_report(self, report: Report):
         """
@@ -58,7 +221,11 @@ class Reporter:
         :param report:
         :return:
         """
-        self.reports.append(report)
+        buckets = self._routes.get(report.report_type)
+        if buckets is not None:
+            self.reports.append(report)
+            for bucket in buckets:
+                bucket.append(report)
 
     def get_summary_stats(self, rp: RunnerPayload) -> Optional[Dict]:
         """
@@ -87,9 +254,12 @@ class Reporter:
 
     def close(self, runner_payload: RunnerPayload):
         """
-        wrap up anything here. called at the end of the simulation
+        wrap up anything here. called at the end of the simulation, after flushing any
+        buffered reports
 
         :return:
         """
+        if self._steps_since_flush > 0 or len(self.reports) > 0:
+            self.flush(runner_payload)
         for handler in self.handlers:
             handler.close(runner_payload)
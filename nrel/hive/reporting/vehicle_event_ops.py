@@ -1,10 +1,9 @@
 from __future__ import annotations
 
 import functools as ft
-from typing import TYPE_CHECKING, Tuple, Set
+from typing import TYPE_CHECKING, Dict, Tuple
 
 import h3
-import immutables
 
 import nrel.hive.model.roadnetwork.route as route
 from nrel.hive.model.energy import Charger
@@ -60,7 +59,7 @@ def vehicle_move_event(
 
     geoid = next_vehicle.geoid
     lat, lon = h3.h3_to_geo(geoid)
-    geom = route.to_linestring(route_traversal.experienced_route, env)
+    geom = route.to_linestring(route_traversal.experienced_route, env, sim.road_network)
     report_data = {
         "sim_time_start": sim_time_start,
         "sim_time_end": sim_time_end,
@@ -228,80 +227,82 @@ def report_dropoff_request(vehicle: Vehicle, sim: SimulationState, request: Requ
     return report
 
 
-def construct_station_load_events(
-    reports: Tuple[Report, ...], sim: SimulationState
-) -> Tuple[Report, ...]:
+class StationLoadAccumulator:
     """
-    a station load report takes any vehicle charge events and attributes them to a
-    station, so that, for each time step, we report the load of energy use at the station
-
-    :param reports: the reports in this time step
-    :param sim: the simulation state
+    keeps running totals of the energy dispensed at each station over a time step, from vehicle
+    charge events as they are handled, and turns them into STATION_LOAD_EVENT reports. stations
+    without charge events are only reported every all_stations_interval_steps time steps, so
+    the cost of a time step follows the number of active chargers rather than stations.
 
-    :return: a collection with one STATION_LOAD_EVENT per StationId
+    :param all_stations_interval_steps: report every station, including those with no load,
+                                        every this many time steps; 0 never does
     """
-    sim_time_start = sim.sim_time - sim.sim_timestep_duration_seconds
-    sim_time_end = sim.sim_time
 
-    def _add(acc: immutables.Map, report: Report) -> immutables.Map:
-        """
-        if the report has charging information, then add it to the accumulator.
-        /
-        expects that all reports fall between the same range of [sim_time_start, sim_time_end]
+    def __init__(self, all_stations_interval_steps: int = 0):
+        self.all_stations_interval_steps = all_stations_interval_steps
+        self._loads: Dict[StationId, Tuple[float, str]] = {}
+        self._steps = 0
 
-        :param acc: a mapping from station to current load
-        :param report: a report of any type
-        :return: the updated accumulator
+    def add(self, report: Report):
         """
-        if report.report_type != ReportType.VEHICLE_CHARGE_EVENT:
-            return acc
-        else:
-            station_id = report.report["station_id"]
-            energy = float(report.report["energy"])
-            energy_units = report.report["energy_units"]
-            station_energy, _ = acc.get(station_id, (0.0, ""))
-            updated_energy = station_energy + energy
-            updated_acc = acc.update({station_id: (updated_energy, energy_units)})
-
-            return updated_acc
-
-    def _to_reports(acc: immutables.Map[StationId, Tuple[float, str]]) -> Tuple[Report, ...]:
+        adds the energy of a vehicle charge event to the load of its station
+
+        :param report: a VEHICLE_CHARGE_EVENT report
         """
-        transforms the accumulated values into Reports
-        :return: a collection of STATION_LOAD_EVENT reports
+        station_id = report.report["station_id"]
+        station_energy, _ = self._loads.get(station_id, (0.0, ""))
+        energy = station_energy + float(report.report["energy"])
+        self._loads[station_id] = (energy, report.report["energy_units"])
+
+    def station_load_events(self, sim: SimulationState) -> Tuple[Report, ...]:
         """
+        reports the station loads for the time step ending at the current sim time, and starts
+        a new time step
 
-        def _cast_as_report(station_id: StationId):
-            energy, energy_units = acc[station_id]
-            report = Report(
+        :param sim: the simulation state
+        :return: a STATION_LOAD_EVENT for each station with charge events, and for all other
+                 stations on every all_stations_interval_steps time step
+        """
+        loads, self._loads = self._loads, {}
+        if self.all_stations_interval_steps > 0:
+            if self._steps % self.all_stations_interval_steps == 0:
+                for station_id in sim.stations.keys():
+                    loads.setdefault(station_id, (0.0, ""))
+            self._steps += 1
+
+        sim_time_start = str(sim.sim_time - sim.sim_timestep_duration_seconds)
+        sim_time_end = str(sim.sim_time)
+        return tuple(
+            Report(
                 report_type=ReportType.STATION_LOAD_EVENT,
                 report={
                     "station_id": station_id,
-                    "sim_time_start": str(sim_time_start),
-                    "sim_time_end": str(sim_time_end),
+                    "sim_time_start": sim_time_start,
+                    "sim_time_end": sim_time_end,
                     "energy": str(energy),
                     "energy_units": energy_units,
                 },
             )
-            return report
-
-        these_reports: Tuple[Report, ...] = tuple(map(_cast_as_report, acc.keys()))
-        return these_reports
+            for station_id, (energy, energy_units) in loads.items()
+        )
 
-    # collect vehicle charge events
-    reported_charge_events_accumulator: immutables.Map[StationId, Tuple[float, str]] = ft.reduce(
-        _add, reports, immutables.Map()
-    )
 
-    # create entries for stations with no charge events reported
-    reported_stations: Set[StationId] = set(reported_charge_events_accumulator.keys())
-    unreported_station_ids: Set[StationId] = set(sim.stations.keys()).difference(reported_stations)
-    all_stations_accumulator = ft.reduce(
-        lambda acc, id: acc.update({id: (0.0, "")}),
-        unreported_station_ids,
-        reported_charge_events_accumulator,
-    )
+def construct_station_load_events(
+    reports: Tuple[Report, ...], sim: SimulationState, include_idle_stations: bool = True
+) -> Tuple[Report, ...]:
+    """
+    a station load report takes any vehicle charge events and attributes them to a
+    station, so that, for each time step, we report the load of energy use at the station
 
-    result = _to_reports(all_stations_accumulator)
+    :param reports: the reports in this time step
+    :param sim: the simulation state
+    :param include_idle_stations: if True, stations with no charge events are reported with
+                                  no load
 
-    return result
+    :return: a collection with one STATION_LOAD_EVENT per StationId
+    """
+    accumulator = StationLoadAccumulator(1 if include_idle_stations else 0)
+    for report in reports:
+        if report.report_type == ReportType.VEHICLE_CHARGE_EVENT:
+            accumulator.add(report)
+    return accumulator.station_load_events(sim)
@@ -135,7 +135,9 @@ def mock_network(h3_res: H3Resolution = 15, geofence_res: H3Resolution = 10) ->
     )
 
 
-def mock_osm_network(h3_res: H3Resolution = 15, geofence_res: H3Resolution = 10) -> OSMRoadNetwork:
+def mock_osm_network(
+    h3_res: H3Resolution = 15, geofence_res: H3Resolution = 10, simplify_graph: bool = False
+) -> OSMRoadNetwork:
     road_network_file = resource_filename(
         "nrel.hive.resources.scenarios.denver_downtown.road_network",
         "downtown_denver_network.json",
@@ -143,6 +145,7 @@ def mock_osm_network(h3_res: H3Resolution = 15, geofence_res: H3Resolution = 10)
     return OSMRoadNetwork.from_file(
         road_network_file=Path(road_network_file),
         sim_h3_resolution=h3_res,
+        simplify_graph=simplify_graph,
     )
 
 
@@ -64,7 +64,7 @@ def _run_step_in_context(env: Environment) -> Callable:
         # applies the most recent version of each update function
         updated_payload = payload.u.apply_update(payload)
 
-        env.reporter.flush(updated_payload)
+        env.reporter.step(updated_payload)
 
         return updated_payload
 
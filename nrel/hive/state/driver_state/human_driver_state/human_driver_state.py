@@ -9,6 +9,7 @@ from nrel.hive.dispatcher.instruction.instructions import (
     DispatchBaseInstruction,
     ReserveBaseInstruction,
 )
+from nrel.hive.reporting.report_type import ReportType
 from nrel.hive.reporting.driver_event_ops import (
     driver_schedule_event,
     ScheduleEventType,
@@ -131,8 +132,9 @@ class HumanAvailable(DriverState):
             return error, None
         else:
             # log transition
-            report = driver_schedule_event(sim, env, vehicle, ScheduleEventType.OFF)
-            env.reporter.file_report(report)
+            if env.reporter.wants(ReportType.DRIVER_SCHEDULE_EVENT):
+                report = driver_schedule_event(sim, env, vehicle, ScheduleEventType.OFF)
+                env.reporter.file_report(report)
 
             # transition to unavailable
             charge_params = HumanUnavailableChargeParameters.build(
@@ -281,8 +283,9 @@ class HumanUnavailable(DriverState):
             return error, None
         elif schedule_function and schedule_function(sim, self.attributes.vehicle_id):
             # log transition
-            report = driver_schedule_event(sim, env, vehicle, ScheduleEventType.ON)
-            env.reporter.file_report(report)
+            if env.reporter.wants(ReportType.DRIVER_SCHEDULE_EVENT):
+                report = driver_schedule_event(sim, env, vehicle, ScheduleEventType.ON)
+                env.reporter.file_report(report)
 
             # transition to available, because of one of these reasons:
             #   being unavailable but not having a schedule is invalid.
@@ -9,7 +9,7 @@ from nrel.hive.model.sim_time import SimTime
 from nrel.hive.util.dict_ops import DictOps
 from nrel.hive.util.exception import SimulationStateError
 from nrel.hive.util.fp import apply_op_to_accumulator, throw_or_return
-from nrel.hive.util.typealiases import RequestId, StationId, VehicleId, BaseId
+from nrel.hive.util.typealiases import RequestId, StationId, VehicleId, BaseId, EntityId, GeoId
 
 if TYPE_CHECKING:
     from nrel.hive.state.simulation_state.simulation_state import SimulationState
@@ -371,6 +371,70 @@ def modify_vehicle_safe(sim: SimulationState, updated_vehicle: Vehicle) -> Resul
         return Success(updated_sim)
 
 
+def modify_vehicles_safe(
+    sim: SimulationState, updated_vehicles: Iterable[Vehicle]
+) -> ResultE[SimulationState]:
+    """
+    given a batch of updated vehicles, update the SimulationState with those vehicles, applying
+    all changes to the vehicle collections in a single mutation of each collection
+
+    :param sim: the simulation state
+    :param updated_vehicles: the vehicles after calling a transition function and .step()
+    :return: the updated simulation, or an error
+    """
+    vehicles = sim.vehicles.mutate()
+    locations = sim.v_locations.mutate()
+    search = sim.v_search.mutate()
+    for updated_vehicle in updated_vehicles:
+        vehicle = vehicles.get(updated_vehicle.id)
+        if vehicle is None:
+            error = SimulationStateError(
+                f"cannot update vehicle {updated_vehicle.id}, it was not already in the sim"
+            )
+            return Failure(error)
+        elif not sim.road_network.geoid_within_geofence(updated_vehicle.geoid):
+            error = SimulationStateError(
+                f"cannot add vehicle {updated_vehicle.id} to sim: not within road network"
+            )
+            return Failure(error)
+
+        vehicles.set(updated_vehicle.id, updated_vehicle)
+        if vehicle.geoid == updated_vehicle.geoid:
+            continue
+        # unset from old geoid and add to new one
+        _move_in_collection(locations, vehicle.geoid, updated_vehicle.geoid, vehicle.id)
+        old_search_geoid = h3.h3_to_parent(vehicle.geoid, sim.sim_h3_search_resolution)
+        updated_search_geoid = h3.h3_to_parent(updated_vehicle.geoid, sim.sim_h3_search_resolution)
+        if old_search_geoid != updated_search_geoid:
+            _move_in_collection(search, old_search_geoid, updated_search_geoid, vehicle.id)
+
+    updated_sim = sim._replace(
+        vehicles=vehicles.finish(),
+        v_locations=locations.finish(),
+        v_search=search.finish(),
+    )
+    return Success(updated_sim)
+
+
+def _move_in_collection(collections, old_geoid: GeoId, new_geoid: GeoId, entity_id: EntityId):
+    """
+    moves an entity id between two geoids of a location collection which is being mutated.
+    when a geoid has no ids after a remove, it deletes that geoid, to prevent geoid Dict memory leaks
+
+    :param collections: the mutable location collection
+    :param old_geoid: the geoid the entity is moving from
+    :param new_geoid: the geoid the entity is moving to
+    :param entity_id: the entity id
+    """
+    ids_at_old_geoid = collections.get(old_geoid, frozenset()).difference([entity_id])
+    if len(ids_at_old_geoid) == 0:
+        if old_geoid in collections:
+            del collections[old_geoid]
+    else:
+        collections.set(old_geoid, ids_at_old_geoid)
+    collections.set(new_geoid, collections.get(new_geoid, frozenset()).union([entity_id]))
+
+
 def modify_vehicle(
     sim: SimulationState, updated_vehicle: Vehicle
 ) -> Tuple[Optional[Exception], Optional[SimulationState]]:
@@ -56,7 +56,8 @@ class CancelRequests(SimulationUpdateFunction):
                 elif updated_sim is None:
                     return sim
                 else:
-                    env.reporter.file_report(_gen_report(request_id, sim))
+                    if env.reporter.wants(ReportType.CANCEL_REQUEST_EVENT):
+                        env.reporter.file_report(_gen_report(request_id, sim))
                     return updated_sim
 
         updated = ft.reduce(
@@ -14,6 +14,11 @@ from nrel.hive.reporting.reporter import Report
 from nrel.hive.state.entity_state import entity_state_ops
 from nrel.hive.state.simulation_state.simulation_state import SimulationState
 from nrel.hive.state.vehicle_state.charge_queueing import ChargeQueueing
+from nrel.hive.state.vehicle_state.vehicle_state_ops import (
+    charge_vehicles,
+    idle_vehicles,
+    move_vehicles,
+)
 from nrel.hive.util import TupleOps
 
 if TYPE_CHECKING:
@@ -33,6 +38,8 @@ def _instruction_to_report(i: Instruction, sim_time: SimTime) -> Report:
 
 
 def log_instructions(instructions: Tuple[Instruction, ...], env: Environment, sim_time: SimTime):
+    if not env.reporter.wants(ReportType.INSTRUCTION):
+        return
     for i in instructions:
         env.reporter.file_report(_instruction_to_report(i, sim_time))
 
@@ -115,9 +122,40 @@ def perform_vehicle_state_updates(
     # why sort here? see _sort_by_vehicle_state for an explanation
     vehicles = _sort_by_vehicle_state(tuple(simulation_state.vehicles.values()))
 
-    for veh in vehicles:
+    # en-route vehicles are moved in one batch. vehicles which arrive or run out of energy
+    # during this time step are not moved here, and will go through their state update below
+    simulation_state, moved_vehicle_ids = move_vehicles(simulation_state, env, vehicles)
+
+    # vehicles at charging stations are charged in one batch. vehicles which are full will
+    # go through their state update below
+    simulation_state, charged_vehicle_ids = charge_vehicles(simulation_state, env, vehicles)
+
+    # parked vehicles draw idle energy in one batch. vehicles which run out of energy will go
+    # through their state update below. charge queueing vehicles are handled last.
+    charge_queueing_vehicles, other_vehicles = TupleOps.partition(
+        lambda v: isinstance(v.vehicle_state, ChargeQueueing), vehicles
+    )
+    simulation_state, idled_vehicle_ids = idle_vehicles(simulation_state, env, other_vehicles)
+
+    batched_vehicle_ids = moved_vehicle_ids | charged_vehicle_ids | idled_vehicle_ids
+    for veh in other_vehicles:
+        if veh.id in batched_vehicle_ids:
+            continue
         simulation_state = step_vehicle(simulation_state, env, veh)
 
+    # charge queueing vehicles take any chargers freed up above in order of their enqueue time.
+    # the vehicles still waiting afterward draw idle energy in one batch.
+    waiting_vehicles = []
+    for veh in charge_queueing_vehicles:
+        if veh.vehicle_state._has_reached_terminal_state_condition(simulation_state, env):
+            simulation_state = step_vehicle(simulation_state, env, veh)
+        else:
+            waiting_vehicles.append(veh)
+    simulation_state, idled_vehicle_ids = idle_vehicles(simulation_state, env, waiting_vehicles)
+    for veh in waiting_vehicles:
+        if veh.id not in idled_vehicle_ids:
+            simulation_state = step_vehicle(simulation_state, env, veh)
+
     return simulation_state
 
 
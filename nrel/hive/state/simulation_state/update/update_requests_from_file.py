@@ -9,7 +9,9 @@ from typing import Tuple, Optional, Iterator, Dict
 
 from returns.result import Failure
 
+from nrel.hive.model.entity_position import EntityPosition
 from nrel.hive.model.request import Request, RequestRateStructure
+from nrel.hive.model.roadnetwork.roadnetwork import positions_from_rows
 from nrel.hive.model.sim_time import SimTime
 from nrel.hive.reporting.reporter import Report, ReportType
 from nrel.hive.runner.environment import Environment
@@ -126,7 +128,9 @@ def update_requests_from_iterator(
 
     def _update(
         sim: SimulationState,
-        row: Dict[str, str],
+        row_and_positions: Tuple[
+            Dict[str, str], Optional[EntityPosition], Optional[EntityPosition]
+        ],
         env: Environment,
         rate_structure: RequestRateStructure,
     ) -> SimulationState:
@@ -135,12 +139,16 @@ def update_requests_from_iterator(
 
 
         :param sim: latest SimulationState
-        :param row: one row as loaded via DictReader
+        :param row_and_positions: one row as loaded via DictReader, along with its origin and
+                                  destination positions on the road network
         :param env: the simulation environment
         :param rate_structure: the rate structure for requests in the simulation
         :return: the updated sim and updated reporting
         """
-        error, req = Request.from_row(row, env, sim.road_network)
+        row, origin_position, destination_position = row_and_positions
+        error, req = Request.from_row(
+            row, env, sim.road_network, origin_position, destination_position
+        )
         this_req_cancel_time = (
             req.departure_time + env.config.sim.request_cancel_time_seconds if req else None
         )
@@ -183,18 +191,24 @@ def update_requests_from_iterator(
                     return sim
                 else:
                     dep_t = req_in_sim.departure_time
-                    report_data = {
-                        "request_id": req.id,
-                        "departure_time": str(dep_t),
-                        "fleet_id": str(req.membership),
-                    }
-                    env.reporter.file_report(Report(ReportType.ADD_REQUEST_EVENT, report_data))
+                    if env.reporter.wants(ReportType.ADD_REQUEST_EVENT):
+                        report_data = {
+                            "request_id": req.id,
+                            "departure_time": str(dep_t),
+                            "fleet_id": str(req.membership),
+                        }
+                        env.reporter.file_report(Report(ReportType.ADD_REQUEST_EVENT, report_data))
                     return sim_updated
 
-    # stream in all Requests that occur before the sim time of the provided SimulationState
+    # stream in all Requests that occur before the sim time of the provided SimulationState,
+    # snapping all of their origins and destinations to the road network in one batch
+    rows = tuple(it)
+    road_network = initial_sim_state.road_network
+    origin_positions = positions_from_rows(rows, road_network, "o_lat", "o_lon")
+    destination_positions = positions_from_rows(rows, road_network, "d_lat", "d_lon")
     updated_sim = ft.reduce(
         ft.partial(_update, env=env, rate_structure=rate_structure),
-        it,
+        zip(rows, origin_positions, destination_positions),
         initial_sim_state,
     )
 
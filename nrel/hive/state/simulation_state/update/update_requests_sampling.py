@@ -99,12 +99,13 @@ class UpdateRequestsSampling(SimulationUpdateFunction):
                 return sim
             else:
                 new_sim = new_sim_or_error.unwrap()
-                report_data = {
-                    "request_id": request.id,
-                    "departure_time": str(request.departure_time),
-                    "fleet_id": str(request.membership),
-                }
-                env.reporter.file_report(Report(ReportType.ADD_REQUEST_EVENT, report_data))
+                if env.reporter.wants(ReportType.ADD_REQUEST_EVENT):
+                    report_data = {
+                        "request_id": request.id,
+                        "departure_time": str(request.departure_time),
+                        "fleet_id": str(request.membership),
+                    }
+                    env.reporter.file_report(Report(ReportType.ADD_REQUEST_EVENT, report_data))
             return new_sim
 
         updated_sim = ft.reduce(_add_request, priced_requests, sim_state)
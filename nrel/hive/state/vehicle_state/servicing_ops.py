@@ -7,6 +7,7 @@ from nrel.hive.model.request import Request
 from nrel.hive.model.roadnetwork.route import Route
 from nrel.hive.model.vehicle.trip_phase import TripPhase
 from nrel.hive.model.vehicle.vehicle import Vehicle
+from nrel.hive.reporting.report_type import ReportType
 from nrel.hive.reporting.vehicle_event_ops import (
     report_pickup_request,
     report_dropoff_request,
@@ -249,12 +250,13 @@ def pick_up_trip(
         elif maybe_sim_with_vehicle is None:
             return None, None
         else:
-            try:
-                report = report_pickup_request(updated_vehicle, request, maybe_sim_with_vehicle)
-                env.reporter.file_report(report)
-            except:
-                # previous state may not be DispatchTrip (may not have expected attributes)
-                pass
+            if env.reporter.wants(ReportType.PICKUP_REQUEST_EVENT):
+                try:
+                    report = report_pickup_request(updated_vehicle, request, maybe_sim_with_vehicle)
+                    env.reporter.file_report(report)
+                except:
+                    # previous state may not be DispatchTrip (may not have expected attributes)
+                    pass
             return simulation_state_ops.remove_request(maybe_sim_with_vehicle, request_id)
 
 
@@ -290,7 +292,8 @@ def drop_off_trip(
                 message = f"vehicle {vehicle_id} dropping off passenger {passenger.id} but location is wrong: {locations}"
                 return SimulationStateError(message), None
 
-        report = report_dropoff_request(vehicle, sim, request)
-        env.reporter.file_report(report)
+        if env.reporter.wants(ReportType.DROPOFF_REQUEST_EVENT):
+            report = report_dropoff_request(vehicle, sim, request)
+            env.reporter.file_report(report)
 
         return None, sim
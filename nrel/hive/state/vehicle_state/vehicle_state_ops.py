@@ -1,25 +1,50 @@
 from __future__ import annotations
 
-from typing import Tuple, Optional, NamedTuple, TYPE_CHECKING
+import logging
+from dataclasses import replace
+from typing import Dict, FrozenSet, Iterable, List, Tuple, Optional, NamedTuple, TYPE_CHECKING
+
 import immutables
+from returns.result import Failure
+
+from nrel.hive.model.energy.charger import Charger
+from nrel.hive.model.energy.energytype import EnergyType
 from nrel.hive.model.entity_position import EntityPosition
 from nrel.hive.model.roadnetwork.route import empty_route
 from nrel.hive.model.roadnetwork.routetraversal import traverse, RouteTraversal
 from nrel.hive.model.vehicle.vehicle import Vehicle
+from nrel.hive.reporting.report_type import ReportType
 from nrel.hive.reporting.vehicle_event_ops import (
     vehicle_move_event,
     vehicle_charge_event,
 )
 from nrel.hive.state.simulation_state import simulation_state_ops
 from nrel.hive.state.vehicle_state.out_of_service import OutOfService
+from nrel.hive.state.vehicle_state.vehicle_state_type import VehicleStateType
 from nrel.hive.util.exception import SimulationStateError
 from nrel.hive.util.typealiases import StationId, ChargerId
-from nrel.hive.util.typealiases import VehicleId
+from nrel.hive.util.typealiases import MechatronicsId, VehicleId
 
 if TYPE_CHECKING:
+    from nrel.hive.model.vehicle.mechatronics.mechatronics_interface import MechatronicsInterface
     from nrel.hive.state.simulation_state.simulation_state import SimulationState
     from nrel.hive.runner.environment import Environment
 
+log = logging.getLogger(__name__)
+
+# vehicle states which move the vehicle along a route on each update
+MOVING_VEHICLE_STATE_TYPES = frozenset(
+    {
+        VehicleStateType.DISPATCH_TRIP,
+        VehicleStateType.SERVICING_TRIP,
+        VehicleStateType.DISPATCH_POOLING_TRIP,
+        VehicleStateType.SERVICING_POOLING_TRIP,
+        VehicleStateType.REPOSITIONING,
+        VehicleStateType.DISPATCH_BASE,
+        VehicleStateType.DISPATCH_STATION,
+    }
+)
+
 
 def charge(
     sim: SimulationState,
@@ -109,17 +134,175 @@ def charge(
         elif sim_with_vehicle is None:
             return None, None
         else:
+            if env.reporter.wants(ReportType.VEHICLE_CHARGE_EVENT):
+                report = vehicle_charge_event(
+                    vehicle,
+                    updated_vehicle,
+                    sim_with_vehicle,
+                    updated_station,
+                    charger,
+                    mechatronics,
+                )
+                env.reporter.file_report(report)
+
+            return simulation_state_ops.modify_station(sim_with_vehicle, updated_station)
+
+
+def charge_vehicles(
+    sim: SimulationState, env: Environment, vehicles: Iterable[Vehicle]
+) -> Tuple[SimulationState, FrozenSet[VehicleId]]:
+    """
+    charges all vehicles at charging stations in one batch. vehicles sharing a mechatronics type
+    and charger are charged at once, and each station collects the energy dispensed and the
+    payments for all of its charging vehicles in a single update.
+
+    vehicles which are already full are left for their vehicle state update, which handles the
+    transition out of charging, as are vehicles whose station or charger cannot be found.
+
+    :param sim: the simulation state
+    :param env: the simulation environment
+    :param vehicles: the vehicles to consider charging
+    :return: the sim with the charged vehicles, and the ids of the vehicles which were charged
+    """
+    # group the charging vehicles by mechatronics type and charger
+    groups: Dict[Tuple[MechatronicsId, Charger], List[Vehicle]] = {}
+    for vehicle in vehicles:
+        vehicle_state = vehicle.vehicle_state
+        if vehicle_state.vehicle_state_type != VehicleStateType.CHARGING_STATION:
+            continue
+        mechatronics = env.mechatronics.get(vehicle.mechatronics_id)
+        station = sim.stations.get(vehicle_state.station_id)  # type: ignore
+        if mechatronics is None or station is None or mechatronics.is_full(vehicle):
+            continue
+        charger_err, charger = station.get_charger_instance(vehicle_state.charger_id)  # type: ignore
+        if charger_err is not None or charger is None:
+            continue
+        groups.setdefault((vehicle.mechatronics_id, charger), []).append(vehicle)
+
+    # charge each group at once, collecting payments and energy dispensed by station
+    charged: List[Tuple[Vehicle, Vehicle, Charger, MechatronicsInterface]] = []
+    station_revenue: Dict[StationId, float] = {}
+    station_energy: Dict[StationId, Dict[EnergyType, float]] = {}
+    for (mechatronics_id, charger), group in groups.items():
+        mechatronics = env.mechatronics[mechatronics_id]
+        charged_vehicles = mechatronics.add_energy_batch(
+            group, charger, sim.sim_timestep_duration_seconds
+        )
+        for vehicle, charged_vehicle in zip(group, charged_vehicles):
+            station = sim.stations[vehicle.vehicle_state.station_id]  # type: ignore
+
+            # determine price of charge event
+            kwh_transacted = (
+                charged_vehicle.energy[charger.energy_type] - vehicle.energy[charger.energy_type]
+            )  # kwh
+            charger_price = station.get_price(charger.id)  # Currency
+            charging_price = kwh_transacted * charger_price if charger_price else 0.0
+
+            updated_vehicle = charged_vehicle.send_payment(charging_price)
+            charged.append((vehicle, updated_vehicle, charger, mechatronics))
+
+            station_revenue[station.id] = station_revenue.get(station.id, 0.0) + charging_price
+            energy = station_energy.setdefault(station.id, {})
+            energy[charger.energy_type] = energy.get(charger.energy_type, 0.0) + kwh_transacted
+
+    # perform updates, once per vehicle collection and once per station
+    result = simulation_state_ops.modify_vehicles_safe(sim, [v for _, v, _, _ in charged])
+    if isinstance(result, Failure):
+        log.error(result.failure())
+        return sim, frozenset()
+    updated_sim = result.unwrap()
+
+    for station_id, revenue in station_revenue.items():
+        station = updated_sim.stations[station_id]
+        updated_station = station.receive_payment(revenue).tick_energy_dispensed(
+            immutables.Map(station_energy[station_id])
+        )
+        error, sim_with_station = simulation_state_ops.modify_station(updated_sim, updated_station)
+        if error or sim_with_station is None:
+            log.error(error)
+            return sim, frozenset()
+        updated_sim = sim_with_station
+
+    if env.reporter.wants(ReportType.VEHICLE_CHARGE_EVENT):
+        for vehicle, updated_vehicle, charger, mechatronics in charged:
             report = vehicle_charge_event(
                 vehicle,
                 updated_vehicle,
-                sim_with_vehicle,
-                updated_station,
+                updated_sim,
+                updated_sim.stations[vehicle.vehicle_state.station_id],  # type: ignore
                 charger,
                 mechatronics,
             )
             env.reporter.file_report(report)
 
-            return simulation_state_ops.modify_station(sim_with_vehicle, updated_station)
+    return updated_sim, frozenset(vehicle.id for vehicle, _, _, _ in charged)
+
+
+# vehicle states which only draw idle energy on each update
+IDLING_VEHICLE_STATE_TYPES = frozenset(
+    {
+        VehicleStateType.IDLE,
+        VehicleStateType.CHARGE_QUEUEING,
+    }
+)
+
+
+def idle_vehicles(
+    sim: SimulationState, env: Environment, vehicles: Iterable[Vehicle]
+) -> Tuple[SimulationState, FrozenSet[VehicleId]]:
+    """
+    updates parked vehicles in one batch. idle energy is drawn from all vehicles sharing a
+    mechatronics type at once, and all updated vehicles are written back to the simulation in a
+    single update. ReserveBase vehicles have no update.
+
+    vehicles which have reached the terminal condition of their state (such as running out of
+    energy, or a charger becoming available) are left for their vehicle state update, which
+    handles the transition to their next state.
+
+    :param sim: the simulation state
+    :param env: the simulation environment
+    :param vehicles: the vehicles to consider idling
+    :return: the sim with the idled vehicles, and the ids of the vehicles which were updated
+    """
+    duration_seconds = sim.sim_timestep_duration_seconds
+
+    # group the parked vehicles by mechatronics type
+    reserve_base_ids: List[VehicleId] = []
+    groups: Dict[MechatronicsId, List[Vehicle]] = {}
+    for vehicle in vehicles:
+        vehicle_state = vehicle.vehicle_state
+        vehicle_state_type = vehicle_state.vehicle_state_type
+        if vehicle_state_type == VehicleStateType.RESERVE_BASE:
+            reserve_base_ids.append(vehicle.id)
+        elif vehicle_state_type not in IDLING_VEHICLE_STATE_TYPES:
+            continue
+        elif vehicle.mechatronics_id not in env.mechatronics:
+            continue
+        elif vehicle_state._has_reached_terminal_state_condition(sim, env):
+            continue
+        else:
+            groups.setdefault(vehicle.mechatronics_id, []).append(vehicle)
+
+    # draw idle energy for each group at once
+    updated_vehicles: List[Vehicle] = []
+    for mechatronics_id, group in groups.items():
+        mechatronics = env.mechatronics[mechatronics_id]
+        less_energy_vehicles = mechatronics.idle_batch(group, duration_seconds)
+        for less_energy_vehicle in less_energy_vehicles:
+            vehicle_state = less_energy_vehicle.vehicle_state
+            if vehicle_state.vehicle_state_type == VehicleStateType.IDLE:
+                updated_idle_duration = vehicle_state.idle_duration + duration_seconds  # type: ignore
+                updated_state = replace(vehicle_state, idle_duration=updated_idle_duration)  # type: ignore
+                less_energy_vehicle = less_energy_vehicle.modify_vehicle_state(updated_state)
+            updated_vehicles.append(less_energy_vehicle)
+
+    result = simulation_state_ops.modify_vehicles_safe(sim, updated_vehicles)
+    if isinstance(result, Failure):
+        log.error(result.failure())
+        return sim, frozenset(reserve_base_ids)
+
+    updated_ids = frozenset(reserve_base_ids).union(v.id for v in updated_vehicles)
+    return result.unwrap(), updated_ids
 
 
 class MoveResult(NamedTuple):
@@ -195,6 +378,7 @@ def move(
     error, traverse_result = traverse(
         route_estimate=route,
         duration_seconds=int(sim.sim_timestep_duration_seconds),
+        road_network=sim.road_network,
     )
     if error:
         return error, None
@@ -226,8 +410,9 @@ def move(
         new_route_state = new_position_vehicle.vehicle_state.update_route(route=remaining_route)  # type: ignore
         updated_vehicle = new_position_vehicle.modify_vehicle_state(new_route_state)
 
-        report = vehicle_move_event(sim, vehicle, updated_vehicle, traverse_result, env)
-        env.reporter.file_report(report)
+        if env.reporter.wants(ReportType.VEHICLE_MOVE_EVENT):
+            report = vehicle_move_event(sim, vehicle, updated_vehicle, traverse_result, env)
+            env.reporter.file_report(report)
 
     error, moved_sim = simulation_state_ops.modify_vehicle(sim, updated_vehicle)
     if error:
@@ -238,3 +423,83 @@ def move(
         return response, None
     else:
         return None, moved_sim
+
+
+def move_vehicles(
+    sim: SimulationState, env: Environment, vehicles: Iterable[Vehicle]
+) -> Tuple[SimulationState, FrozenSet[VehicleId]]:
+    """
+    moves en-route vehicles in one batch. each vehicle in a moving state is advanced along its
+    route, the energy used is computed for all vehicles sharing a mechatronics type at once, and
+    all moved vehicles are written back to the simulation in a single update.
+
+    only vehicles which are still en-route after this time step are moved here. vehicles which
+    reach the end of their route or run out of energy are left for their vehicle state update,
+    which handles the transition to their next state.
+
+    :param sim: the simulation state
+    :param env: the simulation environment
+    :param vehicles: the vehicles to consider moving
+    :return: the sim with the moved vehicles, and the ids of the vehicles which were moved
+    """
+    duration_seconds = int(sim.sim_timestep_duration_seconds)
+
+    # advance each en-route vehicle along its route, grouping them by mechatronics type
+    traversals: Dict[MechatronicsId, List[Tuple[Vehicle, RouteTraversal]]] = {}
+    for vehicle in vehicles:
+        vehicle_state = vehicle.vehicle_state
+        if vehicle_state.vehicle_state_type not in MOVING_VEHICLE_STATE_TYPES:
+            continue
+        elif vehicle_state._has_reached_terminal_state_condition(sim, env):
+            continue
+        error, traverse_result = traverse(
+            route_estimate=vehicle_state.route,  # type: ignore
+            duration_seconds=duration_seconds,
+            road_network=sim.road_network,
+        )
+        if error or traverse_result is None:
+            continue
+        elif not traverse_result.experienced_route or not traverse_result.remaining_route:
+            continue
+        traversals.setdefault(vehicle.mechatronics_id, []).append((vehicle, traverse_result))
+
+    # compute the energy used by all vehicles of each mechatronics type at once
+    moved: List[Tuple[Vehicle, Vehicle, RouteTraversal]] = []
+    for mechatronics_id, vehicle_traversals in traversals.items():
+        mechatronics = env.mechatronics.get(mechatronics_id)
+        if mechatronics is None:
+            continue
+        less_energy_vehicles = mechatronics.consume_energy_batch(
+            [v for v, _ in vehicle_traversals],
+            [t.experienced_route for _, t in vehicle_traversals],
+        )
+        for (vehicle, traverse_result), less_energy_vehicle in zip(
+            vehicle_traversals, less_energy_vehicles
+        ):
+            if mechatronics.is_empty(less_energy_vehicle):
+                continue
+            last_link_traversed = traverse_result.experienced_route[-1]
+            vehicle_position = EntityPosition(last_link_traversed.link_id, last_link_traversed.end)
+            if not sim.road_network.geoid_within_geofence(vehicle_position.geoid):
+                continue
+            new_position_vehicle = less_energy_vehicle.modify_position(
+                position=vehicle_position
+            ).tick_distance_traveled_km(traverse_result.traversal_distance_km)
+            new_route_state = new_position_vehicle.vehicle_state.update_route(  # type: ignore
+                route=traverse_result.remaining_route
+            )
+            updated_vehicle = new_position_vehicle.modify_vehicle_state(new_route_state)
+            moved.append((vehicle, updated_vehicle, traverse_result))
+
+    # write all moved vehicles back to the simulation in one batch
+    result = simulation_state_ops.modify_vehicles_safe(sim, [v for _, v, _ in moved])
+    if isinstance(result, Failure):
+        log.error(result.failure())
+        return sim, frozenset()
+
+    if env.reporter.wants(ReportType.VEHICLE_MOVE_EVENT):
+        for vehicle, updated_vehicle, traverse_result in moved:
+            report = vehicle_move_event(sim, vehicle, updated_vehicle, traverse_result, env)
+            env.reporter.file_report(report)
+
+    return result.unwrap(), frozenset(vehicle.id for vehicle, _, _ in moved)
@@ -1,16 +1,16 @@
 import itertools as it
-from typing import Tuple, TypeVar, Optional, Callable
+from typing import Sequence, Tuple, TypeVar, Optional, Callable
 
 
 class TupleOps:
     T = TypeVar("T")
 
     @classmethod
-    def is_empty(cls, xs: Tuple[T, ...]) -> bool:
+    def is_empty(cls, xs: Sequence[T]) -> bool:
         return len(xs) == 0
 
     @classmethod
-    def non_empty(cls, xs: Tuple[T, ...]) -> bool:
+    def non_empty(cls, xs: Sequence[T]) -> bool:
         return not TupleOps.is_empty(xs)
 
     @classmethod
@@ -22,28 +22,28 @@ class TupleOps:
             return removed
 
     @classmethod
-    def head(cls, xs: Tuple[T, ...]) -> T:
+    def head(cls, xs: Sequence[T]) -> T:
         if len(xs) == 0:
             raise IndexError("called head on empty Tuple")
         else:
             return xs[0]
 
     @classmethod
-    def head_optional(cls, xs: Tuple[T, ...]) -> Optional[T]:
+    def head_optional(cls, xs: Sequence[T]) -> Optional[T]:
         if len(xs) == 0:
             return None
         else:
             return xs[0]
 
     @classmethod
-    def last(cls, xs: Tuple[T, ...]) -> T:
+    def last(cls, xs: Sequence[T]) -> T:
         if len(xs) == 0:
             raise IndexError("called last on empty Tuple")
         else:
             return xs[-1]
 
     @classmethod
-    def last_optional(cls, xs: Tuple[T, ...]) -> Optional[T]:
+    def last_optional(cls, xs: Sequence[T]) -> Optional[T]:
         if len(xs) == 0:
             return None
         else:
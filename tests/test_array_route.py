@@ -0,0 +1,85 @@
+from unittest import TestCase
+
+from nrel.hive.model.roadnetwork.array_route import ArrayRoute
+from nrel.hive.model.roadnetwork.route import (
+    route_distance_km,
+    route_travel_time_seconds,
+    routes_are_connected,
+)
+from nrel.hive.model.roadnetwork.routetraversal import traverse
+from nrel.hive.resources.mock_lobster import *
+
+
+def _osm_route(network: OSMRoadNetwork) -> ArrayRoute:
+    origin = h3.geo_to_h3(39.7481388, -104.9935966, 15)
+    destination = h3.geo_to_h3(39.7613596, -104.981728, 15)
+    origin_position = network.position_from_geoid(origin)
+    destination_position = network.position_from_geoid(destination)
+    assert origin_position is not None and destination_position is not None
+    route = network.route(origin_position, destination_position)
+    assert isinstance(route, ArrayRoute)
+    return route
+
+
+class TestArrayRoute(TestCase):
+    def test_matches_link_traversals(self):
+        network = mock_osm_network()
+        route = _osm_route(network)
+        links = tuple(route)
+
+        self.assertEqual(route, links)
+        self.assertEqual(route[-1], links[-1])
+        self.assertEqual(route[2:5], links[2:5])
+        self.assertIsInstance(route[2:5], ArrayRoute, "slices should stay array-backed")
+        self.assertAlmostEqual(route_distance_km(route), route_distance_km(links))
+        self.assertEqual(route_travel_time_seconds(route), route_travel_time_seconds(links))
+        self.assertEqual(
+            routes_are_connected(route[:1], route[1:2]),
+            routes_are_connected(links[:1], links[1:2]),
+        )
+
+    def test_concatenate(self):
+        network = mock_osm_network()
+        route = _osm_route(network)
+        links = tuple(route)
+
+        prepended = (links[0],) + route[1:]
+        appended = route[:-1] + (links[-1],)
+
+        self.assertIsInstance(prepended, ArrayRoute)
+        self.assertIsInstance(appended, ArrayRoute)
+        self.assertEqual(prepended, links)
+        self.assertEqual(appended, links)
+
+    def test_traverse_matches_tuple_route(self):
+        network = mock_osm_network()
+        route = _osm_route(network)
+        links = tuple(route)
+
+        while len(links) > 0:
+            _, array_result = traverse(route, 30, network)
+            _, tuple_result = traverse(links, 30, network)
+
+            self.assertEqual(array_result.experienced_route, tuple_result.experienced_route)
+            self.assertEqual(array_result.remaining_route, tuple_result.remaining_route)
+            self.assertEqual(
+                array_result.remaining_time_seconds, tuple_result.remaining_time_seconds
+            )
+            self.assertAlmostEqual(
+                array_result.traversal_distance_km, tuple_result.traversal_distance_km
+            )
+            route, links = array_result.remaining_route, tuple_result.remaining_route
+
+    def test_elapsed_seconds_prefix(self):
+        network = mock_osm_network()
+        route = _osm_route(network)
+        travel_times = [0 if l.start == l.end else l.travel_time_seconds for l in route]
+        full = [sum(travel_times[: i + 1]) for i in range(len(route))]
+
+        elapsed = route.elapsed_seconds(full[2], min_links=1)
+        self.assertEqual(list(elapsed), full[: len(elapsed)])
+        self.assertGreater(elapsed[-1], full[2], "prefix should outlast the duration")
+        self.assertLess(len(elapsed), len(route), "should not sum the whole route")
+
+        self.assertEqual(list(route.elapsed_seconds(full[-1])), full, "whole route if too short")
+        self.assertEqual(len(route[:0].elapsed_seconds(10)), 0)
@@ -0,0 +1,66 @@
+from unittest import TestCase
+
+from nrel.hive.dispatcher.instruction_generator import assignment_ops
+from nrel.hive.resources.mock_lobster import *
+from nrel.hive.state.vehicle_state.charge_queueing import ChargeQueueing
+
+
+class TestAssignmentOps(TestCase):
+    def test_station_wait_estimates(self):
+        station = mock_station_from_geoid(chargers={mock_dcfc_charger_id(): 1})
+        charging = mock_vehicle_from_geoid(
+            vehicle_id="charging",
+            vehicle_state=ChargingStation.build("charging", station.id, mock_dcfc_charger_id()),
+            soc=0.2,
+        )
+        enqueued = mock_vehicle_from_geoid(
+            vehicle_id="enqueued",
+            vehicle_state=ChargeQueueing.build(
+                "enqueued", station.id, mock_dcfc_charger_id(), SimTime(0)
+            ),
+            soc=0.2,
+        )
+        sim = mock_sim(vehicles=(charging, enqueued), stations=(station,))
+        env = mock_env()
+
+        wait_estimates: Dict[StationId, Dict[ChargerId, Seconds]] = {}
+        estimates = assignment_ops.station_wait_estimates(sim, env, station, 1.0, wait_estimates)
+        self.assertGreater(estimates[mock_dcfc_charger_id()], 0, "should wait for charger")
+        self.assertIs(
+            assignment_ops.station_wait_estimates(sim, env, station, 1.0, wait_estimates),
+            estimates,
+            "estimates should be reused by callers sharing them",
+        )
+        self.assertEqual(wait_estimates, {station.id: estimates})
+        self.assertIsNot(
+            assignment_ops.station_wait_estimates(sim, env, station, 1.0),
+            estimates,
+            "estimates should not be shared without the caller's estimates",
+        )
+
+        # once the enqueued vehicle leaves, the wait is only for the charging vehicle
+        sim_without_queue = simulation_state_ops.remove_vehicle_safe(sim, enqueued.id).unwrap()
+        updated_estimates = assignment_ops.station_wait_estimates(
+            sim_without_queue, env, station, 1.0, {}
+        )
+        self.assertLess(
+            updated_estimates[mock_dcfc_charger_id()],
+            estimates[mock_dcfc_charger_id()],
+            "estimates should be recomputed for a new simulation state",
+        )
+
+    def test_charger_wait_time(self):
+        # a free charger means no wait
+        self.assertEqual(assignment_ops.charger_wait_time((), (), 1), 0)
+        self.assertEqual(assignment_ops.charger_wait_time((100,), (), 2), 0)
+
+        # wait for the first charger to free up
+        self.assertEqual(assignment_ops.charger_wait_time((300, 100), (), 2), 100)
+
+        # enqueued vehicles take the chargers as they free up
+        self.assertEqual(assignment_ops.charger_wait_time((100, 300), (50, 500), 2), 300)
+
+    def test_charger_wait_time_long_queue(self):
+        # each of 4 chargers serves 1000 enqueued vehicles of 300 seconds after 100 seconds
+        wait = assignment_ops.charger_wait_time((100,) * 4, (300,) * 4000, 4)
+        self.assertEqual(wait, 100 + 300 * 1000)
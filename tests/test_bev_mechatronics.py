@@ -1,5 +1,7 @@
 from unittest import TestCase
 
+import numpy as np
+
 from nrel.hive.resources.mock_lobster import *
 
 
@@ -37,6 +39,101 @@ class TestBEV(TestCase):
             "Should not be fully charged",
         )
 
+    def test_powercurve_charge_matches_substeps(self):
+        """
+        the exact integration of the powercurve should be within 0.5% of the energy
+        charged when advancing in 1 second substeps
+        """
+        bev = mock_bev(battery_capacity_kwh=50)
+        powercurve = bev.powercurve
+        full_kwh = bev.battery_capacity_kwh - bev.battery_full_threshold_kwh
+        for start_kwh in [0.0, 5.0, 25.0, 40.0, 45.0]:
+            energy_kwh, time_seconds = powercurve.charge(start_kwh, full_kwh, 50, 60)
+
+            expected_kwh = start_kwh
+            for _ in range(60):
+                rate_kw = np.interp(
+                    expected_kwh, powercurve._charging_energy_kwh, powercurve._charging_rate_kw
+                )
+                expected_kwh += min(rate_kw, 50) * SECONDS_TO_HOURS
+
+            self.assertEqual(time_seconds, 60)
+            self.assertAlmostEqual(
+                energy_kwh - start_kwh,
+                expected_kwh - start_kwh,
+                delta=0.005 * (expected_kwh - start_kwh),
+            )
+
+    def test_powercurve_charge_batch(self):
+        bev = mock_bev(battery_capacity_kwh=50)
+        powercurve = bev.powercurve
+        full_kwh = bev.battery_capacity_kwh - bev.battery_full_threshold_kwh
+        start_kwh = np.array([0.0, 10.0, 49.0, 49.85, 50.0])
+
+        energy_kwh, time_seconds = powercurve.charge_batch(start_kwh, full_kwh, 50, 36000)
+        for i, start in enumerate(start_kwh):
+            expected_kwh, expected_seconds = powercurve.charge(start, full_kwh, 50, 36000)
+            self.assertAlmostEqual(energy_kwh[i], expected_kwh)
+            self.assertEqual(time_seconds[i], expected_seconds)
+        self.assertEqual(energy_kwh[3], full_kwh, "should stop charging when full")
+        self.assertLess(time_seconds[3], 36000)
+        self.assertEqual(time_seconds[4], 0, "should not charge a full vehicle")
+
+    def test_powercurve_charge_at_zero_rate(self):
+        bev = mock_bev(battery_capacity_kwh=50)
+        powercurve = bev.powercurve
+
+        # the curve's last point, where the charge rate is zero, and above it
+        for start_kwh in (50.0, 50.5):
+            energy_kwh, time_seconds = powercurve.charge(start_kwh, 51, 50, 60)
+            self.assertEqual(energy_kwh, start_kwh, "should not charge at a zero charge rate")
+            self.assertEqual(time_seconds, 60)
+
+        energy_kwh, time_seconds = powercurve.charge_batch(np.array([50.0, 50.5]), 51, 50, 60)
+        self.assertEqual(list(energy_kwh), [50.0, 50.5])
+        self.assertEqual(list(time_seconds), [60, 60])
+
+    def test_powercurve_charge_compared_to_60_second_substeps(self):
+        """
+        powercurves once charged in 60 second substeps at the rate from the start of each
+        substep. integrating exactly charges more from empty, where the charge rate rises
+        steeply, and slightly less near full, where it falls.
+        """
+        bev = mock_bev(battery_capacity_kwh=50)
+        powercurve = bev.powercurve
+        full_kwh = bev.battery_capacity_kwh - bev.battery_full_threshold_kwh
+        for start_kwh, expected_change in [(0.0, 0.093), (25.0, -0.008), (45.0, -0.014)]:
+            energy_kwh, _ = powercurve.charge(start_kwh, full_kwh, 50, 600)
+
+            substep_kwh = start_kwh
+            for _ in range(10):
+                rate_kw = np.interp(
+                    substep_kwh, powercurve._charging_energy_kwh, powercurve._charging_rate_kw
+                )
+                substep_kwh += min(rate_kw, 50) * 60 * SECONDS_TO_HOURS
+
+            change = (energy_kwh - start_kwh) / (substep_kwh - start_kwh) - 1
+            self.assertAlmostEqual(change, expected_change, delta=0.002)
+
+    def test_powercurve_step_size_is_ignored(self):
+        data = {
+            "name": "test",
+            "power_type": "electric",
+            "power_curve": [
+                {"energy_kwh": 0.0, "power_kw": 1.0},
+                {"energy_kwh": 1.0, "power_kw": 1.0},
+            ],
+        }
+        powercurve = TabularPowercurve(data, nominal_max_charge_kw=50, battery_capacity_kwh=50)
+        with self.assertLogs(
+            "nrel.hive.model.vehicle.mechatronics.powercurve.tabular_powercurve", "WARNING"
+        ):
+            with_step = TabularPowercurve(
+                {**data, "step_size_seconds": 60}, nominal_max_charge_kw=50, battery_capacity_kwh=50
+            )
+        self.assertFalse(hasattr(with_step, "step_size_seconds"))
+        self.assertEqual(powercurve.charge(0.0, 49.9, 50, 60), with_step.charge(0.0, 49.9, 50, 60))
+
     def test_leaf_energy_cost_empty_route(self):
         bev = mock_bev(battery_capacity_kwh=50)
         vehicle = mock_vehicle(soc=1)
@@ -64,6 +161,33 @@ class TestBEV(TestCase):
             places=0,
         )
 
+    def test_leaf_energy_cost_batch(self):
+        bev = mock_bev(battery_capacity_kwh=50, nominal_watt_hour_per_mile=1000)
+        vehicles = [mock_vehicle(soc=1), mock_vehicle(soc=0.5), mock_vehicle(soc=0.8)]
+        routes = [mock_route(speed_kmph=45), (), mock_route(speed_kmph=20)]
+
+        moved_vehicles = bev.consume_energy_batch(vehicles, routes)
+        for vehicle, route, moved_vehicle in zip(vehicles, routes, moved_vehicles):
+            expected = bev.consume_energy(vehicle, route=route)
+            self.assertAlmostEqual(
+                moved_vehicle.energy[EnergyType.ELECTRIC],
+                expected.energy[EnergyType.ELECTRIC],
+                msg="batch energy use should match energy use of each vehicle",
+            )
+
+    def test_leaf_route_energy(self):
+        bev = mock_bev(battery_capacity_kwh=50, nominal_watt_hour_per_mile=1000)
+        test_route = mock_route(speed_kmph=45)
+
+        link_energy = sum(bev.powertrain.link_cost(link) for link in test_route)
+        self.assertAlmostEqual(bev.powertrain.route_energy(test_route), link_energy)
+        self.assertAlmostEqual(
+            bev.powertrain.route_energy(test_route),
+            bev.powertrain.energy_cost(test_route),
+            msg="route energy should match the energy cost of each link",
+        )
+        self.assertEqual(bev.powertrain.route_energy(()), 0)
+
     def test_remaining_range(self):
         bev = mock_bev(battery_capacity_kwh=50, nominal_watt_hour_per_mile=1000)
         vehicle = mock_vehicle(soc=1)
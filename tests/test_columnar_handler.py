@@ -0,0 +1,122 @@
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest import TestCase, skipUnless
+
+from nrel.hive.reporting.handler.columnar_handler import ColumnarHandler
+from nrel.hive.reporting.report_type import ReportType
+from nrel.hive.reporting.reporter import Report
+from nrel.hive.runner import RunnerPayload
+from nrel.hive.resources.mock_lobster import *
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+def _global_config(log_format: str):
+    return mock_config().global_config._replace(
+        log_events=True,
+        log_states=True,
+        log_format=log_format,
+        log_columnar_flush_steps=2,
+        log_sim_config={ReportType.ADD_REQUEST_EVENT, ReportType.VEHICLE_STATE},
+    )
+
+
+def _run_handler(handler: ColumnarHandler, steps: int):
+    sim = mock_sim(vehicles=(mock_vehicle(vehicle_id="v1"), mock_vehicle(vehicle_id="v2")))
+    runner_payload = RunnerPayload(sim, mock_env(), mock_update())
+    for step in range(steps):
+        add_request: Dict[str, Any] = {
+            "request_id": f"r{step}",
+            "departure_time": SimTime.build(step),
+            "step": step,
+        }
+        reports = [
+            Report(ReportType.ADD_REQUEST_EVENT, add_request),
+            Report(ReportType.CANCEL_REQUEST_EVENT, {"request_id": f"r{step}"}),
+        ]
+        handler.step(reports, runner_payload)
+        handler.handle(reports, runner_payload)
+    handler.close(runner_payload)
+
+
+def _read_table(path: Path):
+    if path.suffix == ".parquet":
+        return pq.read_table(path)
+    with pa.ipc.open_file(path) as reader:
+        return reader.read_all()
+
+
+@skipUnless(HAS_PYARROW, "requires pyarrow")
+class TestColumnarHandler(TestCase):
+    def test_parquet(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            handler = ColumnarHandler(_global_config("parquet"), Path(tmp))
+            _run_handler(handler, steps=5)
+
+            self.assertFalse(
+                (Path(tmp) / "cancel_request_event.parquet").exists(),
+                "report types not in log_sim_config are not written",
+            )
+            add_requests = pq.read_table(Path(tmp) / "add_request_event.parquet")
+            self.assertEqual(add_requests.num_rows, 5)
+            self.assertEqual(
+                pq.ParquetFile(Path(tmp) / "add_request_event.parquet").num_row_groups, 3
+            )
+            self.assertEqual(add_requests.schema.field("step").type, pa.int64())
+            self.assertEqual(add_requests.schema.field("departure_time").type, pa.string())
+            self.assertEqual(add_requests.column("step").to_pylist(), [0, 1, 2, 3, 4])
+            self.assertEqual(
+                add_requests.column("departure_time").to_pylist()[1], str(SimTime.build(1))
+            )
+
+            vehicle_states = pq.read_table(Path(tmp) / "vehicle_state.parquet")
+            self.assertEqual(vehicle_states.num_rows, 10, "two vehicles over five steps")
+            self.assertEqual(vehicle_states.schema.field("balance").type, pa.float64())
+
+    def test_arrow(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            handler = ColumnarHandler(_global_config("arrow"), Path(tmp))
+            _run_handler(handler, steps=3)
+
+            with pa.ipc.open_file(Path(tmp) / "add_request_event.arrow") as reader:
+                add_requests = reader.read_all()
+            self.assertEqual(add_requests.column("request_id").to_pylist(), ["r0", "r1", "r2"])
+
+    def test_later_float_in_int_column(self):
+        for log_format in ("parquet", "arrow"):
+            with tempfile.TemporaryDirectory() as tmp:
+                handler = ColumnarHandler(_global_config(log_format), Path(tmp))
+                runner_payload = RunnerPayload(mock_sim(), mock_env(), mock_update())
+                rows: List[Dict[str, Any]] = [
+                    {"value": 1, "flag": True},
+                    {"value": 2, "flag": False},
+                    {"value": 3.0, "flag": "unknown"},
+                    {"value": 3.5, "flag": True, "note": "added later"},
+                ]
+                for row in rows:
+                    report = Report(ReportType.ADD_REQUEST_EVENT, row)
+                    handler.step([report], runner_payload)
+                    handler.handle([report], runner_payload)
+                handler.close(runner_payload)
+
+                first, second = (
+                    _read_table(Path(tmp) / f"add_request_event{part}.{log_format}")
+                    for part in ("", ".1")
+                )
+                self.assertFalse((Path(tmp) / f"add_request_event.2.{log_format}").exists())
+                self.assertEqual(first.schema.field("value").type, pa.int64())
+                self.assertEqual(first.column("value").to_pylist(), [1, 2])
+                self.assertEqual(first.column("flag").to_pylist(), [True, False])
+                self.assertNotIn("note", first.column_names, "written rows are not rewritten")
+
+                self.assertEqual(second.schema.field("value").type, pa.float64())
+                self.assertEqual(second.column("value").to_pylist(), [3.0, 3.5])
+                self.assertEqual(second.column("flag").to_pylist(), ["unknown", "True"])
+                self.assertEqual(second.column("note").to_pylist(), [None, "added later"])
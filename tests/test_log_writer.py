@@ -0,0 +1,161 @@
+import gzip
+import json
+import tempfile
+import threading
+from pathlib import Path
+from unittest import TestCase, skipUnless
+
+from nrel.hive.reporting.handler.log_writer import (
+    AsyncLogWriter,
+    LogWriter,
+    build_log_writer,
+    read_log,
+)
+from nrel.hive.reporting.report_type import ReportType
+from nrel.hive.reporting.reporter import Report
+from nrel.hive.resources.mock_lobster import *
+
+try:
+    import zstandard  # noqa: F401
+
+    HAS_ZSTANDARD = True
+except ImportError:
+    HAS_ZSTANDARD = False
+
+
+def _entries(step: int):
+    return [{"step": step, "vehicle_id": f"v{i}", "soc": i / 10} for i in range(10)]
+
+
+class TestLogWriter(TestCase):
+    def test_async_matches_sync(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            sync_path, async_path = Path(tmp) / "sync.log", Path(tmp) / "async.log"
+            sync_writer, async_writer = LogWriter(sync_path), AsyncLogWriter(async_path)
+            for step in range(100):
+                sync_writer.write(_entries(step))
+                async_writer.write(_entries(step))
+            sync_writer.close()
+            async_writer.close()
+
+            self.assertEqual(sync_path.read_text(), async_path.read_text())
+            lines = async_path.read_text().splitlines()
+            self.assertEqual(len(lines), 1000, "close should write all queued entries")
+            self.assertEqual(json.loads(lines[-1])["step"], 99)
+
+    def test_async_serializes_reports_on_writer_thread(self):
+        converted_on = set()
+
+        class _ThreadRecordingReport(Report):
+            def as_json(self, typed: bool = False):
+                converted_on.add(threading.current_thread().name)
+                return super().as_json(typed)
+
+        def _reports(step: int):
+            return [
+                _ThreadRecordingReport(ReportType.VEHICLE_MOVE_EVENT, entry)
+                for entry in _entries(step)
+            ]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            sync_path, async_path = Path(tmp) / "sync.log", Path(tmp) / "async.log"
+            sync_writer, async_writer = LogWriter(sync_path), AsyncLogWriter(async_path)
+            for step in range(10):
+                sync_writer.write_reports(_reports(step))
+            sync_writer.close()
+            self.assertEqual(converted_on, {threading.current_thread().name})
+
+            converted_on.clear()
+            for step in range(10):
+                async_writer.write_reports(_reports(step))
+            async_writer.close()
+            self.assertEqual(converted_on, {async_writer._thread.name}, "not on the sim thread")
+
+            self.assertEqual(sync_path.read_text(), async_path.read_text())
+            first = json.loads(async_path.read_text().splitlines()[0])
+            self.assertEqual(first["report_type"], "vehicle_move_event")
+
+    def test_async_drop_when_queue_is_full(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "drop.log"
+            writer = AsyncLogWriter(path, queue_size=1, backpressure="drop")
+
+            # hold the writer thread on its first batch until the queue has filled up
+            release = threading.Event()
+            writing = threading.Event()
+            original_write = writer.log_file.write
+
+            def slow_write(text):
+                writing.set()
+                release.wait()
+                return original_write(text)
+
+            writer.log_file.write = slow_write
+            writer.write(_entries(0))
+            writing.wait()
+            writer.write(_entries(1))
+            writer.write(_entries(2))
+            release.set()
+            writer.close()
+
+            self.assertEqual(writer.dropped_entries, 10, "third batch should be dropped")
+            steps = [json.loads(line)["step"] for line in path.read_text().splitlines()]
+            self.assertEqual(sorted(set(steps)), [0, 1])
+
+    def test_build_log_writer(self):
+        conf = mock_config()
+        with tempfile.TemporaryDirectory() as tmp:
+            sync_writer = build_log_writer(conf.global_config, Path(tmp) / "sync.log")
+            async_config = conf.global_config._replace(log_writer_mode="async")
+            async_writer = build_log_writer(async_config, Path(tmp) / "async.log")
+            self.assertNotIsInstance(sync_writer, AsyncLogWriter)
+            self.assertIsInstance(async_writer, AsyncLogWriter)
+            sync_writer.close()
+            async_writer.close()
+
+            bad_config = conf.global_config._replace(log_writer_mode="sometimes")
+            with self.assertRaises(ValueError):
+                build_log_writer(bad_config, Path(tmp) / "bad.log")
+
+    def test_gzip_compression(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "event.log"
+            for writer_class in (LogWriter, AsyncLogWriter):
+                writer = writer_class(path, compression="gzip", compression_level=1)
+                for step in range(10):
+                    writer.write(_entries(step))
+                writer.close()
+
+            self.assertFalse(path.exists())
+            with gzip.open(f"{path}.gz", "rt") as f:
+                self.assertEqual(len(f.readlines()), 200, "appended runs are both readable")
+            self.assertEqual(list(read_log(path)), list(read_log(f"{path}.gz")))
+            self.assertEqual(list(read_log(path))[:10], _entries(0))
+
+    @skipUnless(HAS_ZSTANDARD, "zstandard is not installed")
+    def test_zstd_compression(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "state.log"
+            for writer_class in (LogWriter, AsyncLogWriter):
+                writer = writer_class(path, buffer_bytes=256, compression="zstd")
+                for step in range(10):
+                    writer.write(_entries(step))
+                writer.close()
+
+            entries = list(read_log(path))
+            self.assertTrue(Path(f"{path}.zst").exists())
+            self.assertEqual(len(entries), 200)
+            self.assertEqual(entries[-10:], _entries(9))
+
+    def test_build_log_writer_compression(self):
+        conf = mock_config()
+        with tempfile.TemporaryDirectory() as tmp:
+            gzip_config = conf.global_config._replace(log_compression="gzip")
+            writer = build_log_writer(gzip_config, Path(tmp) / "event.log")
+            writer.write(_entries(0))
+            writer.close()
+            self.assertEqual(list(read_log(Path(tmp) / "event.log.gz")), _entries(0))
+
+            bad_config = conf.global_config._replace(log_compression="zip")
+            with self.assertRaises(ValueError):
+                build_log_writer(bad_config, Path(tmp) / "bad.log")
@@ -1,5 +1,9 @@
+import math
 from unittest import TestCase, skip
 
+import h3.api.basic_int as h3_int
+import networkx as nx
+
 from nrel.hive.resources.mock_lobster import *
 
 
@@ -51,3 +55,173 @@ class TestOSMRoadNetwork(TestCase):
             route[-1].end,
             "route should end at destination GeoId (stationary road network location)",
         )
+
+    def test_link_helper_build(self):
+        network = mock_osm_network()
+        link_helper = network.link_helper
+
+        self.assertEqual(
+            link_helper.link_count,
+            network.graph.number_of_edges(),
+            "should have one link per graph edge",
+        )
+        self.assertEqual(link_helper.link_count, len(link_helper.links_linkid_lookup))
+        self.assertEqual(link_helper.link_count, link_helper.links_spatial_lookup.n)
+
+        for index, link_id in enumerate(link_helper.links_linkid_lookup):
+            lat, lon = link_helper.links_spatial_lookup.data[index]
+            _, nearest_index = link_helper.links_spatial_lookup.query((lat, lon))
+            self.assertEqual(
+                link_helper.links_linkid_lookup[nearest_index],
+                link_id,
+                "each link midpoint should be unique in the spatial index",
+            )
+
+    def test_positions_from_geoids(self):
+        sim_h3_resolution = 15
+        network = mock_osm_network(h3_res=sim_h3_resolution)
+
+        coordinates = [
+            (39.7481388, -104.9935966),
+            (39.7613596, -104.981728),
+            (39.7539, -104.974),
+        ]
+        geoids = [h3.geo_to_h3(lat, lon, sim_h3_resolution) for lat, lon in coordinates]
+
+        positions = network.positions_from_geoids(geoids)
+
+        self.assertEqual(len(positions), len(geoids), "should have one position per geoid")
+        link_helper = network.link_helper
+        for geoid, position in zip(geoids, positions):
+            # the nearest link midpoint, by brute force over the spatial index data
+            lat, lon = h3.h3_to_geo(geoid)
+            midpoint_distances = [
+                (m_lat - lat) ** 2 + (m_lon - lon) ** 2
+                for m_lat, m_lon in link_helper.links_spatial_lookup.data
+            ]
+            nearest_index = midpoint_distances.index(min(midpoint_distances))
+            expected_link_id = link_helper.links_linkid_lookup[nearest_index]
+            self.assertEqual(position.link_id, expected_link_id, "should snap to nearest link")
+
+            # project the point onto the link, scaling longitude by cos(latitude),
+            # and take the cell that far along the h3 line of the link
+            link = network.link_from_link_id(expected_link_id)
+            (s_lat, s_lon), (e_lat, e_lon) = h3.h3_to_geo(link.start), h3.h3_to_geo(link.end)
+            lon_scale = math.cos(math.radians(lat))
+            link_lat, link_lon = e_lat - s_lat, (e_lon - s_lon) * lon_scale
+            point_lat, point_lon = lat - s_lat, (lon - s_lon) * lon_scale
+            length_squared = link_lat**2 + link_lon**2
+            ratio = (point_lat * link_lat + point_lon * link_lon) / length_squared
+            h3_line = h3.h3_line(link.start, link.end)
+            expected_geoid = h3_line[round(min(max(ratio, 0.0), 1.0) * (len(h3_line) - 1))]
+            self.assertEqual(position.geoid, expected_geoid, "should project onto the link")
+
+    def test_positions_from_geoids_on_link_start(self):
+        network = mock_osm_network()
+        links = sorted(network.link_helper.links.values())[:20]
+
+        positions = network.positions_from_geoids([link.start for link in links])
+
+        for link, position in zip(links, positions):
+            self.assertEqual(
+                position.geoid,
+                link.start,
+                "a geoid on the road network should not move when positioned",
+            )
+
+    def test_point_along_link(self):
+        network = mock_osm_network()
+        link = max(network.link_helper.links.values(), key=lambda l: l.distance_km)
+        traversal = link.to_link_traversal()
+
+        half_way = network.point_along_link(traversal, link.travel_time_seconds // 2)
+        h3_line = h3.h3_line(link.start, link.end)
+
+        self.assertIn(half_way, h3_line, "point should be on the h3 line of the link")
+        self.assertAlmostEqual(
+            h3_line.index(half_way) / (len(h3_line) - 1),
+            0.5,
+            places=1,
+            msg="point should be about half-way along the link",
+        )
+
+        # continue from the half-way point of the link
+        remaining = traversal.update_start(half_way)
+        three_quarters = network.point_along_link(remaining, link.travel_time_seconds // 4)
+        self.assertGreater(h3_line.index(three_quarters), h3_line.index(half_way))
+
+    def test_simplify_graph(self):
+        network = mock_osm_network()
+        simplified = mock_osm_network(simplify_graph=True)
+
+        self.assertLess(
+            simplified.graph.number_of_nodes(),
+            network.graph.number_of_nodes(),
+            "degree-2 nodes should be removed",
+        )
+        self.assertTrue(nx.is_strongly_connected(simplified.graph))
+        for src, dst in [
+            (n, m)
+            for n in list(simplified.graph.nodes)[:5]
+            for m in list(simplified.graph.nodes)[-5:]
+        ]:
+            self.assertAlmostEqual(
+                nx.shortest_path_length(network.graph, src, dst, weight="travel_time"),
+                nx.shortest_path_length(simplified.graph, src, dst, weight="travel_time"),
+                msg="travel times between remaining nodes should not change",
+            )
+
+        # merged links keep the locations of the removed nodes as their geometry
+        link_id, shape = next(iter(simplified.link_helper.link_shapes.items()))
+        link = simplified.link_from_link_id(link_id)
+        geometry = simplified.link_geometry(link.to_link_traversal())
+        self.assertEqual(len(geometry), len(shape) + 2)
+        self.assertEqual(geometry[0], h3.h3_to_geo(link.start))
+        self.assertEqual(geometry[-1], h3.h3_to_geo(link.end))
+
+    def test_merged_link_positions_follow_shape(self):
+        network = mock_osm_network(simplify_graph=True)
+        helper = network.link_helper
+        sim_h3_resolution = network.sim_h3_resolution
+
+        for link_id, shape in helper.link_shapes.items():
+            index = helper.link_index[link_id]
+            line_start, line_end = (
+                helper.link_line_offsets[index],
+                helper.link_line_offsets[index + 1],
+            )
+            line = [
+                h3_int.h3_to_string(int(c)) for c in helper.link_line_cells[line_start:line_end]
+            ]
+            for _, lat, lon in shape:
+                self.assertIn(
+                    h3.geo_to_h3(lat, lon, sim_h3_resolution),
+                    line,
+                    "the h3 line of a merged link should pass through its removed nodes",
+                )
+
+            # the spatial index midpoint lies on the road, so snapping it stays on the h3 line
+            midpoint = helper.links_spatial_lookup.data[index]
+            midpoint_geoid = h3.geo_to_h3(midpoint[0], midpoint[1], sim_h3_resolution)
+            self.assertTrue(
+                any(h3.h3_distance(midpoint_geoid, cell) <= 1 for cell in line),
+                "the midpoint of a merged link should lie along its shape",
+            )
+            _, positions = helper.positions_by_geoids([midpoint_geoid])
+            if positions[0].link_id == link_id:
+                self.assertLessEqual(h3.h3_distance(positions[0].geoid, midpoint_geoid), 1)
+
+    def test_prune_graph(self):
+        graph = mock_osm_network().graph.copy()
+        node_count = graph.number_of_nodes()
+        # a dead end which can be reached but not left
+        src = next(iter(graph.nodes))
+        graph.add_node(-1, y=graph.nodes[src]["y"] + 0.001, x=graph.nodes[src]["x"])
+        graph.add_edge(src, -1, length=100.0, speed_kmph=40.0)
+
+        with self.assertRaises(RuntimeError):
+            OSMRoadNetwork(graph)
+
+        pruned = OSMRoadNetwork(graph, prune_graph=True)
+        self.assertEqual(pruned.graph.number_of_nodes(), node_count)
+        self.assertNotIn(-1, pruned.graph.nodes)
@@ -1,7 +1,16 @@
 from unittest import TestCase
 
-from nrel.hive.resources.mock_lobster import mock_bev, mock_vehicle, mock_dcfc_charger
-from nrel.hive.model.vehicle.mechatronics.powercurve.powercurve_ops import time_to_full
+from nrel.hive.resources.mock_lobster import (
+    mock_bev,
+    mock_vehicle,
+    mock_dcfc_charger,
+    mock_l2_charger,
+)
+from nrel.hive.model.vehicle.mechatronics.powercurve.powercurve_ops import (
+    build_charge_time_table,
+    get_charge_time_table,
+    time_to_full,
+)
 
 
 class TestPowercurveOps(TestCase):
@@ -32,3 +41,74 @@ class TestPowercurveOps(TestCase):
             sim_timestep_duration_seconds=60,
             min_delta_energy_change=0.0001,
         )
+
+    def test_time_to_full_matches_simulated_charging(self):
+        """
+        the closed-form charge time integrates the powercurve exactly, while simulated charging
+        advances in time steps, so they should agree to within a few time steps or 2%
+        """
+        bev = mock_bev(battery_capacity_kwh=50)
+        for charger in [mock_dcfc_charger(), mock_l2_charger()]:
+            for soc in [0.0, 0.1, 0.5, 0.8, 0.95]:
+                for target_soc in [0.8, 1.0]:
+                    vehicle = mock_vehicle(soc=soc, mechatronics=bev)
+                    expected = _simulate_time_to_full(vehicle, bev, charger, target_soc, 60, 0.0001)
+                    result = time_to_full(
+                        vehicle,
+                        bev,
+                        charger,
+                        target_soc=target_soc,
+                        sim_timestep_duration_seconds=60,
+                        min_delta_energy_change=0.0001,
+                    )
+                    tolerance = max(3 * 60, 0.02 * expected)
+                    self.assertAlmostEqual(result, expected, delta=tolerance)
+
+    def test_charge_time_table(self):
+        bev = mock_bev(battery_capacity_kwh=50)
+        table = build_charge_time_table(
+            mock_vehicle(mechatronics=bev), bev, mock_l2_charger(), 60, 0.0001
+        )
+
+        self.assertEqual(table.time_to_soc(0.9, 0.8), 0, "already charged")
+        self.assertEqual(table.time_to_soc(0.3, 0.3), 0, "already charged")
+        self.assertLess(table.time_to_soc(0.3, 0.6), table.time_to_soc(0.3, 0.8))
+        self.assertLessEqual(table.stop_soc, 1.0)
+
+    def test_charge_time_tables_kept_on_mechatronics(self):
+        bev = mock_bev(battery_capacity_kwh=50)
+        other_bev = mock_bev(battery_capacity_kwh=50)
+        vehicle = mock_vehicle(mechatronics=bev)
+        charger = mock_l2_charger()
+
+        table = get_charge_time_table(vehicle, bev, charger, 60, 0.0001)
+        self.assertIs(get_charge_time_table(vehicle, bev, charger, 60, 0.0001), table)
+        self.assertEqual(list(bev.charge_time_tables), [(charger.id, charger.rate, 60, 0.0001)])
+        self.assertEqual(len(other_bev.charge_time_tables), 0, "tables are not shared")
+
+        slower = charger._replace(rate=charger.rate / 2)
+        self.assertIsNot(get_charge_time_table(vehicle, bev, slower, 60, 0.0001), table)
+        self.assertEqual(len(bev.charge_time_tables), 2, "rate is part of the key")
+
+
+def _simulate_time_to_full(
+    vehicle,
+    mechatronics,
+    charger,
+    target_soc,
+    sim_timestep_duration_seconds,
+    min_delta_energy_change,
+):
+    time_charged = 0
+    delta = 1.0
+    while (
+        not mechatronics.fuel_source_soc(vehicle) >= target_soc and delta > min_delta_energy_change
+    ):
+        prev_energy = vehicle.energy[charger.energy_type]
+        vehicle, time_delta = mechatronics.add_energy(
+            vehicle, charger, sim_timestep_duration_seconds
+        )
+        if prev_energy != 0:
+            delta = abs(prev_energy - vehicle.energy[charger.energy_type]) / prev_energy
+        time_charged += time_delta
+    return time_charged
@@ -0,0 +1,203 @@
+import json
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List
+from unittest import TestCase
+
+from nrel.hive.reporting.handler.eventful_handler import EventfulHandler
+from nrel.hive.reporting.handler.handler import Handler
+from nrel.hive.reporting.handler.instruction_handler import InstructionHandler
+from nrel.hive.reporting.handler.log_writer import serialize
+from nrel.hive.reporting.handler.stats_handler import StatsHandler
+from nrel.hive.reporting.report_type import ReportType
+from nrel.hive.reporting.reporter import Report, Reporter
+from nrel.hive.state.simulation_state.update.step_simulation_ops import log_instructions
+from nrel.hive.resources.mock_lobster import *
+
+
+class _RecordingHandler(Handler):
+    def __init__(self, report_types: FrozenSet[ReportType] = frozenset(ReportType)):
+        self._report_types = report_types
+        self.handled: List[List[Report]] = []
+
+    def handle(self, reports, runner_payload):
+        self.handled.append(list(reports))
+
+    def report_types(self) -> FrozenSet[ReportType]:
+        return self._report_types
+
+    def close(self, runner_payload):
+        pass
+
+
+class _SteppedHandler(_RecordingHandler):
+    def __init__(self, report_types: FrozenSet[ReportType] = frozenset(ReportType)):
+        super().__init__(report_types)
+        self.stepped: List[List[Report]] = []
+
+    def step(self, reports, runner_payload):
+        self.stepped.append(list(reports))
+
+
+class TestReporter(TestCase):
+    def test_as_json_typed(self):
+        values: Dict[str, Any] = {
+            "vehicle_id": "v1",
+            "sim_time": SimTime.build(60),
+            "wait_time_seconds": timedelta(seconds=90),
+            "energy": 1.5,
+            "passengers": 2,
+            "available": True,
+            "vehicle_memberships": ["fleet_a"],
+            "schedule_id": None,
+        }
+        report = Report(ReportType.VEHICLE_CHARGE_EVENT, values)
+
+        typed = report.as_json(typed=True)
+        strings = report.as_json()
+
+        self.assertEqual(typed["energy"], 1.5)
+        self.assertEqual(typed["passengers"], 2)
+        self.assertIs(typed["available"], True)
+        self.assertIsNone(typed["schedule_id"])
+        self.assertEqual(typed["vehicle_memberships"], ["fleet_a"])
+        for key in ("vehicle_id", "sim_time", "wait_time_seconds", "report_type"):
+            self.assertEqual(typed[key], strings[key], f"{key} should be written as a string")
+        self.assertEqual(strings["energy"], "1.5")
+
+    def test_serialize_typed(self):
+        report = Report(ReportType.ADD_REQUEST_EVENT, {"request_id": "r1", "passengers": 2})
+        entries = [report.as_json(typed=True)] * 3
+
+        lines = serialize(entries, typed=True).splitlines()
+
+        self.assertEqual(len(lines), 3)
+        self.assertEqual([json.loads(line) for line in lines], entries)
+        self.assertEqual(
+            [json.loads(line) for line in serialize(entries).splitlines()],
+            entries,
+            "both json backends should write the same values",
+        )
+
+    def test_wants(self):
+        conf = mock_config()
+        global_config = conf.global_config._replace(
+            log_sim_config={ReportType.STATION_LOAD_EVENT, ReportType.VEHICLE_STATE}
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            reporter = Reporter()
+            self.assertFalse(reporter.wants(ReportType.VEHICLE_MOVE_EVENT), "no handlers")
+
+            handler = EventfulHandler(global_config, Path(tmp))
+            reporter.add_handler(handler)
+            self.assertTrue(
+                reporter.wants(ReportType.VEHICLE_CHARGE_EVENT),
+                "charge events are needed to build station load events",
+            )
+            self.assertFalse(reporter.wants(ReportType.VEHICLE_MOVE_EVENT))
+            self.assertFalse(reporter.wants(ReportType.INSTRUCTION))
+
+            reporter.file_report(Report(ReportType.VEHICLE_MOVE_EVENT, {}))
+            self.assertEqual(len(reporter.reports), 0, "unwanted reports are not kept")
+
+            reporter.add_handler(StatsHandler())
+            self.assertTrue(reporter.wants(ReportType.VEHICLE_MOVE_EVENT))
+            handler.close(None)
+
+    def test_log_instructions_when_unwanted(self):
+        reporter = Reporter()
+        env = mock_env().set_reporter(reporter)
+        instruction = DispatchTripInstruction("v1", "r1")
+
+        log_instructions((instruction,), env, SimTime.build(0))
+        self.assertEqual(len(reporter.reports), 0)
+
+        global_config = env.config.global_config._replace(log_sim_config={ReportType.INSTRUCTION})
+        with tempfile.TemporaryDirectory() as tmp:
+            handler = InstructionHandler(global_config, Path(tmp))
+            reporter.add_handler(handler)
+            log_instructions((instruction,), env, SimTime.build(0))
+            handler.close(None)
+        self.assertEqual(len(reporter.reports), 1)
+
+    def test_flush_routes_reports_by_type(self):
+        moves = _RecordingHandler(frozenset({ReportType.VEHICLE_MOVE_EVENT}))
+        events = _RecordingHandler(
+            frozenset({ReportType.VEHICLE_MOVE_EVENT, ReportType.ADD_REQUEST_EVENT})
+        )
+        everything = _RecordingHandler()
+        nothing = _RecordingHandler(frozenset())
+        reporter = Reporter()
+        for handler in (moves, events, everything, nothing):
+            reporter.add_handler(handler)
+
+        move1 = Report(ReportType.VEHICLE_MOVE_EVENT, {"id": 1})
+        add = Report(ReportType.ADD_REQUEST_EVENT, {"id": 2})
+        instruction = Report(ReportType.INSTRUCTION, {"id": 3})
+        move2 = Report(ReportType.VEHICLE_MOVE_EVENT, {"id": 4})
+        for report in (move1, add, instruction, move2):
+            reporter.file_report(report)
+        reporter.flush(mock_runner_payload())
+        reporter.flush(mock_runner_payload())
+
+        self.assertEqual(moves.handled, [[move1, move2], []])
+        self.assertEqual(events.handled, [[move1, add, move2], []], "filing order is kept")
+        self.assertEqual(everything.handled, [[move1, add, instruction, move2], []])
+        self.assertEqual(nothing.handled, [[], []])
+
+    def test_flush_interval(self):
+        batched = _RecordingHandler(frozenset({ReportType.VEHICLE_MOVE_EVENT}))
+        stepped = _SteppedHandler(frozenset({ReportType.VEHICLE_MOVE_EVENT}))
+        reporter = Reporter(flush_interval_steps=3, max_buffered_reports=4)
+        reporter.add_handler(batched)
+        reporter.add_handler(stepped)
+
+        moves = [Report(ReportType.VEHICLE_MOVE_EVENT, {"id": i}) for i in range(9)]
+        # one report in each of the first four steps, and then five in one step
+        for report in moves[:4]:
+            reporter.file_report(report)
+            reporter.step(mock_runner_payload())
+        for report in moves[4:]:
+            reporter.file_report(report)
+        reporter.step(mock_runner_payload())
+        reporter.file_report(Report(ReportType.VEHICLE_MOVE_EVENT, {"id": 9}))
+        reporter.close(mock_runner_payload())
+
+        self.assertEqual(
+            batched.handled,
+            [moves[:3], moves[3:], [Report(ReportType.VEHICLE_MOVE_EVENT, {"id": 9})]],
+            "flushed every 3 steps, early once more than 4 reports are buffered, and on close",
+        )
+        self.assertEqual(stepped.stepped, [[m] for m in moves[:4]] + [moves[4:]])
+
+    def test_flush_without_step_runs_step_hooks(self):
+        stepped = _SteppedHandler(frozenset({ReportType.VEHICLE_MOVE_EVENT}))
+        reporter = Reporter(flush_interval_steps=3)
+        reporter.add_handler(stepped)
+
+        moves = [Report(ReportType.VEHICLE_MOVE_EVENT, {"id": i}) for i in range(2)]
+        for report in moves:
+            reporter.file_report(report)
+            reporter.flush(mock_runner_payload())
+
+        self.assertEqual(stepped.stepped, [[m] for m in moves], "each flush is one time step")
+        self.assertEqual(stepped.handled, [[m] for m in moves])
+
+    def test_max_buffered_reports_counts_handler_entries(self):
+        class _BufferingHandler(_SteppedHandler):
+            def buffered_count(self) -> int:
+                return 10 * len(self.stepped)
+
+            def handle(self, reports, runner_payload):
+                super().handle(reports, runner_payload)
+                self.stepped.clear()
+
+        buffering = _BufferingHandler(frozenset({ReportType.VEHICLE_MOVE_EVENT}))
+        reporter = Reporter(flush_interval_steps=100, max_buffered_reports=15)
+        reporter.add_handler(buffering)
+
+        for _ in range(3):
+            reporter.step(mock_runner_payload())
+
+        self.assertEqual(len(buffering.handled), 1, "flushed once the handler held 20 entries")
@@ -31,6 +31,18 @@ class TestRouteTraversal(TestCase):
         self.assertEqual(len(result.remaining_route), 2, "should have 2 links remaining")
         self.assertEqual(len(result.experienced_route), 2, "should have traversed 2 links")
 
+    def test_traverse_remaining_route_is_route_tail(self):
+        links = mock_route()
+        _, result = traverse(route_estimate=links, duration_seconds=hours_to_seconds(1.5))
+
+        self.assertEqual(result.experienced_route[0], links[0], "first link is fully traversed")
+        self.assertEqual(result.remaining_route[0].end, links[1].end, "second link is split")
+        self.assertEqual(result.remaining_route[1:], links[2:], "untouched links are unchanged")
+        self.assertAlmostEqual(
+            result.traversal_distance_km,
+            sum(l.distance_km for l in result.experienced_route),
+        )
+
     def test_traverse_up_to_split(self):
         links = mock_route()
         test_link = links[0]
@@ -58,6 +70,11 @@ class TestRouteTraversal(TestCase):
             remaining.start,
             "Traversed end should match remaining start",
         )
+        self.assertAlmostEqual(
+            traversed.distance_km + remaining.distance_km,
+            test_link.distance_km,
+            msg="Traversed and remaining links should split the link distance",
+        )
 
     def test_traverse_up_to_no_split(self):
         links = mock_route()
@@ -0,0 +1,56 @@
+from dataclasses import replace
+from unittest import TestCase
+
+from nrel.hive.reporting.handler.stateful_handler import StateLogSelector, StatefulHandler
+from nrel.hive.reporting.report_type import ReportType
+from nrel.hive.resources.mock_lobster import *
+
+
+def _selector(**settings) -> StateLogSelector:
+    return StateLogSelector(mock_config().global_config._replace(**settings))
+
+
+class TestStatefulHandler(TestCase):
+    def test_interval_steps(self):
+        selector = _selector(log_states_interval_steps=3)
+        logged = [selector.next_step() for _ in range(7)]
+        self.assertEqual(logged, [True, False, False, True, False, False, True])
+
+    def test_sample_ratio(self):
+        vehicles = [mock_vehicle(vehicle_id=f"v{i}") for i in range(1000)]
+        selector = _selector(log_states_sample_ratio=0.25)
+
+        first = [
+            r["vehicle_id"]
+            for r in selector.records(
+                ReportType.VEHICLE_STATE, vehicles, StatefulHandler.vehicle_asdict
+            )
+        ]
+        second = [
+            r["vehicle_id"]
+            for r in selector.records(
+                ReportType.VEHICLE_STATE, vehicles, StatefulHandler.vehicle_asdict
+            )
+        ]
+
+        self.assertEqual(first, second, "the same vehicles should be sampled at each step")
+        self.assertAlmostEqual(len(first) / len(vehicles), 0.25, delta=0.05)
+
+    def test_changes_only(self):
+        v1, v2 = mock_vehicle(vehicle_id="v1"), mock_vehicle(vehicle_id="v2")
+        selector = _selector(log_states_changes_only=True)
+
+        def logged(vehicles):
+            records = selector.records(
+                ReportType.VEHICLE_STATE, vehicles, StatefulHandler.vehicle_asdict
+            )
+            return [r["vehicle_id"] for r in records]
+
+        self.assertEqual(logged([v1, v2]), ["v1", "v2"], "first records are always logged")
+        self.assertEqual(logged([v1, v2]), [], "unchanged vehicles are not logged")
+
+        moved = v2.modify_energy(immutables.Map({EnergyType.ELECTRIC: 1.0}))
+        self.assertEqual(logged([v1, moved]), ["v2"])
+
+        copied = replace(v1)
+        self.assertEqual(logged([copied, moved]), [], "an equal record is not logged")
@@ -1,6 +1,8 @@
 from unittest import TestCase
 
 from nrel.hive.reporting import vehicle_event_ops
+from nrel.hive.reporting.report_type import ReportType
+from nrel.hive.reporting.reporter import Report
 from nrel.hive.resources.mock_lobster import *
 
 
@@ -57,3 +59,38 @@ class TestStationLoadHandler(TestCase):
             0.0,
             "we should have captured the effect of 60 seconds of charge time",
         )
+
+    def test_accumulator_reports_active_stations(self):
+        sim = mock_sim(stations=(mock_station("s1"), mock_station("s2")))
+
+        def _charge(energy: float) -> Report:
+            return Report(
+                ReportType.VEHICLE_CHARGE_EVENT,
+                {"station_id": "s1", "energy": energy, "energy_units": "kilowatthour"},
+            )
+
+        accumulator = vehicle_event_ops.StationLoadAccumulator()
+        accumulator.add(_charge(1.5))
+        accumulator.add(_charge(2.0))
+        first = accumulator.station_load_events(sim)
+        second = accumulator.station_load_events(sim)
+
+        self.assertEqual([r.report["station_id"] for r in first], ["s1"])
+        self.assertEqual(first[0].report["energy"], "3.5")
+        self.assertEqual(second, (), "totals are reset after each time step")
+
+        accumulator = vehicle_event_ops.StationLoadAccumulator(all_stations_interval_steps=2)
+        steps = []
+        for _ in range(3):
+            accumulator.add(_charge(1.0))
+            steps.append(
+                sorted(r.report["station_id"] for r in accumulator.station_load_events(sim))
+            )
+        self.assertEqual(steps, [["s1", "s2"], ["s1"], ["s1", "s2"]])
+
+        with_idle = vehicle_event_ops.construct_station_load_events((_charge(1.0),), sim)
+        without_idle = vehicle_event_ops.construct_station_load_events(
+            (_charge(1.0),), sim, include_idle_stations=False
+        )
+        self.assertEqual(len(with_idle), 2)
+        self.assertEqual(len(without_idle), 1)
@@ -0,0 +1,86 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from nrel.hive.reporting.handler.time_step_stats_handler import TimeStepStatsHandler
+from nrel.hive.reporting.report_type import ReportType
+from nrel.hive.reporting.reporter import Report
+from nrel.hive.resources.mock_lobster import *
+
+
+def _handler(fleet_ids, **settings) -> TimeStepStatsHandler:
+    config = mock_config(timestep_duration_seconds=60)
+    global_config = config.global_config._replace(**settings)
+    return TimeStepStatsHandler(
+        config._replace(global_config=global_config),
+        Path(tempfile.mkdtemp()),
+        fleet_ids,
+    )
+
+
+class TestTimeStepStatsHandler(TestCase):
+    def test_aggregates_all_vehicles_and_fleets(self):
+        fleet_ids = frozenset({"a", "b", None})
+        env = mock_env(fleet_ids=fleet_ids)
+        sim = mock_sim(
+            vehicles=(
+                mock_vehicle(vehicle_id="v1", membership=Membership.from_tuple(("a",))),
+                mock_vehicle(vehicle_id="v2", membership=Membership.from_tuple(("a", "b"))),
+                mock_vehicle(vehicle_id="v3"),
+            )
+        )
+        handler = _handler(fleet_ids, log_time_step_stats=True, log_fleet_time_step_stats=True)
+        reports = [
+            Report(
+                ReportType.VEHICLE_MOVE_EVENT, {"distance_km": 1.0, "vehicle_memberships": ["a"]}
+            ),
+            Report(
+                ReportType.VEHICLE_MOVE_EVENT, {"distance_km": 2.0, "vehicle_memberships": None}
+            ),
+            Report(
+                ReportType.VEHICLE_CHARGE_EVENT,
+                {"charger_id": mock_dcfc_charger_id(), "vehicle_memberships": ["a", "b"]},
+            ),
+            Report(ReportType.CANCEL_REQUEST_EVENT, {}),
+        ]
+
+        handler.step(reports, RunnerPayload(sim, env, mock_update()))
+        handler.step(
+            [], RunnerPayload(sim._replace(sim_time=sim.sim_time + 60), env, mock_update())
+        )
+
+        stats = handler.get_time_step_stats()
+        fleet_stats = handler.get_fleet_time_step_stats()
+
+        self.assertEqual(list(stats["time_step"]), [0, 1])
+        self.assertEqual(list(stats["sim_time"]), ["1970-01-01T00:00:00", "1970-01-01T00:01:00"])
+        self.assertEqual(list(stats["vehicles"]), [3, 3])
+        self.assertEqual(list(stats["vehicles_idle"]), [3, 3])
+        self.assertEqual(list(stats["vkt"]), [3.0, 0.0])
+        self.assertEqual(list(stats["canceled_requests"]), [1, 0])
+        self.assertEqual(list(stats[f"charger_{mock_dcfc_charger_id().lower()}"]), [1, 0])
+
+        self.assertEqual(list(fleet_stats["a"]["vehicles"]), [2, 2])
+        self.assertEqual(list(fleet_stats["b"]["vehicles"]), [1, 1])
+        self.assertEqual(list(fleet_stats["none"]["vehicles"]), [1, 1])
+        self.assertEqual(list(fleet_stats["a"]["vkt"]), [1.0, 0.0])
+        self.assertEqual(list(fleet_stats["none"]["vkt"]), [2.0, 0.0])
+        self.assertEqual(
+            list(fleet_stats["b"][f"charger_{mock_dcfc_charger_id().lower()}"]), [1, 0]
+        )
+        self.assertEqual(
+            list(fleet_stats["none"][f"charger_{mock_dcfc_charger_id().lower()}"]), [0, 0]
+        )
+
+    def test_buffers_grow_past_the_expected_duration(self):
+        handler = _handler(frozenset(), log_time_step_stats=True)
+        sim, env = mock_sim(vehicles=(mock_vehicle(),)), mock_env()
+
+        n_steps = handler.expected_time_steps * 2 + 1
+        for i in range(n_steps):
+            step_sim = sim._replace(sim_time=sim.sim_time + i * 60)
+            handler.step([], RunnerPayload(step_sim, env, mock_update()))
+
+        stats = handler.get_time_step_stats()
+        self.assertEqual(list(stats["time_step"]), list(range(n_steps)))
+        self.assertEqual(list(stats["vehicles"]), [1] * n_steps)
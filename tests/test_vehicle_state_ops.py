@@ -42,6 +42,34 @@ class TestVehicleStateOps(TestCase):
             "link start location should not be the same",
         )
 
+    def test_move_vehicles(self):
+        somewhere = h3.geo_to_h3(39.7539, -104.974, 15)
+        somewhere_else = h3.geo_to_h3(39.7579, -104.978, 15)
+        sim = mock_sim(sim_timestep_duration_seconds=10)
+        somewhere_link = sim.road_network.position_from_geoid(somewhere)
+        somewhere_else_link = sim.road_network.position_from_geoid(somewhere_else)
+        route = sim.road_network.route(somewhere_link, somewhere_else_link)
+        moving = mock_vehicle_from_geoid(
+            vehicle_id="moving",
+            geoid=somewhere,
+            vehicle_state=Repositioning.build("moving", route),
+        )
+        idle = mock_vehicle_from_geoid(vehicle_id="idle", geoid=somewhere)
+        sim = simulation_state_ops.add_vehicle_safe(sim, moving).unwrap()
+        sim = simulation_state_ops.add_vehicle_safe(sim, idle).unwrap()
+        env = mock_env()
+
+        error, expected_sim = vehicle_state_ops.move(sim, env, moving.id)
+        if error:
+            self.fail(error)
+
+        moved_sim, moved_ids = vehicle_state_ops.move_vehicles(sim, env, sim.vehicles.values())
+
+        self.assertEqual(moved_ids, frozenset({moving.id}), "only the en-route vehicle moves")
+        self.assertEqual(moved_sim.vehicles.get(moving.id), expected_sim.vehicles.get(moving.id))
+        self.assertEqual(moved_sim.v_locations, expected_sim.v_locations)
+        self.assertEqual(moved_sim.v_search, expected_sim.v_search)
+
     def test_charge(self):
         state = ChargingBase.build(
             DefaultIds.mock_vehicle_id(),
@@ -71,6 +99,52 @@ class TestVehicleStateOps(TestCase):
             msg="should have charged",
         )
 
+    def test_charge_vehicles(self):
+        sta = mock_station_from_geoid(chargers={mock_l2_charger_id(): 4, mock_dcfc_charger_id(): 4})
+        _, sta = sta.update_prices(
+            immutables.Map({mock_l2_charger_id(): 0.1, mock_dcfc_charger_id(): 0.5})
+        )
+        charging = [
+            ("v1", 0.5, mock_dcfc_charger_id()),
+            ("v2", 0.2, mock_dcfc_charger_id()),
+            ("v3", 0.3, mock_l2_charger_id()),
+            ("full", 1.0, mock_dcfc_charger_id()),
+        ]
+        vehicles = tuple(
+            mock_vehicle_from_geoid(
+                vehicle_id=vehicle_id,
+                vehicle_state=ChargingStation.build(vehicle_id, sta.id, charger_id),
+                soc=soc,
+            )
+            for vehicle_id, soc, charger_id in charging
+        )
+        sim = mock_sim(vehicles=vehicles, stations=(sta,), sim_timestep_duration_seconds=60)
+        env = mock_env()
+
+        expected_sim = sim
+        for vehicle_id, _, charger_id in charging[:-1]:
+            error, expected_sim = vehicle_state_ops.charge(
+                expected_sim, env, vehicle_id, sta.id, charger_id
+            )
+            if error:
+                self.fail(error)
+
+        result, charged_ids = vehicle_state_ops.charge_vehicles(sim, env, vehicles)
+
+        self.assertEqual(charged_ids, frozenset({"v1", "v2", "v3"}), "full vehicle not charged")
+        for vehicle_id, _, _ in charging:
+            self.assertAlmostEqual(
+                result.vehicles[vehicle_id].energy[EnergyType.ELECTRIC],
+                expected_sim.vehicles[vehicle_id].energy[EnergyType.ELECTRIC],
+            )
+        updated_sta, expected_sta = result.stations[sta.id], expected_sim.stations[sta.id]
+        self.assertGreater(updated_sta.balance, 0, "station should be paid")
+        self.assertAlmostEqual(updated_sta.balance, expected_sta.balance)
+        self.assertAlmostEqual(
+            updated_sta.energy_dispensed[EnergyType.ELECTRIC],
+            expected_sta.energy_dispensed[EnergyType.ELECTRIC],
+        )
+
     def test_charge_when_full(self):
         state = ChargingBase.build(
             DefaultIds.mock_vehicle_id(),
@@ -92,3 +166,27 @@ class TestVehicleStateOps(TestCase):
 
         self.assertIsNotNone(error)
         self.assertIsNone(result)
+
+    def test_idle_vehicles(self):
+        vehicles = (
+            mock_vehicle_from_geoid(vehicle_id="v1", soc=0.5),
+            mock_vehicle_from_geoid(vehicle_id="v2", soc=0.2),
+            mock_vehicle_from_geoid(vehicle_id="empty", soc=0.0),
+        )
+        sim = mock_sim(vehicles=vehicles, sim_timestep_duration_seconds=60)
+        env = mock_env()
+
+        result, idled_ids = vehicle_state_ops.idle_vehicles(sim, env, vehicles)
+
+        self.assertEqual(idled_ids, frozenset({"v1", "v2"}), "empty vehicle is left to its update")
+        for vehicle in vehicles[:-1]:
+            error, expected_sim = vehicle.vehicle_state.update(sim, env)
+            if error:
+                self.fail(error)
+            expected = expected_sim.vehicles[vehicle.id]
+            idled = result.vehicles[vehicle.id]
+            self.assertAlmostEqual(
+                idled.energy[EnergyType.ELECTRIC], expected.energy[EnergyType.ELECTRIC]
+            )
+            self.assertEqual(idled.vehicle_state, expected.vehicle_state)
+        self.assertEqual(result.vehicles["empty"], sim.vehicles["empty"])